@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+"""Benchmark per-step channel input access in the co-simulation loop.
+
+Compares the previous `DataFrame.iloc[i]` row access against the
+pre-extracted `StepInputs` column views used by `Simulation.run`.
+
+Usage:
+    python scripts/benchmarks/benchmark_step_inputs.py --n_steps 105120
+"""
+import argparse
+import time
+
+import pandas as pd
+import numpy as np
+
+from BuildingControlsSimulator.DataClients.DataStates import STATES
+from BuildingControlsSimulator.DataClients.DataSpec import Internal
+from BuildingControlsSimulator.DataClients.StepInputs import StepInputColumns
+
+
+def make_channel_data(spec, n_steps):
+    """Make dummy channel data with the dtypes of the internal spec."""
+    _data = {}
+    for _state, _v in spec.spec.items():
+        if _v["dtype"] == "category":
+            _data[_state] = pd.Series(
+                pd.Categorical(np.where(np.arange(n_steps) % 2, "heat", "off"))
+            )
+        elif _v["dtype"] == "datetime64[ns, utc]":
+            _data[_state] = pd.date_range(
+                "2018-01-01", periods=n_steps, freq="300S", tz="utc"
+            )
+        elif _v["dtype"] in ["bool", "boolean"]:
+            _data[_state] = pd.Series(np.full(n_steps, False), dtype=_v["dtype"])
+        else:
+            _data[_state] = pd.Series(np.arange(n_steps), dtype=_v["dtype"])
+    return pd.DataFrame.from_dict(_data)
+
+
+def run_iloc(channels, n_steps):
+    _t0 = time.perf_counter()
+    for i in range(n_steps):
+        _time_utc = channels["datetime"].iloc[i][STATES.DATE_TIME]
+        _thermostat = channels["thermostat"].iloc[i]
+        _thermostat[STATES.TEMPERATURE_STP_COOL]
+        _weather = channels["weather"].iloc[i]
+        _weather[STATES.OUTDOOR_TEMPERATURE]
+        _sensors = channels["sensors"].iloc[i]
+        _sensors[STATES.THERMOSTAT_MOTION]
+        # the previous loop built the weather row a second time for the building
+        _weather = channels["weather"].iloc[i]
+    return time.perf_counter() - _t0
+
+
+def run_step_inputs(channels, n_steps):
+    _t0 = time.perf_counter()
+    step_inputs = {k: StepInputColumns.from_dataframe(v) for k, v in channels.items()}
+    for i in range(n_steps):
+        _time_utc = step_inputs["datetime"].columns[STATES.DATE_TIME][i]
+        _thermostat = step_inputs["thermostat"].step(i)
+        _thermostat[STATES.TEMPERATURE_STP_COOL]
+        _weather = step_inputs["weather"].step(i)
+        _weather[STATES.OUTDOOR_TEMPERATURE]
+        _sensors = step_inputs["sensors"].step(i)
+        _sensors[STATES.THERMOSTAT_MOTION]
+    return time.perf_counter() - _t0
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--n_steps", type=int, default=20000)
+    args = parser.parse_args()
+
+    spec = Internal()
+    channels = {
+        "datetime": make_channel_data(spec.datetime, args.n_steps),
+        "thermostat": make_channel_data(spec.thermostat, args.n_steps),
+        "sensors": make_channel_data(spec.sensors, args.n_steps),
+        "weather": make_channel_data(spec.weather, args.n_steps),
+    }
+
+    t_iloc = run_iloc(channels, args.n_steps)
+    t_step_inputs = run_step_inputs(channels, args.n_steps)
+
+    print(f"n_steps: {args.n_steps}")
+    print(f"DataFrame.iloc: {args.n_steps / t_iloc:,.0f} steps/sec")
+    print(f"StepInputs (including extraction): {args.n_steps / t_step_inputs:,.0f} steps/sec")
+    print(f"speedup: {t_iloc / t_step_inputs:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,125 @@
+import os
+import logging
+import hashlib
+import json
+import shutil
+import tempfile
+import fcntl
+from contextlib import contextmanager
+
+import attr
+import pandas as pd
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@attr.s(kw_only=True)
+class ArtifactCache:
+    """Content-addressed cache of build artifacts (preprocessed IDFs, FMUs).
+
+    Artifacts are stored under a key that is a hash of all inputs to the
+    build, so artifacts are reused whenever the inputs are identical,
+    regardless of file naming, and never reused when any input changes.
+
+    Artifacts are written to a temporary file and atomically renamed into
+    place so concurrent readers never see partial files. Builders should
+    hold `lock(key)` while checking for and building an artifact so that
+    concurrent processes do not duplicate the same build.
+    """
+
+    cache_dir = attr.ib(default=os.environ.get("ARTIFACT_CACHE_DIR"))
+    hits = attr.ib(default=0)
+    misses = attr.ib(default=0)
+
+    def __attrs_post_init__(self):
+        if not self.cache_dir:
+            raise ValueError(
+                "ArtifactCache requires cache_dir or env var ARTIFACT_CACHE_DIR."
+            )
+        os.makedirs(os.path.join(self.cache_dir, "locks"), exist_ok=True)
+
+    @staticmethod
+    def hash_file(fpath, chunk_size=2 ** 20):
+        """sha256 hex digest of file contents."""
+        _hash = hashlib.sha256()
+        with open(fpath, "rb") as f:
+            for _chunk in iter(lambda: f.read(chunk_size), b""):
+                _hash.update(_chunk)
+        return _hash.hexdigest()
+
+    @staticmethod
+    def make_key(**inputs):
+        """sha256 hex digest of json serialized build inputs."""
+        _serialized = json.dumps(inputs, sort_keys=True, default=str)
+        return hashlib.sha256(_serialized.encode("utf-8")).hexdigest()
+
+    def get_artifact_dir(self, key):
+        return os.path.join(self.cache_dir, key[:2], key)
+
+    def get_artifact_path(self, key, file_name):
+        return os.path.join(self.get_artifact_dir(key), file_name)
+
+    @contextmanager
+    def lock(self, key):
+        """Exclusive inter-process lock for building artifacts of key."""
+        _lock_path = os.path.join(self.cache_dir, "locks", f"{key}.lock")
+        with open(_lock_path, "a") as _lock_file:
+            fcntl.flock(_lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(_lock_file, fcntl.LOCK_UN)
+
+    def get(self, key, file_name):
+        """Return path of cached artifact, or None if not cached."""
+        _artifact_path = self.get_artifact_path(key, file_name)
+        if os.path.isfile(_artifact_path):
+            self.hits += 1
+            logger.info(f"ArtifactCache hit: {_artifact_path}")
+            return _artifact_path
+
+        self.misses += 1
+        logger.info(f"ArtifactCache miss: {_artifact_path}")
+        return None
+
+    def put(self, key, file_name, src_path):
+        """Store copy of src_path as artifact and return its path."""
+        _artifact_path = self.get_artifact_path(key, file_name)
+        os.makedirs(os.path.dirname(_artifact_path), exist_ok=True)
+        ArtifactCache.atomic_copy(src_path, _artifact_path)
+        return _artifact_path
+
+    def restore(self, key, file_name, dest_path):
+        """Copy cached artifact to dest_path, return dest_path or None if not
+        cached."""
+        _artifact_path = self.get(key, file_name)
+        if not _artifact_path:
+            return None
+
+        os.makedirs(os.path.dirname(os.path.abspath(dest_path)), exist_ok=True)
+        ArtifactCache.atomic_copy(_artifact_path, dest_path)
+        return dest_path
+
+    @staticmethod
+    def atomic_copy(src_path, dest_path):
+        _fd, _tmp_path = tempfile.mkstemp(
+            dir=os.path.dirname(os.path.abspath(dest_path)),
+            prefix=os.path.basename(dest_path) + ".",
+            suffix=".tmp",
+        )
+        os.close(_fd)
+        try:
+            shutil.copyfile(src_path, _tmp_path)
+            os.replace(_tmp_path, dest_path)
+        finally:
+            if os.path.exists(_tmp_path):
+                os.remove(_tmp_path)
+
+    def get_stats(self):
+        _n = self.hits + self.misses
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / _n if _n else None,
+        }
@@ -24,6 +24,8 @@ class BuildingModel(ABC):
 
     status = attr.ib(default=0)
     log_level = attr.ib(default=0)
+    # categories of categorical output states, which are recorded as codes
+    output_categories = attr.ib(factory=dict)
 
     @abstractmethod
     def initialize(self, start_utc, t_start, t_end, t_step, data_spec, categories_dict):
@@ -40,3 +42,65 @@ class BuildingModel(ABC):
     def get_model_name(self):
         """Defines human readable uniquely identifing name"""
         pass
+
+    def do_replay(
+        self,
+        sim_time,
+        t_step,
+        control_input,
+        sensor_input,
+        weather_input,
+        start_idx,
+        end_idx,
+    ):
+        """Simulate steps [start_idx, end_idx) driven by precomputed input
+        trajectories, e.g. recorded equipment runtimes, see Simulation.replay.
+
+        Inputs are StepInputColumns covering all simulation steps. Models
+        may override this to step with less per-step overhead than
+        `do_step`.
+        """
+        for i in range(start_idx, end_idx):
+            self.do_step(
+                t_start=sim_time[i],
+                t_step=t_step,
+                step_control_input=control_input.step(i),
+                step_sensor_input=sensor_input.step(i),
+                step_weather_input=weather_input.step(i),
+            )
+
+    def set_scratch_dir(self, scratch_dir):
+        """Direct generated model files to scratch_dir, e.g. when running
+        simulations in parallel processes."""
+        pass
+
+    def set_step_timer(self, step_timer):
+        """Record timing of model internals with step_timer, see StepTimer."""
+        pass
+
+    def set_state_bus(self, state_bus):
+        """Read and write states directly on state_bus, see StateBus. Models
+        that do not support the bus return False and keep passing step_output,
+        a state_bus of None restores step_output passing."""
+        return False
+
+    def get_failed_steps(self, start_idx, end_idx):
+        """Mask of steps [start_idx, end_idx) whose model step failed, or None
+        if the model does not report step status, see HealthMonitor."""
+        return None
+
+    def get_health_counters(self):
+        """Counts of unhealthy model events since initialization, see
+        HealthMonitor."""
+        return {}
+
+    def get_state_snapshot(self):
+        """Copy of model state for warm starts of other instances of the
+        same model, or None if the model does not support state snapshots."""
+        return None
+
+    def set_state_snapshot(self, snapshot):
+        """Restore state of initialized model from get_state_snapshot."""
+        raise NotImplementedError(
+            f"{type(self).__name__} does not support state snapshots."
+        )
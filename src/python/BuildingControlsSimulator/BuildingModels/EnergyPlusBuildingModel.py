@@ -5,8 +5,11 @@ import logging
 import subprocess
 import shlex
 import shutil
+import tempfile
 from enum import IntEnum
 import math
+import time
+import copy
 
 import pandas as pd
 import attr
@@ -15,6 +18,7 @@ import pyfmi
 
 from BuildingControlsSimulator.DataClients.DataStates import STATES
 from BuildingControlsSimulator.BuildingModels.BuildingModel import BuildingModel
+from BuildingControlsSimulator.BuildingModels.ArtifactCache import ArtifactCache
 
 
 from BuildingControlsSimulator.ControllerModels.ControllerModel import ControllerModel
@@ -39,6 +43,30 @@ class EPLUS_THERMOSTAT_MODES(IntEnum):
     DUAL_HEATING_COOLING_SETPOINT = 3
 
 
+class FMI_STATUS(IntEnum):
+    """
+    FMI status returned by FMU do_step
+    """
+
+    OK = 0
+    WARNING = 1
+    DISCARD = 2
+    ERROR = 3
+    FATAL = 4
+    PENDING = 5
+
+
+class FMI_DATA_TYPES(IntEnum):
+    """
+    FMI variable data types as returned by pyfmi get_variable_data_type
+    """
+
+    REAL = 0
+    INTEGER = 1
+    BOOLEAN = 2
+    STRING = 3
+
+
 @attr.s(kw_only=True)
 class EnergyPlusBuildingModel(BuildingModel):
     """Abstract Base Class for building models"""
@@ -58,11 +86,42 @@ class EnergyPlusBuildingModel(BuildingModel):
     fmu_dir = attr.ib(default=os.environ.get("FMU_DIR"))
     heat_on = attr.ib(default=False)
     cool_on = attr.ib(default=False)
+    # optional ArtifactCache of preprocessed IDFs and FMUs
+    artifact_cache = attr.ib(default=None)
+    # artifact file names within their ArtifactCache key
+    artifact_idf_prep_name = "prep.idf"
+    artifact_fmu_name = "model.fmu"
+    # optional StepTimer recording FMU calls
+    step_timer = attr.ib(default=None)
+    # FMU variable value references grouped by FMI data type are resolved
+    # once after loading the FMU, see resolve_value_references
+    output_value_references = attr.ib(factory=dict)
+    actuation_value_references = attr.ib(factory=dict)
+    # last values set on FMU actuation variables, unchanged values are not set
+    last_actuation = attr.ib(default=None)
+    # largest FMU communication step, sub-steps of constant actuation are
+    # coalesced up to this size. EnergyPlus FMUs must be stepped at the IDF
+    # zone timestep so by default each sub-step is one FMU step.
+    max_fmu_step_seconds = attr.ib(default=None)
+    # count of control inputs to both heat and cool, which keep the previous
+    # actuation, see get_actuation
+    n_conflicting_actuations = attr.ib(default=0)
 
     model_creation_step = attr.ib(default=True)
     initialized = attr.ib(default=False)
     model_created = attr.ib(default=False)
 
+    # equipment runtime states actuated on the FMU
+    runtime_columns = [
+        STATES.AUXHEAT1,
+        STATES.AUXHEAT2,
+        STATES.AUXHEAT3,
+        STATES.COMPHEAT1,
+        STATES.COMPHEAT2,
+        STATES.COMPCOOL1,
+        STATES.COMPCOOL2,
+    ]
+
     # for reference on how attr defaults wor for mutable types (e.g. list) see:
     # https://www.attrs.org/en/stable/init.html#defaults
     input_states = attr.ib()
@@ -162,8 +221,8 @@ class EnergyPlusBuildingModel(BuildingModel):
         """make the fmu
 
         Calls FMU model generation script from https://github.com/lbl-srg/EnergyPlusToFMU.
-        This script litters temporary files of fixed names which get clobbered
-        if running in parallel. Need to fix scripts to be able to run in parallel.
+        This script litters temporary files of fixed names in its working
+        directory, see `call_energy_plus_to_fmu` for how builds are isolated.
         """
         if not self.model_created:
 
@@ -177,35 +236,147 @@ class EnergyPlusBuildingModel(BuildingModel):
             self.idf.timesteps_per_hour = self.timesteps_per_hour
             self.idf.init_temperature = self.init_temperature
             self.idf.init_humidity = self.init_humidity
+
+            if self.artifact_cache:
+                self.create_model_fmu_cached(
+                    sim_config=sim_config,
+                    weather_channel=weather_channel,
+                    datetime_channel=datetime_channel,
+                )
+            else:
+                self.idf.preprocess(
+                    sim_config,
+                    datetime_channel=datetime_channel,
+                    weather_channel=weather_channel,
+                    preprocess_check=preprocess_check,
+                )
+
+                self.call_energy_plus_to_fmu()
+
+            self.model_created = True
+
+        return self.fmu_path
+
+    def get_artifact_cache_keys(self, datetime_channel):
+        """Keys of preprocessed IDF and FMU from hashes of all build inputs."""
+        _epw_hash = ArtifactCache.hash_file(self.epw_path)
+        idf_prep_key = ArtifactCache.make_key(
+            artifact="idf_prep",
+            idf_hash=ArtifactCache.hash_file(self.idf.idf_file),
+            building_config=self.idf.building_config,
+            timesteps_per_hour=self.idf.timesteps_per_hour,
+            init_temperature=self.idf.init_temperature,
+            init_humidity=self.idf.init_humidity,
+            init_control_type=self.idf.init_control_type,
+            ep_version=self.idf.ep_version,
+            # RunPeriod is set from datetime channel
+            run_period=[
+                min(datetime_channel.data[STATES.DATE_TIME]),
+                max(datetime_channel.data[STATES.DATE_TIME]),
+                datetime_channel.timezone,
+            ],
+            # HVAC sizing is set from weather data
+            epw_hash=_epw_hash,
+        )
+        fmu_key = ArtifactCache.make_key(
+            artifact="fmu",
+            idf_prep_key=idf_prep_key,
+            epw_hash=_epw_hash,
+            fmi_version=self.fmi_version,
+        )
+        return idf_prep_key, fmu_key
+
+    def create_model_fmu_cached(self, sim_config, weather_channel, datetime_channel):
+        """Restore preprocessed IDF and FMU from artifact_cache when all build
+        inputs are identical, otherwise build and store them.
+
+        Keys hash file contents, not names, so artifacts are stored under fixed
+        names within their key and restored to the paths of this model. A
+        restored FMU keeps the modelIdentifier of the IDF name it was first
+        built from, FMUs are loaded by path so that the file name is not
+        required to match it, see `fmu_path`.
+        """
+        idf_prep_key, fmu_key = self.get_artifact_cache_keys(datetime_channel)
+
+        with self.artifact_cache.lock(idf_prep_key):
+            _restored = self.artifact_cache.restore(
+                key=idf_prep_key,
+                file_name=self.artifact_idf_prep_name,
+                dest_path=self.idf.idf_prep_path,
+            )
+            # a restored IDF is loaded to set the FMU output spec
             self.idf.preprocess(
                 sim_config,
                 datetime_channel=datetime_channel,
                 weather_channel=weather_channel,
-                preprocess_check=preprocess_check,
+                preprocess_check=bool(_restored),
             )
+            if not _restored:
+                self.artifact_cache.put(
+                    key=idf_prep_key,
+                    file_name=self.artifact_idf_prep_name,
+                    src_path=self.idf.idf_prep_path,
+                )
 
-            self.call_energy_plus_to_fmu()
+        with self.artifact_cache.lock(fmu_key):
+            os.makedirs(self.fmu_dir, exist_ok=True)
+            _restored = self.artifact_cache.restore(
+                key=fmu_key, file_name=self.artifact_fmu_name, dest_path=self.fmu_path
+            )
+            if not _restored:
+                self.call_energy_plus_to_fmu()
+                self.artifact_cache.put(
+                    key=fmu_key,
+                    file_name=self.artifact_fmu_name,
+                    src_path=self.fmu_path,
+                )
 
-            self.model_created = True
+        logger.info(f"ArtifactCache stats: {self.artifact_cache.get_stats()}")
 
-        return self.fmu_path
+    def set_scratch_dir(self, scratch_dir):
+        """FMUs and preprocessed IDFs are written to scratch_dir so that
+        simulations running in parallel do not clobber each others files."""
+        self.fmu_dir = os.path.join(scratch_dir, "fmu")
+        self.idf.idf_prep_dir = os.path.join(scratch_dir, "idf_preprocessed")
+        os.makedirs(self.fmu_dir, exist_ok=True)
+        os.makedirs(self.idf.idf_prep_dir, exist_ok=True)
+
+    def set_step_timer(self, step_timer):
+        self.step_timer = step_timer
 
     def call_energy_plus_to_fmu(self):
-        cmd = f"python {self.eplustofmu_path}"
-        cmd += f" -i {self.idf.idd_path}"
-        cmd += f" -w {self.epw_path}"
-        cmd += f" -a {self.fmi_version}"
-        cmd += f" -d {self.idf.idf_prep_path}"
-
-        proc = subprocess.run(shlex.split(cmd), stdout=subprocess.PIPE)
-        if not proc.stdout:
-            raise ValueError(f"Empty STDOUT. Invalid EnergyPlusToFMU cmd={cmd}")
-
-        # EnergyPlusToFMU puts fmu in cwd always, move out of cwd
-        shutil.move(
-            os.path.join(os.getcwd(), self.init_fmu_name),
-            self.fmu_path,
+        """Build FMU in a private temporary directory so that concurrent
+        builds do not clobber the fixed name temporary files of EnergyPlusToFMU.
+        The process cwd is never used or changed."""
+        os.makedirs(self.fmu_dir, exist_ok=True)
+        # build dir is within fmu_dir so that the final move is an atomic rename
+        _build_dir = tempfile.mkdtemp(
+            prefix=f".build_{os.path.splitext(self.init_fmu_name)[0]}_",
+            dir=self.fmu_dir,
         )
+        try:
+            cmd = f"python {os.path.abspath(self.eplustofmu_path)}"
+            cmd += f" -i {os.path.abspath(self.idf.idd_path)}"
+            cmd += f" -w {os.path.abspath(self.epw_path)}"
+            cmd += f" -a {self.fmi_version}"
+            cmd += f" -d {os.path.abspath(self.idf.idf_prep_path)}"
+
+            proc = subprocess.run(
+                shlex.split(cmd), stdout=subprocess.PIPE, cwd=_build_dir
+            )
+            if not proc.stdout:
+                raise ValueError(f"Empty STDOUT. Invalid EnergyPlusToFMU cmd={cmd}")
+
+            _build_fmu_path = os.path.join(_build_dir, self.init_fmu_name)
+            if not os.path.isfile(_build_fmu_path):
+                raise ValueError(
+                    f"EnergyPlusToFMU did not produce FMU: {_build_fmu_path}, cmd={cmd}"
+                )
+
+            # EnergyPlusToFMU puts fmu in its cwd always, move out of build dir
+            os.replace(_build_fmu_path, self.fmu_path)
+        finally:
+            shutil.rmtree(_build_dir, ignore_errors=True)
 
     def initialize(
         self,
@@ -218,6 +389,7 @@ class EnergyPlusBuildingModel(BuildingModel):
     ):
         """"""
         logger.info(f"Initializing EnergyPlusBuildingModel: {self.fmu_path}")
+        self.n_conflicting_actuations = 0
         self.allocate_output_memory(t_start, t_end, t_step, data_spec, categories_dict)
         self.init_step_output()
 
@@ -235,6 +407,7 @@ class EnergyPlusBuildingModel(BuildingModel):
         t_end = t_start + math.ceil((t_end - t_start) / 86400.0) * 86400
         self.fmu.initialize(t_start, t_end)
         self.initialized = True
+        self.resolve_value_references()
 
     def tear_down(self):
         """tear down FMU"""
@@ -244,8 +417,110 @@ class EnergyPlusBuildingModel(BuildingModel):
         # del self.fmu
         # self.fmu = None
         self.fmu.reset()
+        self.last_actuation = None
         # self.initialized = False
 
+    def supports_state_snapshot(self):
+        """FMU state can only be saved and restored by FMI 2.0 FMUs with the
+        canGetAndSetFMUstate capability."""
+        if self.fmu is None or not hasattr(self.fmu, "get_fmu_state"):
+            return False
+        return bool(
+            self.fmu.get_capability_flags().get("canGetAndSetFMUstate", False)
+        )
+
+    def get_state_snapshot(self):
+        if not self.supports_state_snapshot():
+            logger.info(f"FMU does not support state snapshots: {self.fmu_path}")
+            return None
+
+        # serialized state can be restored in other instances of the FMU
+        return {
+            "fmu_state": self.fmu.serialize_fmu_state(self.fmu.get_fmu_state()),
+            "current_t_idx": self.current_t_idx,
+            "step_output": copy.deepcopy(self.step_output),
+            "output": {
+                k: v[: self.current_t_idx].copy() for k, v in self.output.items()
+            },
+            "fmu_output": {
+                k: v[: self.current_t_idx].copy() for k, v in self.fmu_output.items()
+            },
+            "heat_on": self.heat_on,
+            "cool_on": self.cool_on,
+            "last_actuation": self.last_actuation,
+            "n_conflicting_actuations": self.n_conflicting_actuations,
+        }
+
+    def set_state_snapshot(self, snapshot):
+        self.fmu.set_fmu_state(self.fmu.deserialize_fmu_state(snapshot["fmu_state"]))
+        for k, v in snapshot["output"].items():
+            self.output[k][: len(v)] = v
+        for k, v in snapshot["fmu_output"].items():
+            self.fmu_output[k][: len(v)] = v
+        self.step_output = copy.deepcopy(snapshot["step_output"])
+        self.current_t_idx = snapshot["current_t_idx"]
+        self.heat_on = snapshot["heat_on"]
+        self.cool_on = snapshot["cool_on"]
+        self.last_actuation = snapshot["last_actuation"]
+        self.n_conflicting_actuations = snapshot.get("n_conflicting_actuations", 0)
+
+    def get_value_references(self, names):
+        """Group FMU variables by FMI data type.
+
+        :return: dict of data type -> (list of names, np.ndarray of value
+        references)
+        """
+        _names_by_type = {}
+        for name in names:
+            _data_type = FMI_DATA_TYPES(self.fmu.get_variable_data_type(name))
+            _names_by_type.setdefault(_data_type, []).append(name)
+
+        return {
+            _data_type: (
+                _names,
+                np.array(
+                    [self.fmu.get_variable_valueref(name) for name in _names],
+                    dtype="uint32",
+                ),
+            )
+            for _data_type, _names in _names_by_type.items()
+        }
+
+    def resolve_value_references(self):
+        """Resolve FMU variable names once so that each step gets and sets
+        values with one call per FMI data type instead of one per name."""
+        self.output_value_references = self.get_value_references(
+            self.idf.output_spec.keys()
+        )
+        self.actuation_value_references = self.get_value_references(
+            [
+                self.idf.FMU_control_type_name,
+                self.idf.FMU_control_heating_stp_name,
+                self.idf.FMU_control_cooling_stp_name,
+            ]
+        )
+        self.last_actuation = None
+
+    def get_fmu_values(self, data_type, value_references):
+        if data_type == FMI_DATA_TYPES.REAL:
+            return self.fmu.get_real(value_references)
+        elif data_type == FMI_DATA_TYPES.INTEGER:
+            return self.fmu.get_integer(value_references)
+        elif data_type == FMI_DATA_TYPES.BOOLEAN:
+            return self.fmu.get_boolean(value_references)
+        else:
+            return self.fmu.get_string(value_references)
+
+    def set_fmu_values(self, data_type, value_references, values):
+        if data_type == FMI_DATA_TYPES.REAL:
+            self.fmu.set_real(value_references, np.array(values, dtype="float64"))
+        elif data_type == FMI_DATA_TYPES.INTEGER:
+            self.fmu.set_integer(value_references, np.array(values, dtype="int32"))
+        elif data_type == FMI_DATA_TYPES.BOOLEAN:
+            self.fmu.set_boolean(value_references, np.array(values, dtype="bool"))
+        else:
+            self.fmu.set_string(value_references, [str(v) for v in values])
+
     def init_step_output(self):
         self.step_output[STATES.THERMOSTAT_TEMPERATURE] = self.init_temperature
         self.step_output[STATES.THERMOSTAT_HUMIDITY] = self.init_humidity
@@ -257,6 +532,7 @@ class EnergyPlusBuildingModel(BuildingModel):
         """preallocate output memory as numpy arrays to speed up simulation"""
         # reset output memory
         self.output = {}
+        self.output_categories = {}
         self.fmu_output = {}
 
         self.output = {
@@ -269,11 +545,15 @@ class EnergyPlusBuildingModel(BuildingModel):
         # add output state variables
         for state in self.output_states:
             if data_spec.full.spec[state]["dtype"] == "category":
-                self.output[state] = pd.Series(
-                    pd.Categorical(
-                        pd.Series(index=np.arange(n_s)),
-                        categories=categories_dict[state],
-                    )
+                # categorical states are recorded as integer codes, categories
+                # are attached when output is assembled
+                self.output_categories[state] = pd.Index(categories_dict[state])
+                self.output[state] = np.full(
+                    n_s,
+                    -1,
+                    dtype=Conversions.get_category_code_dtype(
+                        self.output_categories[state]
+                    ),
                 )
             else:
                 (
@@ -289,7 +569,9 @@ class EnergyPlusBuildingModel(BuildingModel):
                 )
 
         # add fmu state variables
-        self.fmu_output[STATES.STEP_STATUS] = np.full(n_s, False, dtype="bool")
+        self.fmu_output[STATES.STEP_STATUS] = np.full(
+            n_s, int(FMI_STATUS.OK), dtype="int8"
+        )
         self.fmu_output[STATES.SIMULATION_TIME] = self.output[STATES.SIMULATION_TIME]
 
         for k, v in self.idf.output_spec.items():
@@ -321,33 +603,126 @@ class EnergyPlusBuildingModel(BuildingModel):
         if not step_control_input:
             raise ValueError("step_control_input={step_control_input} is empty.")
 
-        # integrate over simulation step in building model steps
-        # e.g. 300s simulation step in 5x 60s building model steps
-        for _iter in range(t_step // self.step_size_seconds):
-            # set HVAC input
-            _iter_step_control_input = self.get_iter_step_control_input(
-                t_step, _iter, step_control_input
-            )
-            self.actuate_HVAC_equipment(_iter_step_control_input)
+        status = self.do_fmu_steps(
+            t_start, self.get_actuation_schedule(t_step, step_control_input)
+        )
+        self.update_output(status, step_sensor_input)
+
+        # finally increment t_idx
+        self.current_t_idx += 1
 
+    def do_fmu_steps(self, t_start, actuation_schedule):
+        """Integrate over simulation step in building model steps, e.g. 300s
+        simulation step in 5x 60s building model steps.
+
+        :return: status of last FMU step
+        """
+        _t_iter = t_start
+        for _actuation, _n_iter in actuation_schedule:
+            if _actuation is not None:
+                self.set_actuation(_actuation)
+
+            _fmu_step_size = _n_iter * self.step_size_seconds
+            if self.step_timer:
+                _t_ns = time.perf_counter_ns()
             status = self.fmu.do_step(
-                current_t=t_start + _iter * self.step_size_seconds,
-                step_size=self.step_size_seconds,
+                current_t=_t_iter,
+                step_size=_fmu_step_size,
                 new_step=True,
             )
+            if self.step_timer:
+                self.step_timer.lap("fmu_do_step", _t_ns)
+            _t_iter += _fmu_step_size
+        return status
 
-        self.update_output(status, step_sensor_input)
+    def do_replay(
+        self,
+        sim_time,
+        t_step,
+        control_input,
+        sensor_input,
+        weather_input,
+        start_idx,
+        end_idx,
+    ):
+        """`do_step` of steps [start_idx, end_idx) from recorded runtimes.
 
-        # finally increment t_idx
-        self.current_t_idx += 1
+        Steps with all equipment off or on for the whole step, which are most
+        steps of recorded data, are classified with array operations and
+        their actuation schedule is looked up. Only steps with partial
+        runtimes are scheduled per sub-step by `get_actuation_schedule`.
+        """
+        _runtimes = np.column_stack(
+            [
+                control_input.columns[_col][start_idx:end_idx]
+                for _col in self.runtime_columns
+            ]
+        )
+        _is_cool = np.isin(self.runtime_columns, [STATES.COMPCOOL1, STATES.COMPCOOL2])
+        _run_heat = np.any(_runtimes[:, ~_is_cool] > 0, axis=1)
+        _run_cool = np.any(_runtimes[:, _is_cool] > 0, axis=1)
+        _n_iter = t_step // self.step_size_seconds
+        # conflicting heating and cooling keeps the previous actuation
+        _whole = (
+            (_n_iter > 0)
+            & np.all((_runtimes <= 0) | (_runtimes >= t_step), axis=1)
+            & ~(_run_heat & _run_cool)
+        )
+
+        _max_coalesced = 1
+        if self.max_fmu_step_seconds:
+            _max_coalesced = max(self.max_fmu_step_seconds // self.step_size_seconds, 1)
+
+        _whole_schedules = {}
+        for n, i in enumerate(range(start_idx, end_idx)):
+            if _whole[n]:
+                _key = (bool(_run_heat[n]), bool(_run_cool[n]))
+                if _key not in _whole_schedules:
+                    _heat_on, _cool_on, _actuation = self.get_actuation(
+                        dict(zip(self.runtime_columns, _runtimes[n]))
+                    )
+                    _whole_schedules[_key] = (
+                        _heat_on,
+                        _cool_on,
+                        [
+                            (_actuation, min(_max_coalesced, _n_iter - _k))
+                            for _k in range(0, _n_iter, _max_coalesced)
+                        ],
+                    )
+                self.heat_on, self.cool_on, _schedule = _whole_schedules[_key]
+            else:
+                _schedule = self.get_actuation_schedule(t_step, control_input.step(i))
+
+            self.current_t_start = sim_time[i]
+            status = self.do_fmu_steps(sim_time[i], _schedule)
+            self.update_output(status, sensor_input.step(i))
+            self.current_t_idx += 1
+
+    def get_failed_steps(self, start_idx, end_idx):
+        """FMU do_step status worse than warning."""
+        return (
+            self.fmu_output[STATES.STEP_STATUS][start_idx:end_idx] > FMI_STATUS.WARNING
+        )
+
+    def get_health_counters(self):
+        return {"conflicting_actuations": self.n_conflicting_actuations}
 
     def update_output(self, status, step_sensor_input):
         """Update internal output obj for current_t_idx with fmu output."""
         self.fmu_output[STATES.STEP_STATUS][self.current_t_idx] = status
 
         # get fmi zone output
-        for k, v in self.idf.output_spec.items():
-            self.fmu_output[k][self.current_t_idx] = self.fmu.get(k)[0]
+        if self.step_timer:
+            _t_ns = time.perf_counter_ns()
+        for _data_type, (
+            _names,
+            _value_references,
+        ) in self.output_value_references.items():
+            _values = self.get_fmu_values(_data_type, _value_references)
+            for k, v in zip(_names, _values):
+                self.fmu_output[k][self.current_t_idx] = v
+        if self.step_timer:
+            self.step_timer.lap("fmu_get", _t_ns)
 
         # map fmu output to model output
         self.output[STATES.THERMOSTAT_TEMPERATURE][
@@ -404,6 +779,60 @@ class EnergyPlusBuildingModel(BuildingModel):
             ]
         )
 
+    def get_actuation_schedule(self, t_step, step_control_input):
+        """Actuation of all building model sub-steps of a control step computed
+        in one pass, with consecutive sub-steps of identical actuation coalesced
+        up to max_fmu_step_seconds.
+
+        :return: list of (actuation, number of sub-steps), actuation is None
+        if no actuation has been set on the FMU yet.
+        """
+        _n_iter = t_step // self.step_size_seconds
+        if _n_iter > 0 and all(
+            (step_control_input[_col] <= 0) or (step_control_input[_col] >= t_step)
+            for _col in self.runtime_columns
+        ):
+            # equipment is off or on for whole step, all sub-steps are equal
+            _iter_actuations = [
+                self.get_iter_actuation(t_step, 0, step_control_input)
+            ] * _n_iter
+        else:
+            # partial runtime placement depends on the previous sub-step
+            _iter_actuations = [
+                self.get_iter_actuation(t_step, _iter, step_control_input)
+                for _iter in range(_n_iter)
+            ]
+
+        _max_coalesced = 1
+        if self.max_fmu_step_seconds:
+            _max_coalesced = max(self.max_fmu_step_seconds // self.step_size_seconds, 1)
+
+        _schedule = []
+        _prev_actuation = self.last_actuation
+        for _actuation in _iter_actuations:
+            if _actuation is None:
+                # conflicting control input keeps previous actuation
+                _actuation = _prev_actuation
+
+            if (
+                _schedule
+                and _schedule[-1][0] == _actuation
+                and _schedule[-1][1] < _max_coalesced
+            ):
+                _schedule[-1][1] += 1
+            else:
+                _schedule.append([_actuation, 1])
+            _prev_actuation = _actuation
+
+        return [tuple(_s) for _s in _schedule]
+
+    def get_iter_actuation(self, t_step, _iter, step_control_input):
+        """Actuation of sub-step _iter, updates heat_on and cool_on."""
+        self.heat_on, self.cool_on, _actuation = self.get_actuation(
+            self.get_iter_step_control_input(t_step, _iter, step_control_input)
+        )
+        return _actuation
+
     def get_iter_step_control_input(self, t_step, _iter, step_control_input):
         iter_step_control_input = {}
         n_iter = t_step // self.step_size_seconds - 1
@@ -457,6 +886,19 @@ class EnergyPlusBuildingModel(BuildingModel):
         """
         passes actuation to building model with minimal validation.
         """
+        self.heat_on, self.cool_on, _actuation = self.get_actuation(
+            step_control_input
+        )
+        if _actuation is not None:
+            self.set_actuation(_actuation)
+
+    def get_actuation(self, step_control_input):
+        """Map control input to specific actuation within EPlus model.
+
+        :return: (heat_on, cool_on, actuation), actuation is
+        (control type, heating set point, cooling set point) or None if the
+        control input cannot be actuated.
+        """
         T_heat_off = -60.0
         T_heat_on = 99.0
         T_cool_off = 99.0
@@ -475,34 +917,68 @@ class EnergyPlusBuildingModel(BuildingModel):
             (step_control_input[STATES.COMPCOOL1] > 0)
             or (step_control_input[STATES.COMPCOOL2] > 0)
         )
-        self.heat_on = False
-        self.cool_on = False
 
         if run_heat and run_cool:
-            logger.error("Cannot heat and cool at same time.")
+            # counted instead of logged per step, see HealthMonitor
+            if not self.n_conflicting_actuations:
+                logger.error("Cannot heat and cool at same time.")
+            self.n_conflicting_actuations += 1
+            return False, False, None
         elif run_heat:
-            self.heat_on = True
-            self.fmu.set(
-                self.idf.FMU_control_type_name,
-                int(EPLUS_THERMOSTAT_MODES.SINGLE_HEATING_SETPOINT),
+            return (
+                True,
+                False,
+                (
+                    int(EPLUS_THERMOSTAT_MODES.SINGLE_HEATING_SETPOINT),
+                    T_heat_on,
+                    T_cool_off,
+                ),
             )
-            self.fmu.set(self.idf.FMU_control_heating_stp_name, T_heat_on)
-            self.fmu.set(self.idf.FMU_control_cooling_stp_name, T_cool_off)
         elif run_cool:
-            self.cool_on = True
-            self.fmu.set(
-                self.idf.FMU_control_type_name,
-                int(EPLUS_THERMOSTAT_MODES.SINGLE_COOLING_SETPOINT),
+            return (
+                False,
+                True,
+                (
+                    int(EPLUS_THERMOSTAT_MODES.SINGLE_COOLING_SETPOINT),
+                    T_heat_off,
+                    T_cool_on,
+                ),
             )
-            self.fmu.set(self.idf.FMU_control_heating_stp_name, T_heat_off)
-            self.fmu.set(self.idf.FMU_control_cooling_stp_name, T_cool_on)
         else:
-            self.fmu.set(
-                self.idf.FMU_control_type_name,
-                int(EPLUS_THERMOSTAT_MODES.UNCONTROLLED),
+            return (
+                False,
+                False,
+                (
+                    int(EPLUS_THERMOSTAT_MODES.UNCONTROLLED),
+                    T_heat_off,
+                    T_cool_off,
+                ),
+            )
+
+    def set_actuation(self, actuation):
+        """Set (control type, heating set point, cooling set point) on FMU,
+        skipped when unchanged since the previous sub-step."""
+        if actuation == self.last_actuation:
+            return
+
+        _values = dict(
+            zip(
+                [
+                    self.idf.FMU_control_type_name,
+                    self.idf.FMU_control_heating_stp_name,
+                    self.idf.FMU_control_cooling_stp_name,
+                ],
+                actuation,
+            )
+        )
+        for _data_type, (
+            _names,
+            _value_references,
+        ) in self.actuation_value_references.items():
+            self.set_fmu_values(
+                _data_type, _value_references, [_values[name] for name in _names]
             )
-            self.fmu.set(self.idf.FMU_control_heating_stp_name, T_heat_off)
-            self.fmu.set(self.idf.FMU_control_cooling_stp_name, T_cool_off)
+        self.last_actuation = actuation
 
     @staticmethod
     def make_directories():
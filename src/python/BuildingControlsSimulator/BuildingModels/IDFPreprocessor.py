@@ -45,12 +45,18 @@ class IDFPreprocessor:
     ep_version = attr.ib(default=os.environ.get("ENERGYPLUS_INSTALL_VERSION"))
     idf_dir = attr.ib(default=os.environ.get("IDF_DIR"))
     idd_path = attr.ib(default=os.environ.get("EPLUS_IDD"))
+    # preprocessed IDFs are written to idf_dir/preprocessed unless overridden
+    idf_prep_dir = attr.ib()
 
     # output variable spec
     # .rdd file for all output variables
     zone_output_spec = attr.ib()
     building_output_spec = attr.ib()
 
+    @idf_prep_dir.default
+    def get_idf_prep_dir(self):
+        return os.path.join(self.idf_dir, "preprocessed")
+
     # for reference on how attr defaults wor for mutable types (e.g. dict) see:
     # https://www.attrs.org/en/stable/init.html#defaults
     @zone_output_spec.default
@@ -141,10 +147,6 @@ class IDFPreprocessor:
     def idf_prep_name(self):
         return self.idf_name.replace(".idf", "_prep.idf")
 
-    @property
-    def idf_prep_dir(self):
-        return os.path.join(self.idf_dir, "preprocessed")
-
     @property
     def idf_prep_path(self):
         return os.path.join(self.idf_prep_dir, self.idf_prep_name)
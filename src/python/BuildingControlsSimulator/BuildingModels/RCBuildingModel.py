@@ -0,0 +1,526 @@
+import logging
+import copy
+
+import attr
+import pandas as pd
+import numpy as np
+
+from BuildingControlsSimulator.DataClients.DataStates import STATES
+from BuildingControlsSimulator.BuildingModels.BuildingModel import BuildingModel
+from BuildingControlsSimulator.Conversions.Conversions import Conversions
+
+
+logger = logging.getLogger(__name__)
+
+
+@attr.s(kw_only=True)
+class RCBuildingModel(BuildingModel):
+    """Lumped-parameter 2R2C thermal network building model.
+
+    The indoor air node (capacitance c_air) is coupled to the building mass
+    node (c_mass) through r_air_mass and to outdoor air through r_air_out
+    (infiltration and windows). The mass node is coupled to outdoor air
+    through r_mass_out. HVAC and internal gains heat the air node, solar gains
+    are split between the air and mass nodes by solar_air_fraction. Units are
+    SI: J/K, K/W, W, and m2. With r_air_mass=np.inf the mass node is decoupled
+    and the model reduces to a 1R1C model of the air node.
+
+    The network is integrated with forward Euler steps of step_size_seconds.
+    HVAC runtime within a control step is applied as its mean power over the
+    step. Indoor humidity is modeled with a constant dewpoint.
+
+    Example:
+    ```python
+    from BuildingControlsSimulator.BuildingModels.RCBuildingModel import (
+        RCBuildingModel,
+    )
+    building_model = RCBuildingModel(step_size_seconds=60, r_air_out=0.008)
+    ```
+
+    Models of lockstep simulations are stepped together with `do_step_batch`,
+    see BatchSimulation.
+    """
+
+    name = attr.ib(default="2R2C")
+    c_air = attr.ib(default=2.0e6)
+    c_mass = attr.ib(default=2.0e7)
+    r_air_mass = attr.ib(default=0.002)
+    r_air_out = attr.ib(default=0.01)
+    r_mass_out = attr.ib(default=0.01)
+    internal_gain = attr.ib(default=500.0)
+    solar_aperture = attr.ib(default=5.0)
+    solar_air_fraction = attr.ib(default=0.0)
+    # heating and cooling capacity of each equipment stage
+    stage_capacities = attr.ib()
+    init_temperature = attr.ib(default=21.0)
+    init_humidity = attr.ib(default=50.0)
+
+    output = attr.ib(factory=dict)
+    step_output = attr.ib(factory=dict)
+    current_t_idx = attr.ib(default=None)
+    current_t_start = attr.ib(default=None)
+    t_air = attr.ib(default=None)
+    t_mass = attr.ib(default=None)
+    dewpoint = attr.ib(default=None)
+    state_bus = attr.ib(default=None)
+    state_bus_output = attr.ib(default=None)
+
+    model_creation_step = attr.ib(default=False)
+
+    # for reference on how attr defaults wor for mutable types (e.g. list) see:
+    # https://www.attrs.org/en/stable/init.html#defaults
+    input_states = attr.ib()
+    output_states = attr.ib()
+
+    @stage_capacities.default
+    def get_stage_capacities(self):
+        return RCBuildingModel.get_default_stage_capacities()
+
+    @staticmethod
+    def get_default_stage_capacities():
+        return {
+            STATES.AUXHEAT1: 10000.0,
+            STATES.AUXHEAT2: 5000.0,
+            STATES.AUXHEAT3: 5000.0,
+            STATES.COMPHEAT1: 7000.0,
+            STATES.COMPHEAT2: 3000.0,
+            STATES.COMPCOOL1: -7000.0,
+            STATES.COMPCOOL2: -3000.0,
+        }
+
+    @input_states.default
+    def get_input_states(self):
+        return [
+            STATES.AUXHEAT1,
+            STATES.AUXHEAT2,
+            STATES.AUXHEAT3,
+            STATES.COMPCOOL1,
+            STATES.COMPCOOL2,
+            STATES.COMPHEAT1,
+            STATES.COMPHEAT2,
+            STATES.FAN_STAGE_ONE,
+            STATES.FAN_STAGE_TWO,
+            STATES.FAN_STAGE_THREE,
+        ]
+
+    @output_states.default
+    def get_output_states(self):
+        return [
+            STATES.THERMOSTAT_TEMPERATURE,
+            STATES.THERMOSTAT_HUMIDITY,
+            STATES.THERMOSTAT_MOTION,
+        ]
+
+    def get_model_name(self):
+        _model_name = f"RC_{self.name}"
+        _model_name = _model_name.replace(".", "_")
+        return _model_name
+
+    @property
+    def max_step_size_seconds(self):
+        """Largest forward Euler step for which the network is stable."""
+        return min(
+            self.c_air / (1.0 / self.r_air_mass + 1.0 / self.r_air_out),
+            self.c_mass / (1.0 / self.r_air_mass + 1.0 / self.r_mass_out),
+        )
+
+    def initialize(
+        self,
+        start_utc,
+        t_start,
+        t_end,
+        t_step,
+        data_spec,
+        categories_dict,
+    ):
+        """"""
+        if t_step % self.step_size_seconds:
+            raise ValueError(
+                f"Simulation step {t_step} must be a multiple of "
+                + f"step_size_seconds={self.step_size_seconds}."
+            )
+        if self.step_size_seconds >= self.max_step_size_seconds:
+            raise ValueError(
+                f"step_size_seconds={self.step_size_seconds} must be less than "
+                + f"{self.max_step_size_seconds} seconds for stable integration."
+            )
+
+        self.current_t_idx = 0
+        self.allocate_output_memory(
+            t_start=t_start,
+            t_end=t_end,
+            t_step=t_step,
+            data_spec=data_spec,
+            categories_dict=categories_dict,
+        )
+        self.init_step_output()
+        self.t_air = float(self.init_temperature)
+        self.t_mass = float(self.init_temperature)
+        self.dewpoint = float(
+            Conversions.relative_humidity_to_dewpoint(
+                self.init_temperature, self.init_humidity
+            )
+        )
+
+    def allocate_output_memory(
+        self, t_start, t_end, t_step, data_spec, categories_dict
+    ):
+        """preallocate output memory to speed up simulation"""
+        # reset output
+        self.output = {}
+
+        self.output = {
+            STATES.SIMULATION_TIME: np.arange(
+                t_start, t_end + t_step, t_step, dtype="int64"
+            )
+        }
+        n_s = len(self.output[STATES.SIMULATION_TIME])
+
+        # add state variables
+        for state in self.output_states:
+            (
+                np_default_value,
+                np_dtype,
+            ) = Conversions.numpy_down_cast_default_value_dtype(
+                data_spec.full.spec[state]["dtype"]
+            )
+            self.output[state] = np.full(
+                n_s,
+                np_default_value,
+                dtype=np_dtype,
+            )
+
+    def tear_down(self):
+        """no external resources to tear down"""
+        pass
+
+    def init_step_output(self):
+        self.step_output[STATES.THERMOSTAT_TEMPERATURE] = self.init_temperature
+        self.step_output[STATES.THERMOSTAT_HUMIDITY] = self.init_humidity
+        self.step_output[STATES.THERMOSTAT_MOTION] = False
+
+    @staticmethod
+    def get_hvac_gain(stage_capacities, step_control_input, t_step):
+        """Mean HVAC heat gain over control step from equipment runtimes."""
+        return sum(
+            np.asarray(step_control_input[state], dtype="float64") / t_step * capacity
+            for state, capacity in stage_capacities.items()
+        )
+
+    @staticmethod
+    def integrate(
+        t_air,
+        t_mass,
+        t_out,
+        air_gain,
+        mass_gain,
+        c_air,
+        c_mass,
+        r_air_mass,
+        r_air_out,
+        r_mass_out,
+        dt,
+        n_steps,
+    ):
+        """Forward Euler integration of the network over n_steps of dt seconds.
+
+        All arguments may be scalars or arrays of shape (N,) of N buildings.
+        """
+        for _ in range(n_steps):
+            _q_air_mass = (t_mass - t_air) / r_air_mass
+            _t_air_next = t_air + dt / c_air * (
+                _q_air_mass + (t_out - t_air) / r_air_out + air_gain
+            )
+            t_mass = t_mass + dt / c_mass * (
+                -_q_air_mass + (t_out - t_mass) / r_mass_out + mass_gain
+            )
+            t_air = _t_air_next
+        return t_air, t_mass
+
+    @staticmethod
+    def get_weather_inputs(step_weather_input):
+        """Outdoor temperature and global horizontal irradiance, missing
+        irradiance is treated as no solar gain."""
+        _t_out = np.asarray(step_weather_input[STATES.OUTDOOR_TEMPERATURE], "float64")
+        if STATES.GLOBAL_HORIZONTAL_IRRADIANCE in step_weather_input:
+            _ghi = np.nan_to_num(
+                np.asarray(
+                    step_weather_input[STATES.GLOBAL_HORIZONTAL_IRRADIANCE], "float64"
+                )
+            )
+        else:
+            _ghi = np.zeros_like(_t_out)
+        return _t_out, _ghi
+
+    def set_state_bus(self, state_bus):
+        if state_bus is None or not state_bus.supports(self.output_states):
+            self.state_bus = None
+            self.state_bus_output = None
+            return False
+
+        self.state_bus = state_bus
+        self.state_bus_output = state_bus.get_view(self.output_states)
+        return True
+
+    def step_network(self, t_step, hvac_gain, step_weather_input):
+        """Integrate network over control step given mean HVAC gain."""
+        _t_out, _ghi = RCBuildingModel.get_weather_inputs(step_weather_input)
+        _solar_gain = self.solar_aperture * float(_ghi)
+        self.t_air, self.t_mass = RCBuildingModel.integrate(
+            t_air=self.t_air,
+            t_mass=self.t_mass,
+            t_out=float(_t_out),
+            air_gain=hvac_gain
+            + self.internal_gain
+            + self.solar_air_fraction * _solar_gain,
+            mass_gain=(1.0 - self.solar_air_fraction) * _solar_gain,
+            c_air=self.c_air,
+            c_mass=self.c_mass,
+            r_air_mass=self.r_air_mass,
+            r_air_out=self.r_air_out,
+            r_mass_out=self.r_mass_out,
+            dt=self.step_size_seconds,
+            n_steps=t_step // self.step_size_seconds,
+        )
+
+    def do_step(
+        self,
+        t_start,
+        t_step,
+        step_control_input,
+        step_sensor_input,
+        step_weather_input,
+    ):
+        """Simulate building model time step. Outputs are written to
+        step_output, or to the state bus if attached, in which case output
+        memory is written by the Simulation from the recorded bus."""
+        self.current_t_start = t_start
+
+        if not step_control_input:
+            raise ValueError(f"step_control_input={step_control_input} is empty.")
+
+        self.step_network(
+            t_step=t_step,
+            hvac_gain=float(
+                RCBuildingModel.get_hvac_gain(
+                    self.stage_capacities, step_control_input, t_step
+                )
+            ),
+            step_weather_input=step_weather_input,
+        )
+
+        if self.state_bus is not None:
+            _step_output = self.state_bus_output
+        else:
+            _step_output = self.step_output
+
+        # step output has the precision of output memory
+        _output = self.output
+        _step_output[STATES.THERMOSTAT_TEMPERATURE] = _output[
+            STATES.THERMOSTAT_TEMPERATURE
+        ].dtype.type(self.t_air)
+        _step_output[STATES.THERMOSTAT_HUMIDITY] = _output[
+            STATES.THERMOSTAT_HUMIDITY
+        ].dtype.type(
+            Conversions.relative_humidity_from_dewpoint(
+                temperature=self.t_air, dewpoint=self.dewpoint
+            )
+        )
+        # pass through motion
+        _step_output[STATES.THERMOSTAT_MOTION] = _output[
+            STATES.THERMOSTAT_MOTION
+        ].dtype.type(step_sensor_input[STATES.THERMOSTAT_MOTION])
+
+        if self.state_bus is None:
+            for state in self.output_states:
+                self.output[state][self.current_t_idx] = self.step_output[state]
+        self.current_t_idx += 1
+
+    def do_replay(
+        self,
+        sim_time,
+        t_step,
+        control_input,
+        sensor_input,
+        weather_input,
+        start_idx,
+        end_idx,
+    ):
+        """`do_step` of steps [start_idx, end_idx) with gains computed for all
+        steps at once, only the network integration is stepped."""
+        if end_idx <= start_idx:
+            return
+
+        _hvac_gain = RCBuildingModel.get_hvac_gain(
+            self.stage_capacities,
+            {
+                state: control_input.columns[state][start_idx:end_idx]
+                for state in self.stage_capacities.keys()
+            },
+            t_step,
+        ) + np.zeros(end_idx - start_idx)
+        _t_out, _ghi = RCBuildingModel.get_weather_inputs(
+            {
+                state: weather_input.columns[state][start_idx:end_idx]
+                for state in [
+                    STATES.OUTDOOR_TEMPERATURE,
+                    STATES.GLOBAL_HORIZONTAL_IRRADIANCE,
+                ]
+                if state in weather_input.columns
+            }
+        )
+        _solar_gain = self.solar_aperture * _ghi
+        _air_gain = (
+            _hvac_gain + self.internal_gain + self.solar_air_fraction * _solar_gain
+        )
+        _mass_gain = (1.0 - self.solar_air_fraction) * _solar_gain
+        _n_steps = t_step // self.step_size_seconds
+
+        _t_air = np.zeros(end_idx - start_idx)
+        for n in range(end_idx - start_idx):
+            self.t_air, self.t_mass = RCBuildingModel.integrate(
+                t_air=self.t_air,
+                t_mass=self.t_mass,
+                t_out=float(_t_out[n]),
+                air_gain=float(_air_gain[n]),
+                mass_gain=float(_mass_gain[n]),
+                c_air=self.c_air,
+                c_mass=self.c_mass,
+                r_air_mass=self.r_air_mass,
+                r_air_out=self.r_air_out,
+                r_mass_out=self.r_mass_out,
+                dt=self.step_size_seconds,
+                n_steps=_n_steps,
+            )
+            _t_air[n] = self.t_air
+
+        self.current_t_start = sim_time[end_idx - 1]
+        _idx = slice(self.current_t_idx, self.current_t_idx + end_idx - start_idx)
+        self.output[STATES.THERMOSTAT_TEMPERATURE][_idx] = _t_air
+        self.output[STATES.THERMOSTAT_HUMIDITY][
+            _idx
+        ] = Conversions.relative_humidity_from_dewpoint(
+            temperature=_t_air, dewpoint=self.dewpoint
+        )
+        # pass through motion
+        self.output[STATES.THERMOSTAT_MOTION][_idx] = sensor_input.columns[
+            STATES.THERMOSTAT_MOTION
+        ][start_idx:end_idx]
+        self.current_t_idx = _idx.stop
+
+        for state in self.output_states:
+            self.step_output[state] = self.output[state][self.current_t_idx - 1]
+
+    @staticmethod
+    def init_batch_state(models):
+        """Stack per-instance state of lockstep simulations into arrays."""
+        _batch_state = {
+            _param: np.array([getattr(m, _param) for m in models], dtype="float64")
+            for _param in [
+                "c_air",
+                "c_mass",
+                "r_air_mass",
+                "r_air_out",
+                "r_mass_out",
+                "internal_gain",
+                "solar_aperture",
+                "solar_air_fraction",
+                "t_air",
+                "t_mass",
+                "dewpoint",
+            ]
+        }
+        _step_size_seconds = set([m.step_size_seconds for m in models])
+        if len(_step_size_seconds) != 1:
+            raise ValueError(
+                "Lockstep RCBuildingModel requires equal step_size_seconds, got: "
+                + f"{_step_size_seconds}"
+            )
+        _batch_state["step_size_seconds"] = _step_size_seconds.pop()
+        # ordered union of stages so that gains are summed in the same order
+        # as in do_step
+        _stages = dict.fromkeys(
+            state for m in models for state in m.stage_capacities.keys()
+        )
+        _batch_state["stage_capacities"] = {
+            state: np.array(
+                [m.stage_capacities.get(state, 0.0) for m in models], dtype="float64"
+            )
+            for state in _stages
+        }
+        # step output has the dtype of per-instance output memory
+        _batch_state["output_dtypes"] = {
+            state: models[0].output[state].dtype for state in models[0].output_states
+        }
+        _batch_state["step_output"] = {
+            state: np.array([m.step_output[state] for m in models])
+            for state in models[0].output_states
+        }
+        return _batch_state
+
+    @staticmethod
+    def do_step_batch(
+        batch_state,
+        t_start,
+        t_step,
+        step_control_input,
+        step_sensor_input,
+        step_weather_input,
+    ):
+        """Vectorized `do_step` over arrays of shape (N,) of N buildings."""
+        _t_out, _ghi = RCBuildingModel.get_weather_inputs(step_weather_input)
+        _solar_gain = batch_state["solar_aperture"] * _ghi
+        _solar_air_fraction = batch_state["solar_air_fraction"]
+        batch_state["t_air"], batch_state["t_mass"] = RCBuildingModel.integrate(
+            t_air=batch_state["t_air"],
+            t_mass=batch_state["t_mass"],
+            t_out=_t_out,
+            air_gain=RCBuildingModel.get_hvac_gain(
+                batch_state["stage_capacities"], step_control_input, t_step
+            )
+            + batch_state["internal_gain"]
+            + _solar_air_fraction * _solar_gain,
+            mass_gain=(1.0 - _solar_air_fraction) * _solar_gain,
+            c_air=batch_state["c_air"],
+            c_mass=batch_state["c_mass"],
+            r_air_mass=batch_state["r_air_mass"],
+            r_air_out=batch_state["r_air_out"],
+            r_mass_out=batch_state["r_mass_out"],
+            dt=batch_state["step_size_seconds"],
+            n_steps=t_step // batch_state["step_size_seconds"],
+        )
+
+        _dtypes = batch_state["output_dtypes"]
+        _step_output = batch_state["step_output"]
+        _step_output[STATES.THERMOSTAT_TEMPERATURE] = batch_state["t_air"].astype(
+            _dtypes[STATES.THERMOSTAT_TEMPERATURE]
+        )
+        _step_output[STATES.THERMOSTAT_HUMIDITY] = (
+            Conversions.relative_humidity_from_dewpoint(
+                temperature=batch_state["t_air"], dewpoint=batch_state["dewpoint"]
+            ).astype(_dtypes[STATES.THERMOSTAT_HUMIDITY])
+        )
+        # pass through motion
+        _step_output[STATES.THERMOSTAT_MOTION] = np.asarray(
+            step_sensor_input[STATES.THERMOSTAT_MOTION]
+        ).astype(_dtypes[STATES.THERMOSTAT_MOTION])
+        return _step_output
+
+    def get_state_snapshot(self):
+        return {
+            "current_t_idx": self.current_t_idx,
+            "t_air": self.t_air,
+            "t_mass": self.t_mass,
+            "step_output": copy.deepcopy(self.step_output),
+            "output": {
+                k: v[: self.current_t_idx].copy() for k, v in self.output.items()
+            },
+        }
+
+    def set_state_snapshot(self, snapshot):
+        for k, v in snapshot["output"].items():
+            self.output[k][: len(v)] = v
+        self.step_output = copy.deepcopy(snapshot["step_output"])
+        self.current_t_idx = snapshot["current_t_idx"]
+        self.t_air = snapshot["t_air"]
+        self.t_mass = snapshot["t_mass"]
@@ -0,0 +1,346 @@
+import os
+import logging
+import json
+import tempfile
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import attr
+import pandas as pd
+import numpy as np
+
+from BuildingControlsSimulator.DataClients.DataStates import STATES
+from BuildingControlsSimulator.DataClients.DataClient import DataClient
+from BuildingControlsSimulator.BuildingModels.RCBuildingModel import RCBuildingModel
+from BuildingControlsSimulator.BuildingModels.ArtifactCache import ArtifactCache
+
+logger = logging.getLogger(__name__)
+
+
+def get_normal_equations_worker(data_client, stage_capacities):
+    """Load data of a single sim_config and reduce it to normal equations,
+    capturing any error so that one identifier cannot fail the fleet."""
+    try:
+        data_client.get_data()
+        X, y = RCCalibration.get_regression_data(data_client, stage_capacities)
+        return RCCalibration.get_normal_equations(X, y), None
+    except Exception as e:
+        logger.error(
+            f"Calibration data of {data_client.sim_config['identifier']} "
+            + f"failed: {e!r}"
+        )
+        return None, repr(e)
+
+
+@attr.s(kw_only=True)
+class RCCalibrationResult:
+    """Fitted 1R1C parameters of a single identifier and data range."""
+
+    identifier = attr.ib()
+    start_utc = attr.ib()
+    end_utc = attr.ib()
+    c_air = attr.ib(default=np.nan)
+    r_air_out = attr.ib(default=np.nan)
+    internal_gain = attr.ib(default=np.nan)
+    solar_aperture = attr.ib(default=np.nan)
+    rmse = attr.ib(default=np.nan)
+    n_samples = attr.ib(default=0)
+    success = attr.ib(default=False)
+    error = attr.ib(default=None)
+
+    def to_dict(self):
+        return attr.asdict(self)
+
+    def get_building_model(self, step_size_seconds=60, **kwargs):
+        """RCBuildingModel with fitted parameters and decoupled mass node."""
+        if not self.success:
+            raise ValueError(
+                f"Calibration of {self.identifier} failed: {self.error}"
+            )
+
+        return RCBuildingModel(
+            step_size_seconds=step_size_seconds,
+            name=f"calibrated_{self.identifier}",
+            c_air=self.c_air,
+            r_air_out=self.r_air_out,
+            r_air_mass=np.inf,
+            internal_gain=self.internal_gain,
+            solar_aperture=self.solar_aperture,
+            solar_air_fraction=1.0,
+            **kwargs,
+        )
+
+
+@attr.s(kw_only=True)
+class RCCalibration:
+    """Fits thermal parameters of RCBuildingModel for each identifier of
+    sim_config from its prepared DataClient channels.
+
+    The air node of a 1R1C model discretized at the sim step dt,
+
+        T[k+1] - T[k] = dt / (R C) (T_out[k] - T[k]) + dt / C Q_hvac[k]
+                        + dt A / C GHI[k] + dt / C Q_int
+
+    is linear in its coefficients. Each identifier is reduced to normal
+    equations of its valid step pairs, loading data in parallel worker
+    processes, and all identifiers are solved in one batched least squares.
+    HVAC gain is computed from equipment runtimes and stage_capacities, which
+    sets the scale of the fitted capacitance.
+
+    Results are cached per identifier and data range in artifact_cache.
+    """
+
+    sim_config = attr.ib()
+    data_client = attr.ib()
+    stage_capacities = attr.ib(
+        factory=RCBuildingModel.get_default_stage_capacities
+    )
+    artifact_cache = attr.ib(default=None)
+    # minimum number of valid step pairs to fit an identifier
+    min_samples = attr.ib(default=288)
+    results = attr.ib(factory=list)
+
+    # file name of cached results within artifact cache
+    cache_file_name = "rc_calibration.json"
+
+    @staticmethod
+    def get_valid_mask(data_client):
+        """Rows of measured data within full_data_periods and sim_config range,
+        filled records are not used for fitting."""
+        _datetimes = data_client.datetime.data[STATES.DATE_TIME]
+        _valid = (_datetimes >= data_client.sim_config["start_utc"]) & (
+            _datetimes < data_client.sim_config["end_utc"]
+        )
+        return _valid.to_numpy() & DataClient.get_periods_mask(
+            _datetimes, data_client.full_data_periods
+        )
+
+    @staticmethod
+    def get_regression_data(data_client, stage_capacities):
+        """Features and target of valid consecutive step pairs.
+
+        :return: X of shape (n, 4): outdoor-indoor temperature difference,
+        HVAC gain, global horizontal irradiance, constant. y of shape (n,):
+        indoor temperature change over step.
+        """
+        _dt = int(data_client.sim_config["sim_step_size_seconds"])
+        _t_in = data_client.sensors.data[STATES.THERMOSTAT_TEMPERATURE].to_numpy(
+            dtype="float64"
+        )
+        _t_out, _ghi = RCBuildingModel.get_weather_inputs(
+            {
+                k: data_client.weather.data[k].to_numpy(dtype="float64")
+                for k in [
+                    STATES.OUTDOOR_TEMPERATURE,
+                    STATES.GLOBAL_HORIZONTAL_IRRADIANCE,
+                ]
+                if k in data_client.weather.data.columns
+            }
+        )
+        _hvac_gain = RCBuildingModel.get_hvac_gain(
+            {
+                k: v
+                for k, v in stage_capacities.items()
+                if k in data_client.equipment.data.columns
+            },
+            {
+                k: data_client.equipment.data[k].to_numpy(dtype="float64")
+                for k in data_client.equipment.data.columns
+                if k in stage_capacities
+            },
+            _dt,
+        ) + np.zeros_like(_t_in)
+
+        _datetimes_ns = (
+            data_client.datetime.data[STATES.DATE_TIME]
+            .to_numpy(dtype="datetime64[ns]")
+            .view("int64")
+        )
+        _valid = RCCalibration.get_valid_mask(data_client)
+        _pairs = (
+            _valid[:-1]
+            & _valid[1:]
+            & (np.diff(_datetimes_ns) == _dt * 10 ** 9)
+            & np.isfinite(_t_in[:-1] + _t_in[1:] + _t_out[:-1])
+            & np.isfinite(_hvac_gain[:-1])
+        )
+        _k = np.flatnonzero(_pairs)
+
+        X = np.column_stack(
+            [
+                _t_out[_k] - _t_in[_k],
+                _hvac_gain[_k],
+                _ghi[_k],
+                np.ones(len(_k)),
+            ]
+        )
+        y = _t_in[_k + 1] - _t_in[_k]
+        return X, y
+
+    @staticmethod
+    def get_normal_equations(X, y):
+        return {
+            "XtX": X.T @ X,
+            "Xty": X.T @ y,
+            "yty": float(y @ y),
+            "n_samples": len(y),
+        }
+
+    @staticmethod
+    def solve_batch(XtX, Xty, yty):
+        """Least squares coefficients and residual sum of squares of N
+        systems of normal equations with XtX of shape (N, p, p)."""
+        # pseudo-inverse handles rank deficient systems, e.g. no solar data
+        theta = np.einsum("nij,nj->ni", np.linalg.pinv(XtX), Xty)
+        sse = (
+            yty
+            - 2.0 * np.einsum("ni,ni->n", theta, Xty)
+            + np.einsum("ni,nij,nj->n", theta, XtX, theta)
+        )
+        return theta, np.maximum(sse, 0.0)
+
+    @staticmethod
+    def get_parameters(theta, dt):
+        """Map coefficients of shape (N, 4) to physical parameters."""
+        _a, _b, _c, _d = theta.T
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return {
+                "c_air": dt / _b,
+                "r_air_out": _b / _a,
+                "solar_aperture": _c / _b,
+                "internal_gain": _d / _b,
+            }
+
+    def get_cache_key(self, data_client):
+        return ArtifactCache.make_key(
+            artifact="rc_calibration",
+            source_name=data_client.source.source_name,
+            identifier=data_client.sim_config["identifier"],
+            start_utc=data_client.sim_config["start_utc"],
+            end_utc=data_client.sim_config["end_utc"],
+            sim_step_size_seconds=data_client.sim_config["sim_step_size_seconds"],
+            stage_capacities={int(k): v for k, v in self.stage_capacities.items()},
+            min_samples=self.min_samples,
+        )
+
+    def get_cached_result(self, key):
+        if not self.artifact_cache:
+            return None
+
+        _fpath = self.artifact_cache.get(key, RCCalibration.cache_file_name)
+        if not _fpath:
+            return None
+
+        with open(_fpath, "r") as f:
+            _result = json.load(f)
+        for _k in ["start_utc", "end_utc"]:
+            _result[_k] = pd.Timestamp(_result[_k])
+        return RCCalibrationResult(**_result)
+
+    def put_cached_result(self, key, result):
+        if not self.artifact_cache:
+            return
+
+        with tempfile.TemporaryDirectory() as _tmp_dir:
+            _tmp_fpath = os.path.join(_tmp_dir, RCCalibration.cache_file_name)
+            with open(_tmp_fpath, "w") as f:
+                json.dump(result.to_dict(), f, default=str)
+            self.artifact_cache.put(key, RCCalibration.cache_file_name, _tmp_fpath)
+
+    def calibrate(self, n_workers=1, mp_context=None):
+        """Fit parameters of each identifier of sim_config.
+
+        :param n_workers: number of worker processes loading data, if 1 data
+        is loaded in this process
+        :return: list of RCCalibrationResult in order of sim_config
+        """
+        _data_clients = [
+            self.data_client.copy_for_sim_config(_sim_config.to_dict())
+            for _, _sim_config in self.sim_config.iterrows()
+        ]
+        _keys = [self.get_cache_key(_dc) for _dc in _data_clients]
+        _results = [self.get_cached_result(_key) for _key in _keys]
+        _uncached_idxs = [n for n, r in enumerate(_results) if r is None]
+        logger.info(
+            f"Calibrating {len(_uncached_idxs)} of {len(_results)} identifiers "
+            + f"with {n_workers} workers"
+        )
+
+        _normal_equations = {}
+        if n_workers > 1:
+            with ProcessPoolExecutor(
+                max_workers=n_workers, mp_context=mp_context
+            ) as executor:
+                _futures = {
+                    executor.submit(
+                        get_normal_equations_worker,
+                        _data_clients[n],
+                        self.stage_capacities,
+                    ): n
+                    for n in _uncached_idxs
+                }
+                for _future in as_completed(_futures):
+                    _normal_equations[_futures[_future]] = _future.result()
+        else:
+            for n in _uncached_idxs:
+                _normal_equations[n] = get_normal_equations_worker(
+                    _data_clients[n], self.stage_capacities
+                )
+
+        for n, _result in zip(
+            _uncached_idxs, self.solve(_data_clients, _normal_equations)
+        ):
+            _results[n] = _result
+            # errors loading data are not cached so that they are retried
+            if _normal_equations[n][0] is not None:
+                self.put_cached_result(_keys[n], _result)
+
+        self.results = _results
+        return self.results
+
+    def solve(self, data_clients, normal_equations):
+        """Batched solve of all identifiers with enough valid samples.
+
+        :param normal_equations: dict of index of data_clients -> (normal
+        equations or None, error)
+        """
+        _results = {}
+        _idxs = []
+        for n, (_ne, _error) in sorted(normal_equations.items()):
+            _sim_config = data_clients[n].sim_config
+            _results[n] = RCCalibrationResult(
+                identifier=_sim_config["identifier"],
+                start_utc=_sim_config["start_utc"],
+                end_utc=_sim_config["end_utc"],
+                n_samples=_ne["n_samples"] if _ne else 0,
+                error=_error,
+            )
+            if _ne and _ne["n_samples"] >= self.min_samples:
+                _idxs.append(n)
+            elif _ne:
+                _results[n].error = f"Too few samples: {_ne['n_samples']}"
+
+        if _idxs:
+            _dt = np.array(
+                [data_clients[n].sim_config["sim_step_size_seconds"] for n in _idxs],
+                dtype="float64",
+            )
+            theta, sse = RCCalibration.solve_batch(
+                XtX=np.stack([normal_equations[n][0]["XtX"] for n in _idxs]),
+                Xty=np.stack([normal_equations[n][0]["Xty"] for n in _idxs]),
+                yty=np.array([normal_equations[n][0]["yty"] for n in _idxs]),
+            )
+            _params = RCCalibration.get_parameters(theta, _dt)
+            for m, n in enumerate(_idxs):
+                _result = _results[n]
+                _result.rmse = float(np.sqrt(sse[m] / _result.n_samples))
+                for _k, _v in _params.items():
+                    setattr(_result, _k, float(_v[m]))
+                # heat loss and HVAC gain must both be positive to be physical
+                _result.success = bool(theta[m, 0] > 0 and theta[m, 1] > 0)
+                if not _result.success:
+                    _result.error = f"Non-physical coefficients: {theta[m]}"
+
+        return [_results[n] for n in sorted(_results.keys())]
+
+    def get_results_dataframe(self):
+        return pd.DataFrame([r.to_dict() for r in self.results])
@@ -0,0 +1,83 @@
+import logging
+import os
+import tempfile
+import shutil
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from BuildingControlsSimulator.BuildingModels.ArtifactCache import ArtifactCache
+
+logger = logging.getLogger(__name__)
+
+
+class TestArtifactCache:
+    @classmethod
+    def setup_class(cls):
+        cls.tmp_dir = tempfile.mkdtemp()
+        cls.src_path = os.path.join(cls.tmp_dir, "Furnace_prep.idf")
+        with open(cls.src_path, "w") as f:
+            f.write("Version, 9.4;\n")
+
+    @classmethod
+    def teardown_class(cls):
+        """teardown any state that was previously setup with a call to
+        setup_class.
+        """
+        shutil.rmtree(cls.tmp_dir, ignore_errors=True)
+
+    def get_cache(self):
+        return ArtifactCache(cache_dir=tempfile.mkdtemp(dir=self.tmp_dir))
+
+    def test_make_key(self):
+        _key = ArtifactCache.make_key(
+            idf_hash=ArtifactCache.hash_file(self.src_path),
+            building_config={"hvac": {"heating_sizing_factor": 1.2}},
+            timesteps_per_hour=12,
+        )
+        # keys are independent of argument order
+        assert _key == ArtifactCache.make_key(
+            timesteps_per_hour=12,
+            building_config={"hvac": {"heating_sizing_factor": 1.2}},
+            idf_hash=ArtifactCache.hash_file(self.src_path),
+        )
+        assert _key != ArtifactCache.make_key(
+            idf_hash=ArtifactCache.hash_file(self.src_path),
+            building_config={"hvac": {"heating_sizing_factor": 1.2}},
+            timesteps_per_hour=60,
+        )
+
+    def test_get_put_restore(self):
+        cache = self.get_cache()
+        _key = ArtifactCache.make_key(idf_hash=ArtifactCache.hash_file(self.src_path))
+        assert cache.get(_key, "Furnace_prep.idf") is None
+
+        cache.put(_key, "Furnace_prep.idf", self.src_path)
+        _dest_path = os.path.join(self.tmp_dir, "restored", "other_name.idf")
+        assert cache.restore(_key, "Furnace_prep.idf", _dest_path) == _dest_path
+        assert ArtifactCache.hash_file(_dest_path) == ArtifactCache.hash_file(
+            self.src_path
+        )
+        assert cache.get_stats() == {"hits": 1, "misses": 1, "hit_rate": 0.5}
+
+    def test_concurrent_builds(self):
+        """Only one of several concurrent builders of the same key builds."""
+        cache = self.get_cache()
+        _key = ArtifactCache.make_key(artifact="fmu")
+        builds = []
+
+        def build(i):
+            with cache.lock(_key):
+                if not cache.get(_key, "model.fmu"):
+                    builds.append(i)
+                    cache.put(_key, "model.fmu", self.src_path)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(build, range(16)))
+
+        assert len(builds) == 1
+        assert cache.get_stats()["misses"] == 1
+        # no temporary files left in artifact dir
+        assert os.listdir(cache.get_artifact_dir(_key)) == ["model.fmu"]
@@ -5,6 +5,8 @@ import subprocess
 import os
 import shutil
 import logging
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 import pytz
 
 import pytest
@@ -13,8 +15,10 @@ import pandas as pd
 import numpy as np
 
 from BuildingControlsSimulator.BuildingModels.IDFPreprocessor import IDFPreprocessor
+from BuildingControlsSimulator.BuildingModels.ArtifactCache import ArtifactCache
 from BuildingControlsSimulator.BuildingModels.EnergyPlusBuildingModel import (
     EnergyPlusBuildingModel,
+    FMI_DATA_TYPES,
 )
 from BuildingControlsSimulator.DataClients.DataStates import STATES
 from BuildingControlsSimulator.DataClients.DataSpec import Internal
@@ -27,6 +31,32 @@ from BuildingControlsSimulator.DataClients.DataSpec import DonateYourDataSpec
 logger = logging.getLogger(__name__)
 
 
+class RecordingFMU:
+    """Minimal FMU recording batched get and set calls."""
+
+    def __init__(self, variables):
+        # name -> (data type, value)
+        self.variables = variables
+        self.names = list(variables.keys())
+        self.calls = []
+
+    def get_variable_valueref(self, name):
+        return self.names.index(name)
+
+    def get_variable_data_type(self, name):
+        return int(self.variables[name][0])
+
+    def get_real(self, value_references):
+        self.calls.append(("get_real", list(value_references)))
+        return np.array([self.variables[self.names[vr]][1] for vr in value_references])
+
+    def set_real(self, value_references, values):
+        self.calls.append(("set_real", list(value_references), list(values)))
+
+    def set_integer(self, value_references, values):
+        self.calls.append(("set_integer", list(value_references), list(values)))
+
+
 class TestEnergyPlusBuildingModel:
     @classmethod
     def setup_class(cls):
@@ -129,6 +159,142 @@ class TestEnergyPlusBuildingModel:
         # test that preprocessing produces valid IDF output file
         assert building_model.idf.check_valid_idf(prep_idf) is True
 
+    def test_concurrent_fmu_builds(self):
+        """test that several FMUs can be built concurrently from different
+        IDFs without clobbering each other or littering the process cwd."""
+        idf_names = [
+            "Furnace.idf",
+            "1ZoneUncontrolled.idf",
+            "1ZoneEvapCooler.idf",
+            "5ZoneAirCooled.idf",
+        ]
+        epw_name = "USA_IL_Chicago-OHare.Intl.AP.725300_TMY3.epw"
+        epw_path = os.path.join(os.environ.get("WEATHER_DIR"), epw_name)
+        if not os.path.isfile(epw_path):
+            shutil.copyfile(
+                os.path.join(os.environ.get("EPLUS_DIR"), "WeatherData", epw_name),
+                epw_path,
+            )
+
+        cwd_files = set(os.listdir(os.getcwd()))
+        with tempfile.TemporaryDirectory() as _tmp_dir:
+            building_models = []
+            for _idf_name in idf_names:
+                _idf_path = os.path.join(os.environ.get("IDF_DIR"), _idf_name)
+                if not os.path.isfile(_idf_path):
+                    shutil.copyfile(
+                        os.path.join(
+                            os.environ.get("EPLUS_DIR"), "ExampleFiles", _idf_name
+                        ),
+                        _idf_path,
+                    )
+                _building_model = EnergyPlusBuildingModel(
+                    idf=IDFPreprocessor(
+                        idf_file=_idf_path,
+                        idf_prep_dir=os.path.join(_tmp_dir, "preprocessed"),
+                    ),
+                    epw_path=epw_path,
+                    step_size_seconds=self.step_size,
+                    fmu_dir=os.path.join(_tmp_dir, "fmu"),
+                )
+                # build FMU directly from the unmodified IDF
+                shutil.copyfile(_idf_path, _building_model.idf.idf_prep_path)
+                building_models.append(_building_model)
+
+            with ThreadPoolExecutor(max_workers=len(building_models)) as executor:
+                list(
+                    executor.map(
+                        lambda _b: _b.call_energy_plus_to_fmu(), building_models
+                    )
+                )
+
+            for _building_model in building_models:
+                assert os.path.isfile(_building_model.fmu_path)
+                fmu = pyfmi.load_fmu(_building_model.fmu_path)
+                assert fmu.get_version() == "1.0"
+
+            # only the built FMUs remain, no build directories
+            assert sorted(os.listdir(os.path.join(_tmp_dir, "fmu"))) == sorted(
+                [os.path.basename(_b.fmu_path) for _b in building_models]
+            )
+
+        assert set(os.listdir(os.getcwd())) == cwd_files
+
+    def test_artifact_cache_file_names(self, test_sim_config, monkeypatch):
+        """test that differently named copies of the same IDF share one build
+        of the preprocessed IDF and FMU in the artifact cache."""
+        dc = DataClient(
+            source=LocalSource(
+                local_cache=os.environ.get("LOCAL_CACHE_DIR"),
+                data_spec=DonateYourDataSpec(),
+            ),
+            destination=LocalDestination(
+                local_cache=os.environ.get("LOCAL_CACHE_DIR"),
+                data_spec=DonateYourDataSpec(),
+            ),
+            nrel_dev_api_key=os.environ.get("NREL_DEV_API_KEY"),
+            nrel_dev_email=os.environ.get("NREL_DEV_EMAIL"),
+            archive_tmy3_meta=os.environ.get("ARCHIVE_TMY3_META"),
+            archive_tmy3_data_dir=os.environ.get("ARCHIVE_TMY3_DATA_DIR"),
+            ep_tmy3_cache_dir=os.environ.get("EP_TMY3_CACHE_DIR"),
+            simulation_epw_dir=os.environ.get("SIMULATION_EPW_DIR"),
+        )
+        dc.sim_config = test_sim_config
+        dc.get_data()
+
+        _idf_path = os.path.join(os.environ.get("IDF_DIR"), "Furnace.idf")
+        if not os.path.isfile(_idf_path):
+            shutil.copyfile(
+                os.path.join(
+                    os.environ.get("EPLUS_DIR"), "ExampleFiles", "Furnace.idf"
+                ),
+                _idf_path,
+            )
+
+        builds = []
+        _call_energy_plus_to_fmu = EnergyPlusBuildingModel.call_energy_plus_to_fmu
+
+        def _counted_call_energy_plus_to_fmu(building_model):
+            builds.append(building_model.fmu_path)
+            _call_energy_plus_to_fmu(building_model)
+
+        monkeypatch.setattr(
+            EnergyPlusBuildingModel,
+            "call_energy_plus_to_fmu",
+            _counted_call_energy_plus_to_fmu,
+        )
+
+        with tempfile.TemporaryDirectory() as _tmp_dir:
+            artifact_cache = ArtifactCache(cache_dir=os.path.join(_tmp_dir, "cache"))
+            building_models = []
+            for _name in ["furnace_a", "furnace_b"]:
+                _copy_path = os.path.join(_tmp_dir, f"{_name}.idf")
+                shutil.copyfile(_idf_path, _copy_path)
+                _building_model = EnergyPlusBuildingModel(
+                    idf=IDFPreprocessor(
+                        idf_file=_copy_path,
+                        idf_prep_dir=os.path.join(_tmp_dir, _name, "preprocessed"),
+                    ),
+                    step_size_seconds=self.step_size,
+                    fmu_dir=os.path.join(_tmp_dir, _name, "fmu"),
+                    artifact_cache=artifact_cache,
+                )
+                _building_model.create_model_fmu(
+                    sim_config=test_sim_config,
+                    weather_channel=dc.weather,
+                    datetime_channel=dc.datetime,
+                )
+                building_models.append(_building_model)
+
+            assert builds == [building_models[0].fmu_path]
+            # preprocessed IDF and FMU of the second copy are restored
+            assert artifact_cache.get_stats()["misses"] == 2
+            assert artifact_cache.get_stats()["hits"] == 2
+            for _building_model in building_models:
+                assert os.path.isfile(_building_model.idf.idf_prep_path)
+                fmu = pyfmi.load_fmu(_building_model.fmu_path)
+                assert fmu.get_version() == "1.0"
+
     @pytest.mark.skip(reason="Redundant with test_simulator.py")
     @pytest.mark.usefixtures("building_model")
     def test_make_fmu(self, test_sim_config, building_model):
@@ -240,6 +406,102 @@ class TestEnergyPlusBuildingModel:
         # see: https://github.com/modelon-community/PyFMI/blob/PyFMI-2.7.4/src/pyfmi/fmil_import.pxd
         assert all(status == 0)
 
+    @pytest.mark.usefixtures("building_model")
+    def test_batched_fmu_io(self, building_model):
+        """test that FMU variables are read and written with one call per
+        data type and unchanged actuation is not set again."""
+        building_model.idf.output_spec = {
+            "zone_1_air_temperature": {"dtype": "float32"},
+            "zone_2_air_temperature": {"dtype": "float32"},
+        }
+        building_model.fmu = RecordingFMU(
+            variables={
+                "zone_1_air_temperature": (FMI_DATA_TYPES.REAL, 20.5),
+                "zone_2_air_temperature": (FMI_DATA_TYPES.REAL, 21.5),
+                building_model.idf.FMU_control_type_name: (FMI_DATA_TYPES.INTEGER, 0),
+                building_model.idf.FMU_control_heating_stp_name: (
+                    FMI_DATA_TYPES.REAL,
+                    20.0,
+                ),
+                building_model.idf.FMU_control_cooling_stp_name: (
+                    FMI_DATA_TYPES.REAL,
+                    20.0,
+                ),
+            }
+        )
+        building_model.resolve_value_references()
+
+        _names, _value_references = building_model.output_value_references[
+            FMI_DATA_TYPES.REAL
+        ]
+        assert _names == ["zone_1_air_temperature", "zone_2_air_temperature"]
+        _values = building_model.get_fmu_values(FMI_DATA_TYPES.REAL, _value_references)
+        np.testing.assert_array_equal(_values, [20.5, 21.5])
+        assert building_model.fmu.calls == [("get_real", [0, 1])]
+
+        building_model.fmu.calls = []
+        _heat_input = {
+            STATES.AUXHEAT1: 300,
+            STATES.AUXHEAT2: 0,
+            STATES.AUXHEAT3: 0,
+            STATES.COMPCOOL1: 0,
+            STATES.COMPCOOL2: 0,
+            STATES.COMPHEAT1: 0,
+            STATES.COMPHEAT2: 0,
+        }
+        building_model.actuate_HVAC_equipment(_heat_input)
+        building_model.actuate_HVAC_equipment(_heat_input)
+        assert building_model.heat_on
+        assert building_model.fmu.calls == [
+            ("set_integer", [2], [1]),
+            ("set_real", [3, 4], [99.0, 99.0]),
+        ]
+
+        building_model.actuate_HVAC_equipment({**_heat_input, STATES.AUXHEAT1: 0})
+        assert not building_model.heat_on
+        assert building_model.fmu.calls[2:] == [
+            ("set_integer", [2], [0]),
+            ("set_real", [3, 4], [-60.0, 99.0]),
+        ]
+
+    @pytest.mark.usefixtures("building_model")
+    def test_actuation_schedule(self, building_model):
+        """test that sub-steps of constant actuation are coalesced"""
+        building_model.step_size_seconds = 60
+        _step_control_input = {
+            STATES.AUXHEAT1: 0,
+            STATES.AUXHEAT2: 0,
+            STATES.AUXHEAT3: 0,
+            STATES.COMPCOOL1: 0,
+            STATES.COMPCOOL2: 0,
+            STATES.COMPHEAT1: 0,
+            STATES.COMPHEAT2: 0,
+        }
+        _heat = (1, 99.0, 99.0)
+        _off = (0, -60.0, 99.0)
+
+        # EnergyPlus FMUs are stepped once per zone timestep
+        assert building_model.get_actuation_schedule(
+            300, {**_step_control_input, STATES.AUXHEAT1: 300}
+        ) == [(_heat, 1)] * 5
+
+        building_model.max_fmu_step_seconds = 300
+        assert building_model.get_actuation_schedule(
+            300, {**_step_control_input, STATES.AUXHEAT1: 300}
+        ) == [(_heat, 5)]
+        assert building_model.heat_on
+
+        assert building_model.get_actuation_schedule(300, _step_control_input) == [
+            (_off, 5)
+        ]
+        assert not building_model.heat_on
+
+        # coalesced FMU steps are limited to max_fmu_step_seconds
+        building_model.max_fmu_step_seconds = 120
+        assert building_model.get_actuation_schedule(
+            300, {**_step_control_input, STATES.AUXHEAT1: 300}
+        ) == [(_heat, 2), (_heat, 2), (_heat, 1)]
+
     @pytest.mark.skip(reason="Redundant with test_simulator.py.")
     @pytest.mark.usefixtures("building_model")
     def test_step_model(self, test_sim_config, building_model):
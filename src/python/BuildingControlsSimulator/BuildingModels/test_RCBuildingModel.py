@@ -0,0 +1,189 @@
+import logging
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from BuildingControlsSimulator.DataClients.DataStates import STATES
+from BuildingControlsSimulator.DataClients.DataSpec import Internal
+from BuildingControlsSimulator.DataClients.StepInputs import (
+    StepInputView,
+    StepInputColumns,
+)
+from BuildingControlsSimulator.BuildingModels.RCBuildingModel import RCBuildingModel
+from BuildingControlsSimulator.Simulator.BatchSimulation import BatchModelGroup
+
+logger = logging.getLogger(__name__)
+
+
+class TestRCBuildingModel:
+    @classmethod
+    def setup_class(cls):
+        cls.step_size_seconds = 300
+        cls.n_steps = 288
+        cls.n_sims = 5
+        rng = np.random.default_rng(seed=1)
+        cls.outdoor_temperature = np.tile(
+            -5.0 + 5.0 * np.sin(np.linspace(0, 2 * np.pi, cls.n_steps)),
+            (cls.n_sims, 1),
+        ).T
+        cls.ghi = np.clip(
+            600.0 * np.sin(np.linspace(-np.pi, np.pi, cls.n_steps)), 0, None
+        )[:, None] * np.ones(cls.n_sims)
+        cls.control = {
+            state: np.zeros((cls.n_steps, cls.n_sims), dtype="int16")
+            for state in RCBuildingModel(step_size_seconds=60).input_states
+        }
+        cls.control[STATES.AUXHEAT1] = rng.integers(
+            0, cls.step_size_seconds + 1, (cls.n_steps, cls.n_sims)
+        ).astype("int16")
+        cls.control[STATES.COMPCOOL1][cls.n_steps // 2 :, 0] = cls.step_size_seconds
+        cls.control[STATES.AUXHEAT1][cls.n_steps // 2 :, 0] = 0
+        cls.motion = rng.uniform(size=(cls.n_steps, cls.n_sims)) > 0.5
+        cls.sim_time = np.tile(
+            np.arange(0, cls.n_steps * cls.step_size_seconds, cls.step_size_seconds),
+            (cls.n_sims, 1),
+        ).T
+
+    @classmethod
+    def teardown_class(cls):
+        """teardown any state that was previously setup with a call to
+        setup_class.
+        """
+        pass
+
+    def initialize_model(self, model):
+        model.initialize(
+            start_utc=pd.Timestamp("2018-01-01", tz="utc"),
+            t_start=0,
+            t_end=(self.n_steps - 1) * self.step_size_seconds,
+            t_step=self.step_size_seconds,
+            data_spec=Internal(),
+            categories_dict={},
+        )
+        return model
+
+    def get_building_models(self):
+        return [
+            self.initialize_model(
+                RCBuildingModel(step_size_seconds=60, r_air_out=_r, c_air=_c)
+            )
+            for _r, _c in zip(
+                np.linspace(0.005, 0.02, self.n_sims),
+                np.linspace(1.0e6, 3.0e6, self.n_sims),
+            )
+        ]
+
+    def get_step_inputs(self, i):
+        return {
+            "step_control_input": {k: v[i] for k, v in self.control.items()},
+            "step_sensor_input": {STATES.THERMOSTAT_MOTION: self.motion[i]},
+            "step_weather_input": {
+                STATES.OUTDOOR_TEMPERATURE: self.outdoor_temperature[i],
+                STATES.GLOBAL_HORIZONTAL_IRRADIANCE: self.ghi[i],
+            },
+        }
+
+    def test_vectorized_matches_per_instance(self):
+        building_models = self.get_building_models()
+        for i in range(self.n_steps):
+            for n in range(self.n_sims):
+                building_models[n].do_step(
+                    t_start=self.sim_time[i, n],
+                    t_step=self.step_size_seconds,
+                    **{
+                        k: StepInputView(v, n)
+                        for k, v in self.get_step_inputs(i).items()
+                    },
+                )
+
+        building_group = BatchModelGroup(
+            models=self.get_building_models(),
+            n_steps=np.full(self.n_sims, self.n_steps),
+        )
+        building_group.initialize()
+        assert building_group.vectorized
+        for i in range(self.n_steps):
+            building_group.do_step(
+                i=i,
+                active_idxs=np.arange(self.n_sims),
+                t_start=self.sim_time[i],
+                t_step=self.step_size_seconds,
+                step_inputs=self.get_step_inputs(i),
+            )
+        building_group.write_output()
+
+        for _model, _batch_model in zip(building_models, building_group.models):
+            assert _model.current_t_idx == _batch_model.current_t_idx
+            for state in _model.output_states:
+                np.testing.assert_array_equal(
+                    _model.output[state], _batch_model.output[state]
+                )
+
+    def test_replay_matches_do_step(self):
+        building_models = self.get_building_models()
+        replay_models = self.get_building_models()
+        n = 0
+        for i in range(self.n_steps):
+            building_models[n].do_step(
+                t_start=self.sim_time[i, n],
+                t_step=self.step_size_seconds,
+                **{k: StepInputView(v, n) for k, v in self.get_step_inputs(i).items()},
+            )
+
+        _inputs = {
+            k: StepInputColumns(
+                columns={state: v[state][:, n] for state in v.keys()},
+                n_steps=self.n_steps,
+            )
+            for k, v in self.get_step_inputs(slice(None)).items()
+        }
+        # replay in blocks, e.g. between output flushes
+        for _start_idx, _end_idx in [(0, 100), (100, 100), (100, self.n_steps)]:
+            replay_models[n].do_replay(
+                sim_time=self.sim_time[:, n],
+                t_step=self.step_size_seconds,
+                control_input=_inputs["step_control_input"],
+                sensor_input=_inputs["step_sensor_input"],
+                weather_input=_inputs["step_weather_input"],
+                start_idx=_start_idx,
+                end_idx=_end_idx,
+            )
+
+        assert replay_models[n].current_t_idx == building_models[n].current_t_idx
+        for state in building_models[n].output_states:
+            np.testing.assert_array_equal(
+                replay_models[n].output[state], building_models[n].output[state]
+            )
+            assert (
+                replay_models[n].step_output[state]
+                == building_models[n].step_output[state]
+            )
+
+    def test_hvac_response(self):
+        building_models = self.get_building_models()
+        for i in range(self.n_steps):
+            for n in range(self.n_sims):
+                building_models[n].do_step(
+                    t_start=self.sim_time[i, n],
+                    t_step=self.step_size_seconds,
+                    **{
+                        k: StepInputView(v, n)
+                        for k, v in self.get_step_inputs(i).items()
+                    },
+                )
+
+        _temperature = building_models[0].output[STATES.THERMOSTAT_TEMPERATURE]
+        _half = self.n_steps // 2
+        # heating in first half of day, cooling in second half
+        assert np.all(np.diff(_temperature[_half : self.n_steps]) < 0)
+        assert _temperature[_half - 1] > _temperature[self.n_steps - 1]
+        # indoor dewpoint is constant so relative humidity falls as air warms
+        _humidity = building_models[0].output[STATES.THERMOSTAT_HUMIDITY]
+        assert np.all(np.diff(_humidity[_half : self.n_steps]) > 0)
+
+    def test_unstable_step_size(self):
+        with pytest.raises(ValueError):
+            self.initialize_model(
+                RCBuildingModel(step_size_seconds=300, c_air=1.0e5)
+            )
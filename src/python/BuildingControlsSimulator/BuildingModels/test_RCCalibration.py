@@ -0,0 +1,209 @@
+import logging
+import tempfile
+import shutil
+
+import pytest
+import attr
+import pandas as pd
+import numpy as np
+
+from BuildingControlsSimulator.DataClients.DataStates import STATES
+from BuildingControlsSimulator.DataClients.DataSpec import Internal
+from BuildingControlsSimulator.BuildingModels.RCBuildingModel import RCBuildingModel
+from BuildingControlsSimulator.BuildingModels.RCCalibration import RCCalibration
+from BuildingControlsSimulator.BuildingModels.ArtifactCache import ArtifactCache
+
+logger = logging.getLogger(__name__)
+
+
+@attr.s(kw_only=True)
+class MockChannel:
+    data = attr.ib(default=None)
+
+
+@attr.s(kw_only=True)
+class MockSource:
+    source_name = attr.ib(default="mock")
+
+
+@attr.s(kw_only=True)
+class MockDataClient:
+    """Generates channel data of a home simulated with the RC parameters
+    given in its sim_config."""
+
+    source = attr.ib(factory=MockSource)
+    sim_config = attr.ib(default=None)
+    datetime = attr.ib(default=None)
+    equipment = attr.ib(default=None)
+    sensors = attr.ib(default=None)
+    weather = attr.ib(default=None)
+    full_data_periods = attr.ib(factory=list)
+
+    def copy_for_sim_config(self, sim_config):
+        return attr.evolve(self, sim_config=sim_config)
+
+    def get_data(self):
+        if self.sim_config["c_air"] <= 0:
+            raise ValueError("no data")
+
+        _step_size_seconds = self.sim_config["sim_step_size_seconds"]
+        _datetimes = pd.Series(
+            pd.date_range(
+                self.sim_config["start_utc"],
+                self.sim_config["end_utc"],
+                freq=f"{_step_size_seconds}S",
+            )
+        )
+        n_steps = len(_datetimes)
+        rng = np.random.default_rng(seed=self.sim_config["identifier"])
+        _hour = np.arange(n_steps) * _step_size_seconds / 3600.0
+        _t_out = -5.0 + 5.0 * np.sin(2 * np.pi * _hour / 24.0)
+        _ghi = np.clip(600.0 * np.sin(2 * np.pi * (_hour - 6.0) / 24.0), 0, None)
+
+        building_model = RCBuildingModel(
+            step_size_seconds=_step_size_seconds,
+            c_air=self.sim_config["c_air"],
+            r_air_out=self.sim_config["r_air_out"],
+            r_air_mass=np.inf,
+            solar_air_fraction=1.0,
+        )
+        building_model.initialize(
+            start_utc=self.sim_config["start_utc"],
+            t_start=0,
+            t_end=(n_steps - 1) * _step_size_seconds,
+            t_step=_step_size_seconds,
+            data_spec=Internal(),
+            categories_dict={},
+        )
+        _equipment = {
+            state: np.zeros(n_steps, dtype="int16")
+            for state in building_model.stage_capacities.keys()
+        }
+        _t_in = np.zeros(n_steps)
+        for i in range(n_steps):
+            _t_in[i] = building_model.t_air
+            # noisy thermostat keeps indoor temperature near 21 C
+            if building_model.t_air < 20.5 + rng.uniform(-0.5, 0.5):
+                _equipment[STATES.AUXHEAT1][i] = rng.integers(
+                    _step_size_seconds // 2, _step_size_seconds + 1
+                )
+            building_model.do_step(
+                t_start=i * _step_size_seconds,
+                t_step=_step_size_seconds,
+                step_control_input={k: v[i] for k, v in _equipment.items()},
+                step_sensor_input={STATES.THERMOSTAT_MOTION: False},
+                step_weather_input={
+                    STATES.OUTDOOR_TEMPERATURE: _t_out[i],
+                    STATES.GLOBAL_HORIZONTAL_IRRADIANCE: _ghi[i],
+                },
+            )
+
+        self.datetime = MockChannel(data=pd.DataFrame({STATES.DATE_TIME: _datetimes}))
+        self.equipment = MockChannel(data=pd.DataFrame(_equipment))
+        self.sensors = MockChannel(
+            data=pd.DataFrame({STATES.THERMOSTAT_TEMPERATURE: _t_in})
+        )
+        self.weather = MockChannel(
+            data=pd.DataFrame(
+                {
+                    STATES.OUTDOOR_TEMPERATURE: _t_out,
+                    STATES.GLOBAL_HORIZONTAL_IRRADIANCE: _ghi,
+                }
+            )
+        )
+        # missing data period in the middle of the data
+        self.full_data_periods = [
+            [_datetimes[0], _datetimes[n_steps // 2]],
+            [_datetimes[n_steps // 2 + 12], _datetimes[n_steps - 1]],
+        ]
+
+
+class TestRCCalibration:
+    @classmethod
+    def setup_class(cls):
+        cls.cache_dir = tempfile.mkdtemp()
+        cls.sim_config = pd.DataFrame(
+            {
+                "identifier": [1, 2, 3, 4],
+                "start_utc": pd.Timestamp("2018-01-01", tz="utc"),
+                "end_utc": pd.Timestamp("2018-01-08", tz="utc"),
+                "sim_step_size_seconds": 300,
+                "c_air": [1.0e6, 2.0e6, 4.0e6, -1.0],
+                "r_air_out": [0.005, 0.01, 0.02, 0.01],
+            }
+        )
+
+    @classmethod
+    def teardown_class(cls):
+        """teardown any state that was previously setup with a call to
+        setup_class.
+        """
+        shutil.rmtree(cls.cache_dir)
+
+    def assert_results(self, results):
+        assert [r.identifier for r in results] == [1, 2, 3, 4]
+        for _result, (_, _sim_config) in zip(results[:3], self.sim_config.iterrows()):
+            assert _result.success
+            assert _result.c_air == pytest.approx(_sim_config["c_air"], rel=1e-3)
+            assert _result.r_air_out == pytest.approx(
+                _sim_config["r_air_out"], rel=1e-3
+            )
+            assert _result.internal_gain == pytest.approx(500.0, rel=1e-2)
+            assert _result.solar_aperture == pytest.approx(5.0, rel=1e-2)
+
+        # error loading data of one identifier does not fail the others
+        assert not results[3].success
+        assert "no data" in results[3].error
+
+    def test_calibrate(self):
+        calibration = RCCalibration(
+            sim_config=self.sim_config, data_client=MockDataClient()
+        )
+        self.assert_results(calibration.calibrate())
+        assert len(calibration.get_results_dataframe()) == 4
+
+        building_model = calibration.results[0].get_building_model()
+        assert building_model.c_air == calibration.results[0].c_air
+        with pytest.raises(ValueError):
+            calibration.results[3].get_building_model()
+
+    def test_calibrate_parallel_cached(self):
+        artifact_cache = ArtifactCache(cache_dir=self.cache_dir)
+        calibration = RCCalibration(
+            sim_config=self.sim_config,
+            data_client=MockDataClient(),
+            artifact_cache=artifact_cache,
+        )
+        self.assert_results(calibration.calibrate(n_workers=2))
+        assert artifact_cache.hits == 0
+
+        # fitted identifiers are cached, failed data loading is retried
+        _cached_results = calibration.calibrate(n_workers=2)
+        self.assert_results(_cached_results)
+        assert artifact_cache.hits == 3
+        assert _cached_results[0].start_utc == self.sim_config["start_utc"][0]
+
+    def test_get_regression_data(self):
+        data_client = MockDataClient(sim_config=self.sim_config.iloc[0])
+        data_client.get_data()
+        _datetimes = data_client.datetime.data[STATES.DATE_TIME]
+        _valid = RCCalibration.get_valid_mask(data_client)
+        # full_data_periods and sim_config range are [start, end)
+        for _start, _end in data_client.full_data_periods:
+            assert _valid[_datetimes == _start].all()
+            assert not _valid[_datetimes == _end].any()
+        assert not _valid[_datetimes == data_client.sim_config["end_utc"]].any()
+
+        X, y = RCCalibration.get_regression_data(
+            data_client, RCBuildingModel.get_default_stage_capacities()
+        )
+        # missing runtime of a single step only drops its step pair
+        _equipment = data_client.equipment.data.astype("float64")
+        _equipment.loc[100, STATES.AUXHEAT1] = np.nan
+        data_client.equipment.data = _equipment
+        X_missing, y_missing = RCCalibration.get_regression_data(
+            data_client, RCBuildingModel.get_default_stage_capacities()
+        )
+        assert len(y_missing) == len(y) - 1
+        assert np.isfinite(X_missing).all()
+        assert np.isfinite(y_missing).all()
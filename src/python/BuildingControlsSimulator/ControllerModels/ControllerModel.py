@@ -3,12 +3,16 @@
 from abc import ABC, abstractmethod
 from enum import IntEnum
 import logging
+import copy
 
 import attr
 import pandas as pd
 import numpy as np
 
 from BuildingControlsSimulator.ControllerModels.ControllerStatus import CONTROLLERSTATUS
+from BuildingControlsSimulator.ControllerModels.SettingsTimeline import (
+    SettingsTimeline,
+)
 
 
 @attr.s
@@ -22,8 +26,14 @@ class ControllerModel(ABC):
     options = attr.ib(default=None)
 
     output = attr.ib(factory=dict)
+    # categories of categorical output states, which are recorded as codes
+    output_categories = attr.ib(factory=dict)
     step_output = attr.ib(factory=dict)
     settings = attr.ib(factory=dict)
+    settings_timeline = attr.ib(default=None)
+    # perfect weather forecasts are given as read-only np.ndarray views
+    # of shape (horizon_steps, n_weather_states) unless a pd.DataFrame is required
+    weather_forecast_as_dataframe = attr.ib(default=False)
 
     current_t_idx = attr.ib(default=None)
     current_t_start = attr.ib(default=None)
@@ -59,15 +69,47 @@ class ControllerModel(ABC):
             seconds=self.current_t_idx * self.step_size_seconds
         )
 
-    def update_settings(
+    def compile_settings_timeline(
         self,
         change_points_schedule,
         change_points_comfort_prefs,
         change_points_hvac_mode,
+        step_datetimes,
+    ):
+        """Compile settings change points into events indexed by simulation
+        step. After this `update_settings(t_idx=...)` is O(1) per step."""
+        self.settings_timeline = SettingsTimeline.compile(
+            change_points_schedule=change_points_schedule,
+            change_points_comfort_prefs=change_points_comfort_prefs,
+            change_points_hvac_mode=change_points_hvac_mode,
+            step_datetimes=step_datetimes,
+        )
+
+    def update_settings(
+        self,
+        change_points_schedule=None,
+        change_points_comfort_prefs=None,
+        change_points_hvac_mode=None,
         time_utc=None,
         init=False,
+        t_idx=None,
     ):
-        """Ensure settings are correct for given time step."""
+        """Ensure settings are correct for given time step.
+
+        If t_idx is given the compiled settings_timeline is used and
+        change_settings is only called on steps that carry a settings event.
+        """
+        if (t_idx is not None) and not init:
+            if self.settings_timeline is None:
+                raise ValueError(
+                    "update_settings(t_idx) requires compile_settings_timeline()."
+                )
+
+            _event = self.settings_timeline.get_event(t_idx)
+            if _event:
+                self.apply_settings_event(_event)
+                self.change_settings(self.settings)
+            return
 
         _init_time_hvac_mode = min(change_points_hvac_mode.keys())
 
@@ -162,3 +204,63 @@ class ControllerModel(ABC):
                 "Invalid arguments supplied to update_settings()"
                 + "Neither time_utc or init flag given."
             )
+
+    def apply_settings_event(self, event):
+        """Apply a compiled `SettingsEvent` to settings."""
+        if event.hvac_mode is not None:
+            self.settings["hvac_mode"] = event.hvac_mode
+
+        # must observe new schedule at or before setpoint change
+        if event.schedules is not None:
+            self.settings["schedules"] = event.schedules
+
+        if event.comfort_prefs is not None:
+            # do not need to reset all setpoints, store previous setpoints
+            # even after schedule is removed because it may be readded
+            for k, v in event.comfort_prefs.items():
+                # overwrite existing or make new setpoint comfort prefs
+                self.settings["setpoints"][k] = v
+
+    def get_step_interval(self, step_size_seconds):
+        """Number of simulation steps of step_size_seconds per controller step
+        of discretization_size_seconds, at least 1."""
+        if not self.discretization_size_seconds:
+            return 1
+        return max(1, int(self.discretization_size_seconds // step_size_seconds))
+
+    def hold_step(self, t_start, t_step):
+        """Zero-order hold of the previous controller step for a simulation
+        step on which the controller is not stepped, see
+        Simulation.controller_steps."""
+        for state in self.output_states:
+            self.output[state][self.current_t_idx] = self.output[state][
+                self.current_t_idx - 1
+            ]
+        self.current_t_idx += 1
+
+    def set_state_bus(self, state_bus):
+        """Read and write states directly on state_bus, see StateBus. Models
+        that do not support the bus return False and keep passing step_output,
+        a state_bus of None restores step_output passing."""
+        return False
+
+    def get_state_snapshot(self):
+        """Copy of model state after current_t_idx steps, for resuming other
+        instances of the same model, see set_state_snapshot."""
+        return {
+            "current_t_idx": self.current_t_idx,
+            "settings": copy.deepcopy(self.settings),
+            "step_output": copy.deepcopy(self.step_output),
+            "output": {
+                k: v[: self.current_t_idx].copy() for k, v in self.output.items()
+            },
+        }
+
+    def set_state_snapshot(self, snapshot):
+        """Restore state of initialized model from get_state_snapshot."""
+        for k, v in snapshot["output"].items():
+            self.output[k][: len(v)] = v
+        self.step_output = copy.deepcopy(snapshot["step_output"])
+        self.current_t_idx = snapshot["current_t_idx"]
+        self.settings = copy.deepcopy(snapshot["settings"])
+        self.change_settings(self.settings)
@@ -20,6 +20,8 @@ class Deadband(ControllerModel):
     step_output = attr.ib(factory=dict)
     step_size_seconds = attr.ib(default=None)
     current_t_idx = attr.ib(default=None)
+    state_bus = attr.ib(default=None)
+    state_bus_output = attr.ib(default=None)
 
     output = attr.ib(factory=dict)
 
@@ -87,6 +89,7 @@ class Deadband(ControllerModel):
         """preallocate output memory to speed up simulation"""
         # reset output
         self.output = {}
+        self.output_categories = {}
 
         self.output = {
             STATES.SIMULATION_TIME: np.arange(
@@ -98,11 +101,15 @@ class Deadband(ControllerModel):
         # add state variables
         for state in self.output_states:
             if data_spec.full.spec[state]["dtype"] == "category":
-                self.output[state] = pd.Series(
-                    pd.Categorical(
-                        pd.Series(index=np.arange(n_s)),
-                        categories=categories_dict[state],
-                    )
+                # categorical states are recorded as integer codes, categories
+                # are attached when output is assembled
+                self.output_categories[state] = pd.Index(categories_dict[state])
+                self.output[state] = np.full(
+                    n_s,
+                    -1,
+                    dtype=Conversions.get_category_code_dtype(
+                        self.output_categories[state]
+                    ),
                 )
             else:
                 (
@@ -131,6 +138,16 @@ class Deadband(ControllerModel):
         t_ctrl = step_sensor_input[STATES.THERMOSTAT_TEMPERATURE_ESTIMATE]
         return t_ctrl
 
+    def set_state_bus(self, state_bus):
+        if state_bus is None or not state_bus.supports(self.output_states):
+            self.state_bus = None
+            self.state_bus_output = None
+            return False
+
+        self.state_bus = state_bus
+        self.state_bus_output = state_bus.get_view(self.output_states)
+        return True
+
     def do_step(
         self,
         t_start,
@@ -140,52 +157,166 @@ class Deadband(ControllerModel):
         step_weather_input,
         step_weather_forecast_input,
     ):
-        """Simulate controller time step."""
+        """Simulate controller time step. Outputs are written to step_output,
+        or to the state bus if attached, in which case output memory is written
+        by the Simulation from the recorded bus."""
         self.step_status = []
         self.step_status.append(CONTROLLERSTATUS.STEP_BEGAN)
 
-        t_ctrl = self.calc_t_control(step_sensor_input)
-        self.step_output[STATES.TEMPERATURE_CTRL] = t_ctrl
+        if self.state_bus is not None:
+            _step_output = self.state_bus_output
+        else:
+            _step_output = self.step_output
 
-        # stop overlap of heating and cooling set points
-        self.step_output[STATES.TEMPERATURE_STP_COOL] = max(
-            step_thermostat_input[STATES.TEMPERATURE_STP_COOL],
-            step_thermostat_input[STATES.TEMPERATURE_STP_HEAT] + self.deadband,
+        _control = Deadband.control(
+            t_ctrl=np.array([self.calc_t_control(step_sensor_input)], dtype="float64"),
+            stp_cool=np.array(
+                [step_thermostat_input[STATES.TEMPERATURE_STP_COOL]], dtype="float64"
+            ),
+            stp_heat=np.array(
+                [step_thermostat_input[STATES.TEMPERATURE_STP_HEAT]], dtype="float64"
+            ),
+            auxheat1=np.array([_step_output[STATES.AUXHEAT1]]),
+            compcool1=np.array([_step_output[STATES.COMPCOOL1]]),
+            fan_stage_one=np.array([_step_output[STATES.FAN_STAGE_ONE]]),
+            deadband=self.deadband,
+            step_size_seconds=self.step_size_seconds,
         )
-        self.step_output[STATES.TEMPERATURE_STP_HEAT] = min(
-            step_thermostat_input[STATES.TEMPERATURE_STP_COOL] - self.deadband,
-            step_thermostat_input[STATES.TEMPERATURE_STP_HEAT],
-        )
-
-        if t_ctrl < (self.step_output[STATES.TEMPERATURE_STP_HEAT] - self.deadband):
-            # turn on heat
-            self.step_output[STATES.AUXHEAT1] = self.step_size_seconds
-            self.step_output[STATES.FAN_STAGE_ONE] = self.step_size_seconds
-            # turn off cool
-            self.step_output[STATES.COMPCOOL1] = 0
-        elif t_ctrl > (self.step_output[STATES.TEMPERATURE_STP_HEAT] + self.deadband):
-            # turn off heat
-            self.step_output[STATES.FAN_STAGE_ONE] = 0
-            self.step_output[STATES.AUXHEAT1] = 0
+        for state, value in _control.items():
+            _step_output[state] = value[0]
 
-        # cooling mode
-        if t_ctrl > (self.step_output[STATES.TEMPERATURE_STP_COOL] + self.deadband):
-            # turn on cool
-            self.step_output[STATES.COMPCOOL1] = self.step_size_seconds
-            self.step_output[STATES.FAN_STAGE_ONE] = self.step_size_seconds
-            # turn off heat
-            self.step_output[STATES.AUXHEAT1] = 0
-        elif t_ctrl < (self.step_output[STATES.TEMPERATURE_STP_COOL] - self.deadband):
-            # turn off cool
-            self.step_output[STATES.FAN_STAGE_ONE] = 0
-            self.step_output[STATES.COMPCOOL1] = 0
-
-        self.add_step_to_output(self.step_output)
+        if self.state_bus is None:
+            self.add_step_to_output(self.step_output)
         self.current_t_idx += 1
         self.step_status.append(CONTROLLERSTATUS.STEP_SUCCESSFUL)
         return self.step_output
 
+    def hold_step(self, t_start, t_step):
+        # outputs on the state bus keep their values
+        if self.state_bus is not None:
+            self.current_t_idx += 1
+            return
+
+        super().hold_step(t_start, t_step)
+
+    @staticmethod
+    def control(
+        t_ctrl,
+        stp_cool,
+        stp_heat,
+        auxheat1,
+        compcool1,
+        fan_stage_one,
+        deadband,
+        step_size_seconds,
+    ):
+        """Control law over arrays of shape (N,) of N controllers, `do_step`
+        steps a single controller with N=1.
+
+        Runtimes are held at their previous values while t_ctrl is within the
+        deadband. Returns the control outputs by state.
+        """
+        # stop overlap of heating and cooling set points
+        _stp_heat_plus_db = stp_heat + deadband
+        _stp_cool_minus_db = stp_cool - deadband
+        stp_cool = np.where(_stp_heat_plus_db > stp_cool, _stp_heat_plus_db, stp_cool)
+        stp_heat = np.where(stp_heat < _stp_cool_minus_db, stp_heat, _stp_cool_minus_db)
+
+        _heat_on = t_ctrl < (stp_heat - deadband)
+        _heat_off = t_ctrl > (stp_heat + deadband)
+        # turn on heat and turn off cool, heat_on takes precedence as in an
+        # if-elif over heat_off
+        auxheat1 = np.where(
+            _heat_on, step_size_seconds, np.where(_heat_off, 0, auxheat1)
+        )
+        fan_stage_one = np.where(
+            _heat_on, step_size_seconds, np.where(_heat_off, 0, fan_stage_one)
+        )
+        compcool1 = np.where(_heat_on, 0, compcool1)
+
+        # cooling mode
+        _cool_on = t_ctrl > (stp_cool + deadband)
+        _cool_off = t_ctrl < (stp_cool - deadband)
+        # turn on cool and turn off heat
+        compcool1 = np.where(
+            _cool_on, step_size_seconds, np.where(_cool_off, 0, compcool1)
+        )
+        fan_stage_one = np.where(
+            _cool_on, step_size_seconds, np.where(_cool_off, 0, fan_stage_one)
+        )
+        auxheat1 = np.where(_cool_on, 0, auxheat1)
+
+        return {
+            STATES.TEMPERATURE_CTRL: t_ctrl,
+            STATES.TEMPERATURE_STP_COOL: stp_cool,
+            STATES.TEMPERATURE_STP_HEAT: stp_heat,
+            STATES.AUXHEAT1: auxheat1,
+            STATES.COMPCOOL1: compcool1,
+            STATES.FAN_STAGE_ONE: fan_stage_one,
+        }
+
+    @staticmethod
+    def init_batch_state(models):
+        """Stack per-instance state of lockstep simulations into arrays."""
+        return {
+            "deadband": np.array([m.deadband for m in models], dtype="float64"),
+            "step_size_seconds": np.array(
+                [m.step_size_seconds for m in models], dtype="int64"
+            ),
+            "step_output": {
+                state: np.array([m.step_output[state] for m in models])
+                for state in models[0].output_states
+            },
+        }
+
+    @staticmethod
+    def do_step_batch(
+        batch_state,
+        t_start,
+        t_step,
+        step_thermostat_input,
+        step_sensor_input,
+        step_weather_input,
+        step_weather_forecast_input,
+        step_mask=None,
+    ):
+        """Vectorized `do_step` over arrays of shape (N,) of N controllers.
+
+        Controllers not in step_mask hold their step output, see `hold_step`.
+        """
+        _step_output = batch_state["step_output"]
+        _control = Deadband.control(
+            t_ctrl=np.asarray(
+                step_sensor_input[STATES.THERMOSTAT_TEMPERATURE_ESTIMATE],
+                dtype="float64",
+            ),
+            stp_cool=np.asarray(
+                step_thermostat_input[STATES.TEMPERATURE_STP_COOL], dtype="float64"
+            ),
+            stp_heat=np.asarray(
+                step_thermostat_input[STATES.TEMPERATURE_STP_HEAT], dtype="float64"
+            ),
+            auxheat1=_step_output[STATES.AUXHEAT1],
+            compcool1=_step_output[STATES.COMPCOOL1],
+            fan_stage_one=_step_output[STATES.FAN_STAGE_ONE],
+            deadband=batch_state["deadband"],
+            step_size_seconds=batch_state["step_size_seconds"],
+        )
+        for state, value in _control.items():
+            if step_mask is not None:
+                value = np.where(step_mask, value, _step_output[state])
+            _step_output[state] = value
+        return _step_output
+
     def add_step_to_output(self, step_output):
+        if self.output_categories:
+            step_output = {
+                k: Conversions.get_category_code(self.output_categories[k], v)
+                if k in self.output_categories
+                else v
+                for k, v in step_output.items()
+            }
+
         for k, v in step_output.items():
             self.output[k][self.current_t_idx] = v
 
@@ -0,0 +1,120 @@
+import logging
+
+import attr
+import pandas as pd
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@attr.s(kw_only=True, frozen=True, slots=True)
+class SettingsEvent:
+    """Settings changes occurring at a single simulation step.
+    None means that setting does not change at this step."""
+
+    hvac_mode = attr.ib(default=None)
+    schedules = attr.ib(default=None)
+    comfort_prefs = attr.ib(default=None)
+
+
+@attr.s(kw_only=True)
+class SettingsTimeline:
+    """Thermostat settings change points compiled into events indexed by
+    simulation step so that settings can be updated in O(1) per step."""
+
+    events = attr.ib(factory=dict)
+
+    @staticmethod
+    def compile(
+        change_points_schedule,
+        change_points_comfort_prefs,
+        change_points_hvac_mode,
+        step_datetimes,
+    ):
+        """Map each change point to the simulation step with the same datetime.
+
+        Change points at the initial settings times are excluded because they
+        are applied by `ControllerModel.update_settings(init=True)`.
+        Change points that do not fall exactly on a simulation step are never
+        observed by the simulation and are dropped.
+        """
+        _init_time_hvac_mode = min(change_points_hvac_mode.keys())
+        _init_time_schedule = min(change_points_schedule.keys())
+        _init_time_setpoints = SettingsTimeline.get_init_time_setpoints(
+            change_points_schedule=change_points_schedule,
+            change_points_comfort_prefs=change_points_comfort_prefs,
+        )
+
+        _step_index = pd.DatetimeIndex(step_datetimes)
+
+        _hvac_mode_steps = SettingsTimeline.get_change_point_steps(
+            change_points=change_points_hvac_mode,
+            step_index=_step_index,
+            exclude_times=[_init_time_hvac_mode],
+        )
+        _schedule_steps = SettingsTimeline.get_change_point_steps(
+            change_points=change_points_schedule,
+            step_index=_step_index,
+            exclude_times=[_init_time_schedule],
+        )
+        _comfort_prefs_steps = SettingsTimeline.get_change_point_steps(
+            change_points=change_points_comfort_prefs,
+            step_index=_step_index,
+            exclude_times=_init_time_setpoints,
+        )
+
+        events = {}
+        for _t_idx in sorted(
+            set(_hvac_mode_steps) | set(_schedule_steps) | set(_comfort_prefs_steps)
+        ):
+            events[_t_idx] = SettingsEvent(
+                hvac_mode=_hvac_mode_steps.get(_t_idx),
+                schedules=_schedule_steps.get(_t_idx),
+                comfort_prefs=_comfort_prefs_steps.get(_t_idx),
+            )
+
+        return SettingsTimeline(events=events)
+
+    @staticmethod
+    def get_init_time_setpoints(change_points_schedule, change_points_comfort_prefs):
+        """Earliest comfort preferences change point of each initial schedule."""
+        _init_time_schedule = min(change_points_schedule.keys())
+        _init_schedule_names = set(
+            [sch["name"] for sch in change_points_schedule[_init_time_schedule]]
+        )
+
+        _init_time_setpoints = []
+        for _name in _init_schedule_names:
+            _schedule_change_times = [
+                k for k, v in change_points_comfort_prefs.items() if _name in v.keys()
+            ]
+            if _schedule_change_times:
+                _init_time_setpoints.append(min(_schedule_change_times))
+            else:
+                # TODO: can make some assumption about set points
+                raise ValueError(
+                    f"Setpoints could not be detected for: {_name} schedule."
+                )
+
+        return _init_time_setpoints
+
+    @staticmethod
+    def get_change_point_steps(change_points, step_index, exclude_times):
+        """Return dict of step index -> change point value."""
+        _times = [k for k in change_points.keys() if k not in exclude_times]
+        if not _times:
+            return {}
+
+        _step_idxs = step_index.get_indexer(pd.DatetimeIndex(_times))
+        return {
+            int(_t_idx): change_points[_t]
+            for _t, _t_idx in zip(_times, _step_idxs)
+            if _t_idx >= 0
+        }
+
+    def get_event(self, t_idx):
+        return self.events.get(t_idx)
+
+    @property
+    def event_steps(self):
+        return np.array(list(self.events.keys()), dtype="int64")
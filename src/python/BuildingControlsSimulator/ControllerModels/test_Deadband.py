@@ -0,0 +1,87 @@
+import logging
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from BuildingControlsSimulator.DataClients.DataStates import STATES
+from BuildingControlsSimulator.ControllerModels.Deadband import Deadband
+from BuildingControlsSimulator.Simulator.fixtures_test_Simulation import (
+    STEP_SIZE_SECONDS,
+    initialize_models,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class TestDeadband:
+    @classmethod
+    def setup_class(cls):
+        cls.step_size_seconds = STEP_SIZE_SECONDS
+        cls.n_steps = 288
+        rng = np.random.default_rng(seed=1)
+        cls.temperature = rng.normal(21, 2, cls.n_steps)
+
+    @classmethod
+    def teardown_class(cls):
+        """teardown any state that was previously setup with a call to
+        setup_class.
+        """
+        pass
+
+    def get_initialized_model(self, discretization_size_seconds):
+        controller_model = Deadband(
+            options={"deadband": 0.5},
+            step_size_seconds=self.step_size_seconds,
+            discretization_size_seconds=discretization_size_seconds,
+        )
+        initialize_models([controller_model], n_steps=self.n_steps)
+        return controller_model
+
+    def do_step(self, controller_model, i):
+        controller_model.do_step(
+            t_start=i * self.step_size_seconds,
+            t_step=self.step_size_seconds,
+            step_thermostat_input={
+                STATES.TEMPERATURE_STP_COOL: 24.0,
+                STATES.TEMPERATURE_STP_HEAT: 21.0,
+            },
+            step_sensor_input={
+                STATES.THERMOSTAT_TEMPERATURE_ESTIMATE: self.temperature[i]
+            },
+            step_weather_input={},
+            step_weather_forecast_input=None,
+        )
+
+    def test_get_step_interval(self):
+        assert self.get_initialized_model(60).get_step_interval(300) == 1
+        assert self.get_initialized_model(300).get_step_interval(300) == 1
+        assert self.get_initialized_model(900).get_step_interval(300) == 3
+        assert self.get_initialized_model(None).get_step_interval(300) == 1
+
+    def test_hold_step(self):
+        controller_model = self.get_initialized_model(900)
+        _interval = controller_model.get_step_interval(self.step_size_seconds)
+        for i in range(self.n_steps):
+            if i % _interval == 0:
+                self.do_step(controller_model, i)
+            else:
+                controller_model.hold_step(
+                    t_start=i * self.step_size_seconds, t_step=self.step_size_seconds
+                )
+
+        assert controller_model.current_t_idx == self.n_steps
+        for state in controller_model.output_states:
+            _output = controller_model.output[state].reshape(-1, _interval)
+            # output is held zero-order between controller steps
+            np.testing.assert_array_equal(_output, _output[:, [0]] * np.ones(3))
+
+        # controller steps match a controller stepped on every step
+        _reference_model = self.get_initialized_model(300)
+        for i in range(self.n_steps):
+            self.do_step(_reference_model, i)
+        np.testing.assert_array_equal(
+            controller_model.output[STATES.TEMPERATURE_CTRL][::_interval],
+            _reference_model.output[STATES.TEMPERATURE_CTRL][::_interval],
+        )
+        assert np.any(controller_model.output[STATES.AUXHEAT1] > 0)
@@ -0,0 +1,135 @@
+import logging
+import copy
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from BuildingControlsSimulator.DataClients.DataStates import STATES
+from BuildingControlsSimulator.ControllerModels.Deadband import Deadband
+from BuildingControlsSimulator.ControllerModels.SettingsTimeline import (
+    SettingsTimeline,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class RecordingDeadband(Deadband):
+    """Deadband that records the settings passed to change_settings."""
+
+    def change_settings(self, new_settings):
+        self.settings_history.append(
+            (self.current_t_idx, copy.deepcopy(new_settings))
+        )
+
+
+class TestSettingsTimeline:
+    @classmethod
+    def setup_class(cls):
+        cls.step_datetimes = pd.date_range(
+            "2018-01-01", periods=2 * 288, freq="300S", tz="utc"
+        )
+        _t0 = cls.step_datetimes[0]
+        _home = {"name": "Home", "minute_of_day": 390, "on_day_of_week": [True] * 7}
+        _sleep = {"name": "Sleep", "minute_of_day": 1410, "on_day_of_week": [True] * 7}
+        _away = {"name": "Away", "minute_of_day": 600, "on_day_of_week": [True] * 7}
+        cls.change_points_schedule = {
+            _t0: [_home, _sleep],
+            cls.step_datetimes[100]: [_home, _sleep, _away],
+        }
+        cls.change_points_comfort_prefs = {
+            _t0: {
+                "Home": {
+                    STATES.TEMPERATURE_STP_COOL: 24.0,
+                    STATES.TEMPERATURE_STP_HEAT: 21.0,
+                },
+                "Sleep": {
+                    STATES.TEMPERATURE_STP_COOL: 28.0,
+                    STATES.TEMPERATURE_STP_HEAT: 16.0,
+                },
+            },
+            cls.step_datetimes[100]: {
+                "Away": {
+                    STATES.TEMPERATURE_STP_COOL: 29.0,
+                    STATES.TEMPERATURE_STP_HEAT: 15.0,
+                },
+            },
+            cls.step_datetimes[250]: {
+                "Home": {
+                    STATES.TEMPERATURE_STP_COOL: 23.0,
+                    STATES.TEMPERATURE_STP_HEAT: 20.0,
+                },
+            },
+            # off step change point is never observed
+            cls.step_datetimes[300] + pd.Timedelta(seconds=30): {
+                "Home": {
+                    STATES.TEMPERATURE_STP_COOL: 22.0,
+                    STATES.TEMPERATURE_STP_HEAT: 19.0,
+                },
+            },
+        }
+        cls.change_points_hvac_mode = {
+            _t0: "heat",
+            cls.step_datetimes[400]: "cool",
+        }
+
+    @classmethod
+    def teardown_class(cls):
+        """teardown any state that was previously setup with a call to
+        setup_class.
+        """
+        pass
+
+    def get_controller(self):
+        controller = RecordingDeadband(
+            options={"deadband": 1.0},
+            step_size_seconds=300,
+            discretization_size_seconds=300,
+        )
+        controller.settings_history = []
+        controller.update_settings(
+            change_points_schedule=self.change_points_schedule,
+            change_points_comfort_prefs=self.change_points_comfort_prefs,
+            change_points_hvac_mode=self.change_points_hvac_mode,
+            init=True,
+        )
+        return controller
+
+    def test_compile(self):
+        timeline = SettingsTimeline.compile(
+            change_points_schedule=self.change_points_schedule,
+            change_points_comfort_prefs=self.change_points_comfort_prefs,
+            change_points_hvac_mode=self.change_points_hvac_mode,
+            step_datetimes=self.step_datetimes,
+        )
+        assert list(timeline.event_steps) == [100, 250, 400]
+        assert timeline.get_event(400).hvac_mode == "cool"
+        assert timeline.get_event(400).schedules is None
+        assert timeline.get_event(1) is None
+
+    def test_timeline_matches_change_point_search(self):
+        legacy_controller = self.get_controller()
+        timeline_controller = self.get_controller()
+        timeline_controller.compile_settings_timeline(
+            change_points_schedule=self.change_points_schedule,
+            change_points_comfort_prefs=self.change_points_comfort_prefs,
+            change_points_hvac_mode=self.change_points_hvac_mode,
+            step_datetimes=self.step_datetimes,
+        )
+
+        for i, _dt in enumerate(self.step_datetimes):
+            legacy_controller.current_t_idx = i
+            legacy_controller.update_settings(
+                change_points_schedule=self.change_points_schedule,
+                change_points_comfort_prefs=self.change_points_comfort_prefs,
+                change_points_hvac_mode=self.change_points_hvac_mode,
+                time_utc=_dt,
+            )
+            timeline_controller.current_t_idx = i
+            timeline_controller.update_settings(t_idx=i)
+
+        assert len(timeline_controller.settings_history) == 3
+        assert (
+            timeline_controller.settings_history == legacy_controller.settings_history
+        )
+        assert timeline_controller.settings == legacy_controller.settings
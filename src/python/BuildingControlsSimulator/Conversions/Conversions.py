@@ -86,3 +86,21 @@ class Conversions:
             return (np.datetime64("2000-01-01"), "datetime64")
         else:
             raise ValueError(f"Unsupported dtype={dtype}")
+
+    @staticmethod
+    def get_category_code_dtype(categories):
+        """Smallest signed integer dtype of codes of categories, with -1 as
+        the missing value code as in pd.Categorical."""
+        return np.min_scalar_type(-len(categories) - 1)
+
+    @staticmethod
+    def get_category_code(categories, value):
+        """Integer code of value in categories, -1 if value is missing."""
+        try:
+            return categories.get_loc(value)
+        except KeyError:
+            return -1
+
+    @staticmethod
+    def codes_to_categorical(codes, categories):
+        return pd.Categorical.from_codes(codes, categories=categories)
@@ -99,6 +99,26 @@ class DataClient:
                 exist_ok=True,
             )
 
+    def copy_for_sim_config(self, sim_config):
+        """Lightweight copy of an unloaded DataClient for a sim_config.
+
+        Source, destination, and specs are shared rather than deep copied,
+        data channels and state variables are reset.
+        """
+        return attr.evolve(
+            self,
+            sim_config=sim_config,
+            thermostat=None,
+            equipment=None,
+            sensors=None,
+            weather=None,
+            datetime=None,
+            full_data_periods=[],
+            start_utc=None,
+            end_utc=None,
+            has_data=False,
+        )
+
     def get_data(self):
         # check if data has already been fetched by another simulation
         if self.has_data:
@@ -422,6 +442,11 @@ class DataClient:
     def store_output(self, output, sim_name, src_spec):
         self.destination.put_data(df=output, sim_name=sim_name, src_spec=src_spec)
 
+    def open_output_stream(self, sim_name, src_spec):
+        return self.destination.open_output_stream(
+            sim_name=sim_name, src_spec=src_spec
+        )
+
     def store_input(
         self,
         filepath_or_buffer,
@@ -888,6 +913,137 @@ class DataClient:
         res_df = res_df.reset_index()
         return res_df
 
+    @staticmethod
+    def downsample_arrays_to_step_size(df, step_size_seconds, data_spec):
+        """Array level equivalent of downsample_to_step_size for records sorted
+        by datetime.
+
+        Records are assigned to bins starting at midnight of the first day by
+        integer division of their timestamps. Mean and sum columns are reduced
+        with the compensated summation of get_bin_sums, other columns take the
+        record at the bin start. Integer sums that do not fit the column dtype
+        are upcast to int64 as pandas does.
+        """
+        _datetimes = df[data_spec.datetime_column]
+        _datetimes_ns = _datetimes.to_numpy(dtype="datetime64[ns]").view("int64")
+        _step_ns = step_size_seconds * 10 ** 9
+        _origin_ns = _datetimes_ns[0] - (_datetimes_ns[0] % (86400 * 10 ** 9))
+        _start_ns = _datetimes_ns[0] - ((_datetimes_ns[0] - _origin_ns) % _step_ns)
+        _bins = (_datetimes_ns - _start_ns) // _step_ns
+        _n_bins = int(_bins[-1]) + 1
+        _bin_start_ns = _start_ns + np.arange(_n_bins, dtype="int64") * _step_ns
+
+        # position of record at start of each bin, -1 if there is none
+        _positions = np.full(_n_bins, -1, dtype="int64")
+        _is_bin_start = _datetimes_ns == _bin_start_ns[_bins]
+        _positions[_bins[_is_bin_start]] = np.flatnonzero(_is_bin_start)
+
+        _units = {
+            _state: _v["unit"]
+            for _state, _v in data_spec.full.spec.items()
+            if _state in df.columns
+        }
+        _columns = [_col for _col in df.columns if _col != data_spec.datetime_column]
+        _other_columns = [
+            _col
+            for _col in _columns
+            if _units.get(_col)
+            not in [UNITS.CELSIUS, UNITS.RELATIVE_HUMIDITY, UNITS.SECONDS]
+        ]
+        # reindexing missing positions upcasts dtypes as resample().asfreq()
+        _other = df[_other_columns].set_axis(np.arange(len(df)), axis="index")
+        _other = _other.reindex(_positions)
+
+        _res = {
+            data_spec.datetime_column: pd.DatetimeIndex(
+                _bin_start_ns.view("datetime64[ns]")
+            ).tz_localize(_datetimes.dt.tz)
+        }
+        for _col in _columns:
+            if _col in _other_columns:
+                _res[_col] = _other[_col].array
+                continue
+
+            _dtype = df[_col].dtype
+            # numpy dtype of nullable dtypes
+            _np_dtype = getattr(_dtype, "numpy_dtype", _dtype)
+            _sum, _count = DataClient.get_bin_sums(
+                values=df[_col].to_numpy(
+                    dtype=_np_dtype if _np_dtype.kind == "f" else "float64",
+                    na_value=np.nan,
+                ),
+                bins=_bins,
+                n_bins=_n_bins,
+            )
+            if _units[_col] != UNITS.SECONDS:
+                # mean integration
+                with np.errstate(divide="ignore", invalid="ignore"):
+                    _sum = _sum / _count.astype(_sum.dtype)
+            elif _np_dtype.kind in "iu":
+                # sum integration, float64 sums of integers are exact
+                _sum = _sum.astype("int64")
+                _info = np.iinfo(_np_dtype)
+                if len(_sum) and (_sum.min() < _info.min or _sum.max() > _info.max):
+                    _dtype = (
+                        np.dtype("int64")
+                        if isinstance(_dtype, np.dtype)
+                        else pd.Int64Dtype()
+                    )
+            if isinstance(_dtype, np.dtype):
+                _res[_col] = _sum.astype(_dtype)
+            else:
+                # nullable dtypes
+                _res[_col] = pd.array(_sum, dtype=_dtype)
+
+        return pd.DataFrame(_res)
+
+    @staticmethod
+    def get_bin_sums(values, bins, n_bins):
+        """Sums and counts of non-NaN values in each of n_bins sorted bins.
+
+        Values are summed in their dtype with the compensated summation of
+        pandas groupby reductions so that results are identical. The
+        summation is vectorized over bins and loops over records within bins.
+        """
+        # position of each record within its bin
+        _within = np.arange(len(bins)) - np.searchsorted(bins, bins)
+        _binned = np.full(
+            (n_bins, int(_within.max()) + 1), np.nan, dtype=values.dtype
+        )
+        _binned[bins, _within] = values
+
+        _sum = np.zeros(n_bins, dtype=values.dtype)
+        _compensation = np.zeros(n_bins, dtype=values.dtype)
+        _count = np.zeros(n_bins, dtype="int64")
+        for _values in _binned.T:
+            _valid = ~np.isnan(_values)
+            _y = _values - _compensation
+            _t = _sum + _y
+            _compensation = np.where(_valid, (_t - _sum) - _y, _compensation)
+            _sum = np.where(_valid, _t, _sum)
+            _count += _valid
+        return _sum, _count
+
+    @staticmethod
+    def get_periods_mask(datetimes, periods):
+        """Mask of sorted datetimes within any of periods [start, end)."""
+        _datetimes_ns = pd.DatetimeIndex(datetimes).asi8
+        if not periods:
+            return np.zeros(len(_datetimes_ns), dtype=bool)
+
+        # count of periods open at each record from period boundaries
+        _open = np.zeros(len(_datetimes_ns) + 1, dtype="int64")
+        for _boundaries, _delta in zip(np.transpose(periods), [1, -1]):
+            np.add.at(
+                _open,
+                np.searchsorted(
+                    _datetimes_ns,
+                    [pd.Timestamp(_t).value for _t in _boundaries],
+                ),
+                _delta,
+            )
+        return np.cumsum(_open[:-1]) > 0
+
     @staticmethod
     def generate_dummy_data(
         sim_config,
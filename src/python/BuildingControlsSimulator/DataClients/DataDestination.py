@@ -2,6 +2,7 @@
 
 import os
 import logging
+import tempfile
 from abc import ABC, abstractmethod
 import pkg_resources
 
@@ -14,6 +15,9 @@ from BuildingControlsSimulator.DataClients.DataSpec import (
     DonateYourDataSpec,
     FlatFilesSpec,
 )
+from BuildingControlsSimulator.DataClients.OutputStreamWriter import (
+    OutputStreamWriter,
+)
 
 logger = logging.getLogger(__name__)
 
@@ -33,6 +37,16 @@ class DataDestination(ABC):
     def put_data(self, df, sim_name):
         pass
 
+    def open_output_stream(self, sim_name, src_spec):
+        """Return OutputStreamWriter to store output chunk by chunk instead
+        of calling put_data with the whole output."""
+        return OutputStreamWriter(destination=self, sim_name=sim_name, src_spec=src_spec)
+
+    def put_output_stream_file(self, fpath, sim_name):
+        """Called with the finished file of an OutputStreamWriter, override
+        for destinations that store output outside the local_cache."""
+        pass
+
     def make_data_directories(self):
         if not self.local_cache:
             logger.info("local_cache not supplied, directory will not be made.")
@@ -66,10 +80,33 @@ class DataDestination(ABC):
 
     def put_local_cache(self, df, local_cache_file):
         if local_cache_file and os.path.exists(os.path.dirname(local_cache_file)):
-            self.write_data_by_extension(df, local_cache_file)
+            # write to temporary file then atomically replace so that
+            # concurrent simulation processes never observe partial files
+            _fd, _tmp_file = tempfile.mkstemp(
+                dir=os.path.dirname(local_cache_file),
+                prefix=os.path.basename(local_cache_file) + ".",
+                suffix=".tmp",
+            )
+            os.close(_fd)
+            try:
+                self.write_data_by_extension(
+                    df,
+                    _tmp_file,
+                    file_extension=self.get_file_extension(local_cache_file),
+                )
+                os.replace(_tmp_file, local_cache_file)
+            finally:
+                if os.path.exists(_tmp_file):
+                    os.remove(_tmp_file)
         else:
             logger.error(f"local_cache_file: {local_cache_file} does not exist.")
 
+    def get_file_extension(self, filepath):
+        _basename = os.path.basename(filepath)
+        if "." in _basename:
+            return _basename.split(".", 1)[1]
+        return self.file_extension
+
     def write_data_by_extension(
         self,
         df,
@@ -108,6 +145,14 @@ class DataDestination(ABC):
                     + f" Default file_extension: {file_extension}."
                 )
 
+        _df = self.get_export_df(df, data_spec=data_spec)
+
+        DataDestination.write_data_static(_df, filepath_or_buffer, file_extension)
+
+    def get_export_df(self, df, data_spec=None):
+        if not data_spec:
+            data_spec = self.data_spec
+
         # use human readable column names
         if isinstance(data_spec, Internal):
             # if modifing df for export need a copy
@@ -116,7 +161,7 @@ class DataDestination(ABC):
         else:
             _df = df
 
-        DataDestination.write_data_static(_df, filepath_or_buffer, file_extension)
+        return _df
 
     @staticmethod
     def write_data_static(_df, filepath_or_buffer, file_extension="parquet.gzip"):
@@ -37,6 +37,15 @@ class GCSDestination(DataDestination):
         gcs_uri = self.get_gcs_uri(sim_name=sim_name)
         self.put_gcs(_df, gcs_uri)
 
+    def put_output_stream_file(self, fpath, sim_name):
+        gcs_uri = self.get_gcs_uri(sim_name=sim_name)
+        _fs = gcsfs.GCSFileSystem(
+            project=self.gcp_project,
+            token=self.gcs_token,
+            access="read_write",
+        )
+        _fs.put(fpath, gcs_uri)
+
     def get_gcs_uri(self, sim_name):
         return os.path.join(self.gcs_uri_base, self.get_file_name(sim_name=sim_name))
 
@@ -0,0 +1,113 @@
+import os
+import logging
+import tempfile
+
+import attr
+import pandas as pd
+import numpy as np
+import pyarrow as pa
+import pyarrow.parquet as pq
+
+from BuildingControlsSimulator.DataClients.DataSpec import convert_spec
+
+logger = logging.getLogger(__name__)
+
+
+@attr.s(kw_only=True)
+class OutputStreamWriter:
+    """Writes simulation output chunk by chunk as row groups of one parquet file.
+
+    Each chunk is converted to the destination spec and written as it is
+    passed, so only one chunk of output is held as a DataFrame at a time.
+    The file is written to a temporary file and moved into place on close,
+    reading it back gives the same data as storing the whole output at once.
+    """
+
+    destination = attr.ib()
+    sim_name = attr.ib()
+    src_spec = attr.ib()
+    local_cache_file = attr.ib(default=None)
+    tmp_file = attr.ib(default=None)
+    schema = attr.ib(default=None)
+    writer = attr.ib(default=None)
+    empty_df = attr.ib(default=None)
+    n_rows = attr.ib(default=0)
+
+    def __attrs_post_init__(self):
+        if not self.destination.file_extension.startswith("parquet"):
+            raise ValueError(
+                "Streaming output requires parquet file_extension, got: "
+                + f"{self.destination.file_extension}"
+            )
+
+        self.local_cache_file = self.destination.get_local_cache_file(self.sim_name)
+        _tmp_dir = None
+        if self.local_cache_file and os.path.exists(
+            os.path.dirname(self.local_cache_file)
+        ):
+            _tmp_dir = os.path.dirname(self.local_cache_file)
+        else:
+            self.local_cache_file = None
+
+        _fd, self.tmp_file = tempfile.mkstemp(
+            dir=_tmp_dir,
+            prefix=self.destination.get_file_name(self.sim_name) + ".",
+            suffix=".tmp",
+        )
+        os.close(_fd)
+
+    def write(self, df):
+        """Convert and append chunk of output as a row group."""
+        _df = convert_spec(
+            df=df, src_spec=self.src_spec, dest_spec=self.destination.data_spec
+        )
+        _df = self.destination.get_export_df(_df)
+
+        if _df.empty:
+            # empty row groups are not written, and the schema of empty
+            # chunks may be incomplete, e.g. object columns
+            self.empty_df = _df
+            return
+
+        if self.writer is None:
+            _table = pa.Table.from_pandas(_df, preserve_index=False)
+            self.schema = _table.schema
+            # same compression as DataDestination.write_data_static
+            self.writer = pq.ParquetWriter(
+                self.tmp_file, self.schema, compression="gzip"
+            )
+        else:
+            _table = pa.Table.from_pandas(_df, schema=self.schema, preserve_index=False)
+
+        self.writer.write_table(_table)
+        self.n_rows += len(_df)
+
+    def close(self):
+        """Finish file, move it into place, and pass it to the destination."""
+        if self.writer is not None:
+            self.writer.close()
+        elif self.empty_df is not None:
+            self.destination.write_data_static(
+                self.empty_df, self.tmp_file, file_extension="parquet"
+            )
+        else:
+            self.abort()
+            raise ValueError(f"No output was written for: {self.sim_name}")
+
+        logger.info(f"Streamed {self.n_rows} output records of: {self.sim_name}")
+        if self.local_cache_file:
+            os.replace(self.tmp_file, self.local_cache_file)
+            self.destination.put_output_stream_file(
+                self.local_cache_file, self.sim_name
+            )
+        else:
+            self.destination.put_output_stream_file(self.tmp_file, self.sim_name)
+            os.remove(self.tmp_file)
+
+    def abort(self):
+        """Discard partially written output."""
+        if self.writer is not None:
+            self.writer.close()
+            self.writer = None
+        if os.path.exists(self.tmp_file):
+            os.remove(self.tmp_file)
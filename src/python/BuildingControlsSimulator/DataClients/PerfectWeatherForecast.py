@@ -0,0 +1,72 @@
+import logging
+
+import attr
+import pandas as pd
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@attr.s(kw_only=True)
+class PerfectWeatherForecast:
+    """Perfect weather forecasts generated from measured weather data.
+
+    One end-padded NumPy block is built per simulation run, the forecast for
+    each step is a read-only window view into this block so no data is copied
+    per step. When the weather data runs out at the end of the simulation the
+    last record is forward projected over the remaining horizon.
+    """
+
+    horizon_steps = attr.ib(default=0)
+    columns = attr.ib(factory=list)
+    block = attr.ib(default=None)
+
+    @staticmethod
+    def from_dataframe(df, horizon_steps):
+        _values = df.to_numpy()
+        if horizon_steps > 0 and len(_values) > 0:
+            # pad end of block with last record so that every window has
+            # horizon_steps records
+            _block = np.concatenate(
+                [_values, np.repeat(_values[-1:], horizon_steps, axis=0)], axis=0
+            )
+        else:
+            _block = _values.copy()
+
+        _block.flags.writeable = False
+        return PerfectWeatherForecast(
+            horizon_steps=horizon_steps,
+            columns=list(df.columns),
+            block=_block,
+        )
+
+    @staticmethod
+    def get_max_horizon_steps(controller_model):
+        """Max forecast horizon required by a controller or ensemble of
+        controllers."""
+        _max_horizon = 0
+        if hasattr(controller_model, "controllers"):
+            # if the controller_model is an ensemble model iterate through
+            # each model and take max horizon for generating forecast data
+            _max_horizon = max(
+                [
+                    _c.horizon_steps if hasattr(_c, "horizon_steps") else 0
+                    for _c in controller_model.controllers
+                ]
+            )
+        elif hasattr(controller_model, "horizon_steps"):
+            _max_horizon = controller_model.horizon_steps
+
+        return _max_horizon
+
+    def get_step_forecast(self, idx):
+        """Read-only view of shape (horizon_steps, len(columns))."""
+        return self.block[idx : (idx + self.horizon_steps)]
+
+    def get_step_forecast_dataframe(self, idx):
+        """DataFrame adapter for controllers that require a pd.DataFrame."""
+        return pd.DataFrame(
+            self.get_step_forecast(idx),
+            columns=self.columns,
+            index=pd.RangeIndex(idx, idx + self.horizon_steps),
+        )
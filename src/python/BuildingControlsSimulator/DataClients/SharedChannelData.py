@@ -0,0 +1,187 @@
+import os
+import logging
+import copy
+import uuid
+
+import attr
+import pandas as pd
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@attr.s(kw_only=True)
+class SharedChannelData:
+    """Prepared DataClient channel data published once to a memory-mapped file.
+
+    The DataClient is pickled without channel data, worker processes attach
+    to the file read-only and get channel DataFrames whose columns are views
+    into the shared pages. Peak RAM therefore does not scale with the number
+    of simulations using the same data.
+
+    Numeric, boolean, datetime, nullable, and categorical (as codes) columns
+    are shared. Other columns (e.g. object dtype) are pickled with the manifest.
+    """
+
+    fpath = attr.ib()
+    manifest = attr.ib(factory=dict)
+    data_client = attr.ib(default=None)
+
+    # data channels of DataClient that are shared
+    channels = ["datetime", "thermostat", "equipment", "sensors", "weather"]
+    # byte alignment of column arrays within the file
+    alignment = 64
+
+    @staticmethod
+    def encode_column(series):
+        """Return column manifest and list of arrays to write to shared file."""
+        _dtype = series.dtype
+        if isinstance(_dtype, pd.CategoricalDtype):
+            return (
+                {
+                    "kind": "categorical",
+                    "categories": list(_dtype.categories),
+                    "ordered": _dtype.ordered,
+                },
+                [series.cat.codes.to_numpy()],
+            )
+        elif isinstance(_dtype, pd.DatetimeTZDtype):
+            return (
+                {"kind": "datetime_tz", "tz": str(_dtype.tz)},
+                [series.array._ndarray.view("int64")],
+            )
+        elif isinstance(series.array, pd.core.arrays.masked.BaseMaskedArray):
+            return (
+                {"kind": "masked", "dtype": _dtype.name},
+                [series.array._data, series.array._mask],
+            )
+        elif isinstance(_dtype, np.dtype) and _dtype.kind in "biufcmM":
+            return ({"kind": "numpy"}, [series.to_numpy()])
+        else:
+            # not shareable, copied with manifest
+            return ({"kind": "object", "values": series.to_numpy()}, [])
+
+    @staticmethod
+    def decode_column(column_manifest, arrays):
+        _kind = column_manifest["kind"]
+        if _kind == "categorical":
+            return pd.Categorical.from_codes(
+                arrays[0],
+                dtype=pd.CategoricalDtype(
+                    categories=column_manifest["categories"],
+                    ordered=column_manifest["ordered"],
+                ),
+            )
+        elif _kind == "datetime_tz":
+            return pd.arrays.DatetimeArray(
+                arrays[0].view("datetime64[ns]"),
+                dtype=pd.DatetimeTZDtype(tz=column_manifest["tz"]),
+                copy=False,
+            )
+        elif _kind == "masked":
+            return (
+                pd.api.types.pandas_dtype(column_manifest["dtype"])
+                .construct_array_type()(arrays[0], arrays[1])
+            )
+        elif _kind == "numpy":
+            return arrays[0]
+        else:
+            return column_manifest["values"]
+
+    @staticmethod
+    def publish(data_client, shared_dir):
+        """Write channel data of a DataClient that has data to a shared file.
+
+        :return: SharedChannelData containing a copy of data_client without
+        channel data
+        """
+        if not data_client.has_data:
+            raise ValueError("DataClient.get_data() must be called before publish.")
+
+        os.makedirs(shared_dir, exist_ok=True)
+        fpath = os.path.join(
+            shared_dir,
+            f"{data_client.sim_config['identifier']}_{uuid.uuid4().hex}.channels",
+        )
+
+        manifest = {}
+        _offset = 0
+        _writes = []
+        for _channel in SharedChannelData.channels:
+            _data_channel = getattr(data_client, _channel)
+            if _data_channel is None or _data_channel.data is None:
+                continue
+
+            _df = _data_channel.data
+            manifest[_channel] = {"index": _df.index, "columns": []}
+            for _col in _df.columns:
+                _column_manifest, _arrays = SharedChannelData.encode_column(_df[_col])
+                _column_manifest["name"] = _col
+                _column_manifest["arrays"] = []
+                for _arr in _arrays:
+                    _arr = np.ascontiguousarray(_arr)
+                    _column_manifest["arrays"].append(
+                        {"offset": _offset, "dtype": _arr.dtype.str, "size": _arr.size}
+                    )
+                    _writes.append((_offset, _arr))
+                    _offset += _arr.nbytes
+                    _offset += (-_offset) % SharedChannelData.alignment
+                manifest[_channel]["columns"].append(_column_manifest)
+
+        # write to temporary file first so that readers never see partial data
+        _tmp_fpath = fpath + ".tmp"
+        with open(_tmp_fpath, "wb") as f:
+            # memory map of empty file is not allowed
+            f.truncate(max(_offset, 1))
+            for _arr_offset, _arr in _writes:
+                f.seek(_arr_offset)
+                f.write(_arr.tobytes())
+        os.replace(_tmp_fpath, fpath)
+
+        # copy of data client without channel data for pickling
+        _data_client = copy.copy(data_client)
+        for _channel in manifest.keys():
+            _data_channel = copy.copy(getattr(data_client, _channel))
+            _data_channel.data = None
+            setattr(_data_client, _channel, _data_channel)
+
+        logger.info(f"Published {_offset} bytes of channel data to: {fpath}")
+        return SharedChannelData(
+            fpath=fpath, manifest=manifest, data_client=_data_client
+        )
+
+    def attach(self):
+        """Attach read-only to shared file and restore channel data as views.
+
+        :return: DataClient with channel data
+        """
+        _mmap = np.memmap(self.fpath, dtype="uint8", mode="r")
+        _data_client = copy.copy(self.data_client)
+        for _channel, _channel_manifest in self.manifest.items():
+            _columns = {}
+            for _column_manifest in _channel_manifest["columns"]:
+                _arrays = [
+                    np.frombuffer(
+                        _mmap,
+                        dtype=np.dtype(_arr["dtype"]),
+                        count=_arr["size"],
+                        offset=_arr["offset"],
+                    )
+                    for _arr in _column_manifest["arrays"]
+                ]
+                _columns[_column_manifest["name"]] = SharedChannelData.decode_column(
+                    _column_manifest, _arrays
+                )
+
+            _data_channel = copy.copy(getattr(_data_client, _channel))
+            # copy=False keeps each column a view into the shared file
+            _data_channel.data = pd.DataFrame(
+                _columns, index=_channel_manifest["index"], copy=False
+            )
+            setattr(_data_client, _channel, _data_channel)
+
+        return _data_client
+
+    def unlink(self):
+        if os.path.exists(self.fpath):
+            os.remove(self.fpath)
@@ -0,0 +1,113 @@
+import logging
+
+import attr
+import pandas as pd
+import numpy as np
+
+from BuildingControlsSimulator.DataClients.DataStates import STATES
+
+logger = logging.getLogger(__name__)
+
+
+class StepInputView:
+    """Read-only view of one simulation step of pre-extracted channel columns.
+
+    Supports the same ``step_input[STATES.X]`` access pattern as the row
+    ``pd.Series`` returned by ``DataFrame.iloc[i]`` without allocating a
+    ``pd.Series`` per step. Views are cheap and are created per step, models
+    should not keep references to them across steps.
+    """
+
+    __slots__ = ("columns", "idx")
+
+    def __init__(self, columns, idx):
+        self.columns = columns
+        self.idx = idx
+
+    def __getitem__(self, state):
+        return self.columns[state][self.idx]
+
+    def __contains__(self, state):
+        return state in self.columns
+
+    def __iter__(self):
+        return iter(self.columns)
+
+    def __len__(self):
+        return len(self.columns)
+
+    def get(self, state, default=None):
+        if state in self.columns:
+            return self.columns[state][self.idx]
+        return default
+
+    def keys(self):
+        return self.columns.keys()
+
+    def items(self):
+        return [(k, v[self.idx]) for k, v in self.columns.items()]
+
+    def to_dict(self):
+        return dict(self.items())
+
+
+@attr.s(kw_only=True)
+class StepInputColumns:
+    """Typed NumPy column arrays of a single data channel."""
+
+    columns = attr.ib(factory=dict)
+    n_steps = attr.ib(default=0)
+
+    @staticmethod
+    def from_dataframe(df):
+        """Extract every column of df once into a NumPy array."""
+        if df is None:
+            return StepInputColumns()
+
+        return StepInputColumns(
+            columns={
+                _col: StepInputColumns.to_column_array(df[_col]) for _col in df.columns
+            },
+            n_steps=len(df),
+        )
+
+    @staticmethod
+    def to_column_array(series):
+        """Convert a channel column to the NumPy array used for step access.
+        Numeric columns keep their dtype, categorical and nullable columns are
+        converted to object arrays holding the same values that
+        ``DataFrame.iloc[i]`` returns."""
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            return series.astype(object).to_numpy()
+        elif isinstance(series.dtype, pd.api.extensions.ExtensionDtype):
+            # nullable dtypes (e.g. boolean, Int16) and tz-aware datetimes
+            return series.to_numpy(dtype=object)
+
+        return series.to_numpy()
+
+    def step(self, idx):
+        return StepInputView(self.columns, idx)
+
+
+@attr.s(kw_only=True)
+class StepInputs:
+    """Per-channel step inputs extracted once before the co-simulation loop."""
+
+    datetime = attr.ib(factory=StepInputColumns)
+    thermostat = attr.ib(factory=StepInputColumns)
+    equipment = attr.ib(factory=StepInputColumns)
+    sensors = attr.ib(factory=StepInputColumns)
+    weather = attr.ib(factory=StepInputColumns)
+
+    @staticmethod
+    def from_data_client(data_client):
+        return StepInputs(
+            datetime=StepInputColumns.from_dataframe(data_client.datetime.data),
+            thermostat=StepInputColumns.from_dataframe(data_client.thermostat.data),
+            equipment=StepInputColumns.from_dataframe(data_client.equipment.data),
+            sensors=StepInputColumns.from_dataframe(data_client.sensors.data),
+            weather=StepInputColumns.from_dataframe(data_client.weather.data),
+        )
+
+    def get_step_time_utc(self, idx):
+        return self.datetime.columns[STATES.DATE_TIME][idx]
@@ -213,3 +213,66 @@ class TestDataClient:
                 ]
             )
         )
+
+    def test_downsample_arrays_to_step_size(self):
+        df = self.data_client.get_full_input()
+        # start within first output step
+        df = df.iloc[1:].reset_index(drop=True)
+        for _step_size_seconds in [900, 3600]:
+            pd.testing.assert_frame_equal(
+                DataClient.downsample_arrays_to_step_size(
+                    df,
+                    step_size_seconds=_step_size_seconds,
+                    data_spec=self.data_client.internal_spec,
+                ),
+                DataClient.downsample_to_step_size(
+                    df,
+                    step_size_seconds=_step_size_seconds,
+                    data_spec=self.data_client.internal_spec,
+                ),
+                check_exact=True,
+            )
+
+    def test_downsample_arrays_to_step_size_daily(self):
+        # daily runtime sums do not fit int16
+        _datetimes = pd.date_range(
+            "2018-01-01 00:05", "2018-01-03", freq="300S", tz="utc"
+        )
+        for _dtype in ["int16", "Int16"]:
+            df = pd.DataFrame(
+                {
+                    STATES.DATE_TIME: _datetimes,
+                    STATES.AUXHEAT1: pd.array(
+                        np.full(len(_datetimes), 300), dtype=_dtype
+                    ),
+                    STATES.THERMOSTAT_TEMPERATURE: np.linspace(
+                        20.0, 22.0, len(_datetimes), dtype="float32"
+                    ),
+                }
+            )
+            _res = DataClient.downsample_arrays_to_step_size(
+                df, step_size_seconds=86400, data_spec=Internal()
+            )
+            assert _res[STATES.AUXHEAT1].tolist() == [86100, 86400, 300]
+            pd.testing.assert_frame_equal(
+                _res,
+                DataClient.downsample_to_step_size(
+                    df, step_size_seconds=86400, data_spec=Internal()
+                ),
+                check_exact=True,
+            )
+
+    def test_get_periods_mask(self):
+        _datetimes = self.data_client.datetime.data[STATES.DATE_TIME]
+        _periods = self.data_client.full_data_periods + [
+            [_datetimes[10], _datetimes[20]],
+            [_datetimes[15], _datetimes[30]],
+        ]
+        _mask = np.zeros(len(_datetimes), dtype=bool)
+        for dp_start, dp_end in _periods:
+            _mask |= ((_datetimes >= dp_start) & (_datetimes < dp_end)).to_numpy()
+
+        np.testing.assert_array_equal(
+            DataClient.get_periods_mask(_datetimes, _periods), _mask
+        )
+        assert not DataClient.get_periods_mask(_datetimes, []).any()
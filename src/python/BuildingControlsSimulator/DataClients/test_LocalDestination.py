@@ -2,9 +2,12 @@
 import logging
 import os
 import copy
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
 
 import pytest
 import pandas as pd
+import numpy as np
 import pytz
 
 from BuildingControlsSimulator.Simulator.Config import Config
@@ -120,3 +123,24 @@ class TestLocalDestination:
                 _df = _df.drop(columns=[_col])
 
         pd.testing.assert_frame_equal(_df, cr_df)
+
+    def test_put_local_cache_concurrent(self):
+        """Concurrent writers of the same output file never leave partial or
+        temporary files."""
+        _destination = self.data_client.destination
+        _dfs = [
+            pd.DataFrame({"a": np.full(10000, i), "b": np.arange(10000)})
+            for i in range(8)
+        ]
+        with tempfile.TemporaryDirectory() as _tmp_dir:
+            _fpath = os.path.join(_tmp_dir, "concurrent_output.parquet.gzip")
+            with ThreadPoolExecutor(max_workers=4) as executor:
+                list(
+                    executor.map(
+                        lambda _df: _destination.put_local_cache(_df, _fpath), _dfs
+                    )
+                )
+
+            assert os.listdir(_tmp_dir) == [os.path.basename(_fpath)]
+            r_df = pd.read_parquet(_fpath)
+            assert any([r_df.equals(_df) for _df in _dfs])
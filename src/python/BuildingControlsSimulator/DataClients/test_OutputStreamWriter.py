@@ -0,0 +1,94 @@
+import logging
+import os
+import tempfile
+import shutil
+
+import pytest
+import pandas as pd
+import numpy as np
+import pyarrow.parquet as pq
+
+from BuildingControlsSimulator.DataClients.DataStates import STATES
+from BuildingControlsSimulator.DataClients.DataSpec import (
+    Internal,
+    DonateYourDataSpec,
+)
+from BuildingControlsSimulator.DataClients.LocalDestination import LocalDestination
+
+logger = logging.getLogger(__name__)
+
+
+class TestOutputStreamWriter:
+    @classmethod
+    def setup_class(cls):
+        n_steps = 1000
+        rng = np.random.default_rng(seed=1)
+        cls.df = pd.DataFrame.from_dict(
+            {
+                STATES.DATE_TIME: pd.date_range(
+                    "2018-01-01", periods=n_steps, freq="300S", tz="utc"
+                ),
+                STATES.TEMPERATURE_CTRL: rng.normal(20, 1, n_steps).astype(
+                    "float32"
+                ),
+                STATES.AUXHEAT1: rng.integers(0, 300, n_steps).astype("int16"),
+                STATES.THERMOSTAT_MOTION: rng.uniform(size=n_steps) > 0.5,
+            }
+        )
+        cls.local_cache = tempfile.mkdtemp()
+
+    @classmethod
+    def teardown_class(cls):
+        """teardown any state that was previously setup with a call to
+        setup_class.
+        """
+        shutil.rmtree(cls.local_cache)
+
+    def list_files(self, dir):
+        return [f for f in os.listdir(dir) if os.path.isfile(os.path.join(dir, f))]
+
+    def get_destination(self, operator_name):
+        os.makedirs(os.path.join(self.local_cache, operator_name), exist_ok=True)
+        return LocalDestination(
+            local_cache=self.local_cache,
+            data_spec=DonateYourDataSpec(),
+            operator_name=operator_name,
+        )
+
+    def test_stream_matches_put_data(self):
+        destination = self.get_destination("full")
+        destination.put_data(df=self.df, sim_name="sim_test", src_spec=Internal())
+
+        stream_destination = self.get_destination("stream")
+        output_stream = stream_destination.open_output_stream(
+            sim_name="sim_test", src_spec=Internal()
+        )
+        for _start in range(0, len(self.df), 128):
+            output_stream.write(self.df.iloc[_start : _start + 128])
+        # empty chunks are allowed
+        output_stream.write(self.df.iloc[0:0])
+        output_stream.close()
+
+        _fpath = stream_destination.get_local_cache_file("sim_test")
+        assert pq.ParquetFile(_fpath).num_row_groups == 8
+        pd.testing.assert_frame_equal(
+            pd.read_parquet(_fpath),
+            pd.read_parquet(destination.get_local_cache_file("sim_test")),
+        )
+        # no temporary files are left behind
+        assert self.list_files(os.path.dirname(_fpath)) == [os.path.basename(_fpath)]
+
+    def test_abort(self):
+        destination = self.get_destination("abort")
+        output_stream = destination.open_output_stream(
+            sim_name="sim_test", src_spec=Internal()
+        )
+        output_stream.write(self.df.iloc[:100])
+        output_stream.abort()
+        assert self.list_files(os.path.join(self.local_cache, "abort")) == []
+
+    def test_requires_parquet(self):
+        destination = self.get_destination("csv")
+        destination.file_extension = "csv"
+        with pytest.raises(ValueError):
+            destination.open_output_stream(sim_name="sim_test", src_spec=Internal())
@@ -0,0 +1,85 @@
+import logging
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from BuildingControlsSimulator.DataClients.DataStates import STATES
+from BuildingControlsSimulator.DataClients.PerfectWeatherForecast import (
+    PerfectWeatherForecast,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class TestPerfectWeatherForecast:
+    @classmethod
+    def setup_class(cls):
+        n_steps = 20
+        cls.horizon_steps = 6
+        cls.df = pd.DataFrame.from_dict(
+            {
+                STATES.OUTDOOR_TEMPERATURE: np.arange(n_steps).astype("float32"),
+                STATES.OUTDOOR_RELATIVE_HUMIDITY: np.linspace(
+                    10, 90, n_steps
+                ).astype("float32"),
+            }
+        )
+
+    @classmethod
+    def teardown_class(cls):
+        """teardown any state that was previously setup with a call to
+        setup_class.
+        """
+        pass
+
+    def get_legacy_forecast(self, i):
+        """Previous per-step slicing and tail padding of weather data."""
+        _step_forecast = self.df[i : (i + self.horizon_steps)]
+        if len(_step_forecast) < self.horizon_steps:
+            _step_forecast = pd.concat(
+                [_step_forecast]
+                + [_step_forecast.tail(1)]
+                * (self.horizon_steps - len(_step_forecast))
+            ).reset_index(drop=True)
+        return _step_forecast
+
+    def test_forecast_matches_legacy(self):
+        forecast = PerfectWeatherForecast.from_dataframe(
+            df=self.df, horizon_steps=self.horizon_steps
+        )
+        for i in range(len(self.df)):
+            _step_forecast = forecast.get_step_forecast(i)
+            assert _step_forecast.shape == (self.horizon_steps, len(self.df.columns))
+            np.testing.assert_array_equal(
+                _step_forecast, self.get_legacy_forecast(i).to_numpy()
+            )
+
+    def test_forecast_is_read_only_view(self):
+        forecast = PerfectWeatherForecast.from_dataframe(
+            df=self.df, horizon_steps=self.horizon_steps
+        )
+        _step_forecast = forecast.get_step_forecast(3)
+        assert np.shares_memory(_step_forecast, forecast.block)
+        with pytest.raises(ValueError):
+            _step_forecast[0, 0] = -1.0
+
+    def test_dataframe_adapter(self):
+        forecast = PerfectWeatherForecast.from_dataframe(
+            df=self.df, horizon_steps=self.horizon_steps
+        )
+        _df = forecast.get_step_forecast_dataframe(2)
+        pd.testing.assert_frame_equal(
+            _df, self.df[2 : (2 + self.horizon_steps)], check_index_type=False
+        )
+
+    def test_max_horizon_steps(self):
+        class _Controller:
+            horizon_steps = 12
+
+        class _Ensemble:
+            controllers = [_Controller(), object()]
+
+        assert PerfectWeatherForecast.get_max_horizon_steps(_Controller()) == 12
+        assert PerfectWeatherForecast.get_max_horizon_steps(_Ensemble()) == 12
+        assert PerfectWeatherForecast.get_max_horizon_steps(object()) == 0
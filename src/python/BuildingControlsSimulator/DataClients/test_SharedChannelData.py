@@ -0,0 +1,118 @@
+import logging
+import os
+import pickle
+import tempfile
+import shutil
+
+import pytest
+import attr
+import pandas as pd
+import numpy as np
+
+from BuildingControlsSimulator.DataClients.DataStates import STATES
+from BuildingControlsSimulator.DataClients.SharedChannelData import (
+    SharedChannelData,
+)
+
+logger = logging.getLogger(__name__)
+
+
+@attr.s(kw_only=True)
+class MockChannel:
+    data = attr.ib(default=None)
+    spec = attr.ib(default=None)
+
+
+@attr.s(kw_only=True)
+class MockDataClient:
+    sim_config = attr.ib()
+    has_data = attr.ib(default=True)
+    datetime = attr.ib(default=None)
+    thermostat = attr.ib(default=None)
+    equipment = attr.ib(default=None)
+    sensors = attr.ib(default=None)
+    weather = attr.ib(default=None)
+
+
+class TestSharedChannelData:
+    @classmethod
+    def setup_class(cls):
+        n_steps = 1000
+        cls.shared_dir = tempfile.mkdtemp()
+        _datetimes = pd.date_range("2018-01-01", periods=n_steps, freq="300S", tz="utc")
+        cls.data_client = MockDataClient(
+            sim_config={"identifier": "test_id"},
+            datetime=MockChannel(data=pd.DataFrame({STATES.DATE_TIME: _datetimes})),
+            thermostat=MockChannel(
+                data=pd.DataFrame(
+                    {
+                        STATES.DATE_TIME: _datetimes,
+                        STATES.HVAC_MODE: pd.Categorical(
+                            ["heat", "off"] * (n_steps // 2)
+                        ),
+                        STATES.TEMPERATURE_STP_HEAT: np.linspace(
+                            18, 22, n_steps
+                        ).astype("float32"),
+                        STATES.AUXHEAT1: np.arange(n_steps).astype("int16"),
+                        STATES.THERMOSTAT_MOTION: pd.Series(
+                            [True, None] * (n_steps // 2), dtype="boolean"
+                        ),
+                        STATES.SCHEDULE: ["Home", "Sleep"] * (n_steps // 2),
+                    }
+                )
+            ),
+            weather=MockChannel(
+                data=pd.DataFrame(
+                    {
+                        STATES.DATE_TIME: _datetimes,
+                        STATES.OUTDOOR_TEMPERATURE: np.linspace(-5, 5, n_steps),
+                    }
+                ),
+            ),
+        )
+
+    @classmethod
+    def teardown_class(cls):
+        """teardown any state that was previously setup with a call to
+        setup_class.
+        """
+        shutil.rmtree(cls.shared_dir)
+
+    def test_publish_attach(self):
+        shared = SharedChannelData.publish(self.data_client, self.shared_dir)
+        assert os.path.isfile(shared.fpath)
+        # channel data is not pickled with the data client
+        assert shared.data_client.thermostat.data is None
+        assert self.data_client.thermostat.data is not None
+        assert len(pickle.dumps(shared)) < len(
+            pickle.dumps(self.data_client.thermostat.data)
+        )
+
+        # attach as a worker process would after unpickling
+        data_client = pickle.loads(pickle.dumps(shared)).attach()
+        for _channel in ["datetime", "thermostat", "weather"]:
+            pd.testing.assert_frame_equal(
+                getattr(data_client, _channel).data,
+                getattr(self.data_client, _channel).data,
+            )
+        assert data_client.equipment is None
+        shared.unlink()
+        assert not os.path.exists(shared.fpath)
+
+    def test_attach_is_read_only_view(self):
+        shared = SharedChannelData.publish(self.data_client, self.shared_dir)
+        data_client = shared.attach()
+
+        _a = data_client.weather.data[STATES.OUTDOOR_TEMPERATURE].to_numpy()
+        # column is a view into the memory-mapped file
+        _base = _a
+        while _base.base is not None and not isinstance(_base, np.memmap):
+            _base = _base.base
+        assert isinstance(_base, np.memmap)
+        assert not _a.flags.writeable
+        with pytest.raises(ValueError):
+            _a[0] = 0.0
+
+        _codes_a = data_client.thermostat.data[STATES.HVAC_MODE].cat.codes.to_numpy()
+        assert not _codes_a.flags.writeable
+        shared.unlink()
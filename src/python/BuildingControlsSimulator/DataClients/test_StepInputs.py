@@ -0,0 +1,66 @@
+import logging
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from BuildingControlsSimulator.DataClients.DataStates import STATES
+from BuildingControlsSimulator.DataClients.StepInputs import StepInputColumns
+
+logger = logging.getLogger(__name__)
+
+
+class TestStepInputs:
+    @classmethod
+    def setup_class(cls):
+        n_steps = 10
+        cls.df = pd.DataFrame.from_dict(
+            {
+                STATES.DATE_TIME: pd.date_range(
+                    "2018-01-01", periods=n_steps, freq="300S", tz="utc"
+                ),
+                STATES.HVAC_MODE: pd.Categorical(["heat", "off"] * (n_steps // 2)),
+                STATES.TEMPERATURE_STP_HEAT: np.linspace(18, 22, n_steps).astype(
+                    "float32"
+                ),
+                STATES.AUXHEAT1: np.arange(n_steps).astype("int16"),
+                STATES.THERMOSTAT_MOTION: pd.Series(
+                    [True, False] * (n_steps // 2), dtype="boolean"
+                ),
+            }
+        )
+
+    @classmethod
+    def teardown_class(cls):
+        """teardown any state that was previously setup with a call to
+        setup_class.
+        """
+        pass
+
+    def test_step_view_matches_iloc(self):
+        step_input_columns = StepInputColumns.from_dataframe(self.df)
+        assert step_input_columns.n_steps == len(self.df)
+
+        for i in range(len(self.df)):
+            _row = self.df.iloc[i]
+            _view = step_input_columns.step(i)
+            for _col in self.df.columns:
+                assert _view[_col] == _row[_col]
+
+    def test_column_dtypes(self):
+        step_input_columns = StepInputColumns.from_dataframe(self.df)
+        assert (
+            step_input_columns.columns[STATES.TEMPERATURE_STP_HEAT].dtype
+            == np.float32
+        )
+        assert step_input_columns.columns[STATES.AUXHEAT1].dtype == np.int16
+        assert isinstance(
+            step_input_columns.columns[STATES.DATE_TIME][0], pd.Timestamp
+        )
+
+    def test_step_view_mapping(self):
+        _view = StepInputColumns.from_dataframe(self.df).step(3)
+        assert STATES.AUXHEAT1 in _view
+        assert STATES.COMPCOOL1 not in _view
+        assert _view.get(STATES.COMPCOOL1, 0) == 0
+        assert _view.to_dict()[STATES.AUXHEAT1] == 3
@@ -0,0 +1,375 @@
+import logging
+import time
+
+import attr
+import pandas as pd
+import numpy as np
+from tqdm import trange
+
+from BuildingControlsSimulator.DataClients.DataStates import STATES
+from BuildingControlsSimulator.DataClients.StepInputs import StepInputView
+
+logger = logging.getLogger(__name__)
+
+
+@attr.s(kw_only=True)
+class BatchModelGroup:
+    """Models filling the same co-simulation slot of N lockstep simulations.
+
+    If all models are of the same class and that class implements the
+    staticmethods `init_batch_state(models)` and `do_step_batch(batch_state,
+    t_start, t_step, **step_inputs)` the group is stepped with one vectorized
+    call over arrays of shape (N,). Otherwise each model's `do_step` is called.
+
+    Groups of controllers stepped at a lower rate than the simulation, see
+    Simulation.get_controller_steps, are given a step_mask of the models
+    stepped: vectorized groups pass it to `do_step_batch`, which holds the
+    step output of the other models, and per-instance models call
+    `hold_step` instead of `do_step`.
+    """
+
+    models = attr.ib()
+    n_steps = attr.ib()
+    vectorized = attr.ib(default=False)
+    batch_state = attr.ib(default=None)
+    batch_step_output = attr.ib(default=None)
+    # output buffers of shape (n_steps, N) for vectorized groups
+    output = attr.ib(factory=dict)
+
+    @staticmethod
+    def is_vectorized(models):
+        _model_classes = set([type(m) for m in models])
+        if len(_model_classes) != 1:
+            return False
+        _model_class = _model_classes.pop()
+        return callable(getattr(_model_class, "do_step_batch", None)) and callable(
+            getattr(_model_class, "init_batch_state", None)
+        )
+
+    @property
+    def model_class(self):
+        return type(self.models[0])
+
+    def initialize(self):
+        self.vectorized = BatchModelGroup.is_vectorized(self.models)
+        if not self.vectorized:
+            return
+
+        self.batch_state = self.model_class.init_batch_state(self.models)
+        self.batch_step_output = self.batch_state["step_output"]
+        _max_n_steps = int(np.max(self.n_steps))
+        self.output = {}
+        for state in self.batch_step_output.keys():
+            _model_output = self.models[0].output[state]
+            if not isinstance(_model_output, np.ndarray):
+                raise ValueError(
+                    f"{self.model_class.__name__}.do_step_batch output state {state} "
+                    + "must have np.ndarray output memory."
+                )
+            self.output[state] = np.empty(
+                (_max_n_steps, len(self.models)), dtype=_model_output.dtype
+            )
+
+    def do_step(self, i, active_idxs, t_start, t_step, step_inputs, step_mask=None):
+        """Advance all models of group by one time step.
+
+        :param step_inputs: dict of input name -> (np.ndarray of shape (N,)
+            for vectorized groups, callable n -> step input otherwise)
+        :param step_mask: boolean np.ndarray of shape (N,) of models stepped,
+            the others hold their step output. None steps all models.
+        """
+        if self.vectorized:
+            if step_mask is None:
+                self.batch_step_output = self.model_class.do_step_batch(
+                    batch_state=self.batch_state,
+                    t_start=t_start,
+                    t_step=t_step,
+                    **step_inputs,
+                )
+            elif step_mask.any():
+                self.batch_step_output = self.model_class.do_step_batch(
+                    batch_state=self.batch_state,
+                    t_start=t_start,
+                    t_step=t_step,
+                    step_mask=step_mask,
+                    **step_inputs,
+                )
+            for state, v in self.batch_step_output.items():
+                self.output[state][i] = v
+        else:
+            for n in active_idxs:
+                if step_mask is None or step_mask[n]:
+                    self.models[n].do_step(
+                        t_start=t_start[n],
+                        t_step=t_step,
+                        **{k: v(n) for k, v in step_inputs.items()},
+                    )
+                else:
+                    self.models[n].hold_step(t_start=t_start[n], t_step=t_step)
+
+    def get_step_output(self, n):
+        """Step output of single model, for per-instance consumers."""
+        if self.vectorized:
+            return StepInputView(self.batch_step_output, n)
+        return self.models[n].step_output
+
+    def get_step_output_arrays(self):
+        """Step outputs of all models as arrays of shape (N,), for vectorized
+        consumers."""
+        if self.vectorized:
+            return self.batch_step_output
+        return {
+            state: np.array([m.step_output[state] for m in self.models])
+            for state in self.models[0].step_output.keys()
+        }
+
+    def write_output(self):
+        """Copy vectorized output buffers back to per-instance model output so
+        that each simulation can be finalized independently."""
+        if not self.vectorized:
+            return
+
+        for n, model in enumerate(self.models):
+            _n_steps = self.n_steps[n]
+            for state, v in self.output.items():
+                model.output[state][:_n_steps] = v[:_n_steps, n]
+                model.step_output[state] = v[_n_steps - 1, n]
+            model.current_t_idx = _n_steps
+
+
+@attr.s(kw_only=True)
+class BatchSimulation:
+    """Advances N simulations with the same step size in lockstep.
+
+    Channel input data is stacked into arrays of shape (n_steps, N) so that
+    vectorized models read step inputs as contiguous rows. Simulations with
+    fewer steps are padded with their final record and their models stop
+    being stepped once their simulation ends.
+    """
+
+    simulations = attr.ib()
+    estimator_group = attr.ib(default=None)
+    controller_group = attr.ib(default=None)
+    building_group = attr.ib(default=None)
+    n_steps = attr.ib(default=None)
+    sim_time = attr.ib(default=None)
+    stacked_inputs = attr.ib(factory=dict)
+    settings_event_sims = attr.ib(factory=dict)
+    # boolean array of shape (n_steps, N) of controller steps, None if all
+    # controllers are stepped on every step
+    controller_steps = attr.ib(default=None)
+
+    @property
+    def step_size_seconds(self):
+        return self.simulations[0].step_size_seconds
+
+    @staticmethod
+    def stack_columns(columns_list, n_steps):
+        """Stack column arrays of each simulation into arrays of shape
+        (max(n_steps), N). Only columns present for all simulations are stacked."""
+        _max_n_steps = int(np.max(n_steps))
+        _shared_columns = set(columns_list[0].keys())
+        for _columns in columns_list[1:]:
+            _shared_columns &= set(_columns.keys())
+
+        _stacked = {}
+        for _col in _shared_columns:
+            _stacked[_col] = np.stack(
+                [
+                    np.pad(
+                        _columns[_col][:_n_steps],
+                        (0, _max_n_steps - len(_columns[_col][:_n_steps])),
+                        mode="edge",
+                    )
+                    for _columns, _n_steps in zip(columns_list, n_steps)
+                ],
+                axis=1,
+            )
+        return _stacked
+
+    def initialize(self):
+        for sim in self.simulations:
+            sim.initialize(data_spec=sim.data_client.internal_spec)
+
+        _step_sizes = set([sim.step_size_seconds for sim in self.simulations])
+        if len(_step_sizes) != 1:
+            raise ValueError(
+                f"Lockstep simulations must have same step size, got: {_step_sizes}"
+            )
+
+        _sim_times = [sim.get_sim_time() for sim in self.simulations]
+        self.n_steps = np.array([len(_t) for _t in _sim_times], dtype="int64")
+        _max_n_steps = int(np.max(self.n_steps))
+
+        # simulation time of finished simulations keeps advancing
+        self.sim_time = np.stack(
+            [
+                _t[0] + self.step_size_seconds * np.arange(_max_n_steps, dtype="int64")
+                for _t in _sim_times
+            ],
+            axis=1,
+        )
+
+        for _channel in ["thermostat", "sensors", "weather"]:
+            self.stacked_inputs[_channel] = BatchSimulation.stack_columns(
+                columns_list=[
+                    getattr(sim.step_inputs, _channel).columns
+                    for sim in self.simulations
+                ],
+                n_steps=self.n_steps,
+            )
+
+        # controllers with a discretization_size_seconds larger than the step
+        # size hold their output in between their steps as in Simulation.run
+        _controller_steps = [
+            sim.get_controller_steps(n_steps=_max_n_steps, first_idx=0)
+            for sim in self.simulations
+        ]
+        if all(_steps is None for _steps in _controller_steps):
+            self.controller_steps = None
+        else:
+            self.controller_steps = np.stack(
+                [
+                    np.ones(_max_n_steps, dtype=bool) if _steps is None else _steps
+                    for _steps in _controller_steps
+                ],
+                axis=1,
+            )
+
+        # settings events are sparse, only visit simulations with events
+        self.settings_event_sims = {}
+        for n, sim in enumerate(self.simulations):
+            for _t_idx in sim.controller_model.settings_timeline.event_steps:
+                self.settings_event_sims.setdefault(int(_t_idx), []).append(n)
+
+        self.estimator_group = BatchModelGroup(
+            models=[sim.state_estimator_model for sim in self.simulations],
+            n_steps=self.n_steps,
+        )
+        self.controller_group = BatchModelGroup(
+            models=[sim.controller_model for sim in self.simulations],
+            n_steps=self.n_steps,
+        )
+        self.building_group = BatchModelGroup(
+            models=[sim.building_model for sim in self.simulations],
+            n_steps=self.n_steps,
+        )
+        for _group in [self.estimator_group, self.controller_group, self.building_group]:
+            _group.initialize()
+            logger.info(
+                f"{_group.model_class.__name__} vectorized: {_group.vectorized}"
+            )
+
+    def get_channel_step_input(self, i, channel, vectorized):
+        if vectorized:
+            return {k: v[i] for k, v in self.stacked_inputs[channel].items()}
+        return lambda n: getattr(self.simulations[n].step_inputs, channel).step(i)
+
+    def get_model_step_input(self, group, vectorized):
+        if vectorized:
+            return group.get_step_output_arrays()
+        return group.get_step_output
+
+    def get_weather_forecast_step_input(self, i, vectorized):
+        if vectorized:
+            return [
+                sim.get_step_weather_forecast(min(i, n_steps - 1))
+                for sim, n_steps in zip(self.simulations, self.n_steps)
+            ]
+        return lambda n: self.simulations[n].get_step_weather_forecast(i)
+
+    def step(self, i):
+        """Advance all simulations by one time step."""
+        _active_idxs = np.flatnonzero(self.n_steps > i)
+        _t_start = self.sim_time[i]
+        _t_step = self.step_size_seconds
+
+        _vectorized = self.estimator_group.vectorized
+        self.estimator_group.do_step(
+            i=i,
+            active_idxs=_active_idxs,
+            t_start=_t_start,
+            t_step=_t_step,
+            step_inputs={
+                "step_sensor_input": self.get_model_step_input(
+                    self.building_group, _vectorized
+                ),
+            },
+        )
+
+        for n in self.settings_event_sims.get(i, []):
+            _controller_model = self.simulations[n].controller_model
+            if self.controller_group.vectorized:
+                # current_t_idx is only advanced by per-instance do_step
+                _controller_model.current_t_idx = i
+            _controller_model.update_settings(t_idx=i)
+
+        _vectorized = self.controller_group.vectorized
+        self.controller_group.do_step(
+            i=i,
+            active_idxs=_active_idxs,
+            t_start=_t_start,
+            t_step=_t_step,
+            step_inputs={
+                "step_thermostat_input": self.get_channel_step_input(
+                    i, "thermostat", _vectorized
+                ),
+                "step_sensor_input": self.get_model_step_input(
+                    self.estimator_group, _vectorized
+                ),
+                "step_weather_input": self.get_channel_step_input(
+                    i, "weather", _vectorized
+                ),
+                "step_weather_forecast_input": self.get_weather_forecast_step_input(
+                    i, _vectorized
+                ),
+            },
+            step_mask=(
+                None if self.controller_steps is None else self.controller_steps[i]
+            ),
+        )
+
+        _vectorized = self.building_group.vectorized
+        self.building_group.do_step(
+            i=i,
+            active_idxs=_active_idxs,
+            t_start=_t_start,
+            t_step=_t_step,
+            step_inputs={
+                "step_control_input": self.get_model_step_input(
+                    self.controller_group, _vectorized
+                ),
+                "step_sensor_input": self.get_channel_step_input(
+                    i, "sensors", _vectorized
+                ),
+                "step_weather_input": self.get_channel_step_input(
+                    i, "weather", _vectorized
+                ),
+            },
+        )
+
+    def finalize(self):
+        for _group in [self.estimator_group, self.controller_group, self.building_group]:
+            _group.write_output()
+
+        for sim in self.simulations:
+            sim.finalize()
+
+    def run(self):
+        """Lockstep co-simulation loop"""
+        logger.info(f"Initializing {len(self.simulations)} lockstep simulations")
+        self.initialize()
+
+        _sim_start_wall_time = time.perf_counter()
+        _sim_start_proc_time = time.process_time()
+
+        for i in trange(int(np.max(self.n_steps)), desc="Batch co-simulation steps"):
+            self.step(i)
+
+        logger.info(
+            "Finished batch co-simulation\n"
+            + f"Elapsed time: {time.perf_counter() - _sim_start_wall_time} seconds\n"
+            + f"Process time: {time.process_time() - _sim_start_proc_time} seconds"
+        )
+
+        self.finalize()
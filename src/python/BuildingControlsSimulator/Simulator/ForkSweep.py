@@ -0,0 +1,193 @@
+import logging
+import time
+
+import attr
+import numpy as np
+from tqdm import trange
+
+logger = logging.getLogger(__name__)
+
+
+@attr.s(kw_only=True)
+class ForkSweep:
+    """Co-simulation of a controller model sweep: N simulations of the same
+    input data, building model, and state estimator model that differ only by
+    their controller model, e.g. Deadband options.
+
+    Simulations whose controller models have given the same building control
+    input on every step so far share one trajectory, a branch. The building
+    and state estimator models of a branch are only stepped in the first
+    simulation of the branch, its leader, the controller models of all
+    simulations are stepped. On the first step where control inputs within a
+    branch differ, the branch is forked: the building and state estimator
+    model state of the leader is restored in a new leader for each different
+    control input, see `get_state_snapshot`, and only the diverging suffixes
+    are simulated separately. For deterministic models the output is
+    identical to that of independent simulations.
+
+    If the building model does not support state snapshots each simulation
+    is its own branch and the simulations are advanced in lockstep.
+    """
+
+    simulations = attr.ib()
+    # list of branches, each a list of simulations led by its first
+    branches = attr.ib(factory=list)
+    # controller output states that are building model input states
+    control_states = attr.ib(factory=list)
+    n_steps = attr.ib(default=None)
+    sim_time = attr.ib(default=None)
+    n_forks = attr.ib(default=0)
+
+    @property
+    def step_size_seconds(self):
+        return self.simulations[0].step_size_seconds
+
+    def initialize(self):
+        for sim in self.simulations:
+            sim.initialize(data_spec=sim.data_client.internal_spec)
+
+        _step_sizes = set([sim.step_size_seconds for sim in self.simulations])
+        if len(_step_sizes) != 1:
+            raise ValueError(
+                f"Fork sweep simulations must have same step size, got: {_step_sizes}"
+            )
+
+        self.sim_time = self.simulations[0].get_sim_time()
+        self.n_steps = len(self.sim_time)
+        for sim in self.simulations[1:]:
+            if not np.array_equal(sim.get_sim_time(), self.sim_time):
+                raise ValueError(
+                    "Fork sweep simulations must have same simulation time, "
+                    + f"got: {sim.sim_name}"
+                )
+
+        for sim in self.simulations:
+            sim.controller_steps = sim.get_controller_steps(
+                n_steps=self.n_steps, first_idx=0
+            )
+
+        _leader = self.simulations[0]
+        self.control_states = [
+            state
+            for state in _leader.building_model.input_states
+            if state in _leader.controller_model.output_states
+        ]
+        self.n_forks = 0
+        # support of state snapshots is only known after initialization
+        if _leader.building_model.get_state_snapshot() is None:
+            logger.warning(
+                "Building model does not support state snapshots, "
+                + "fork sweep simulations are not shared."
+            )
+            self.branches = [[sim] for sim in self.simulations]
+        else:
+            self.branches = [list(self.simulations)]
+
+    def get_control_input_key(self, sim):
+        """Hashable building control input of last controller step."""
+        return tuple(
+            sim.controller_model.step_output[state] for state in self.control_states
+        )
+
+    def split_branch(self, branch):
+        """Split branch into branches of equal control input, the branch of
+        its leader is first."""
+        _branches = {}
+        for sim in branch:
+            _branches.setdefault(self.get_control_input_key(sim), []).append(sim)
+        return list(_branches.values())
+
+    def copy_state(self, leader, simulations):
+        """Restore building and state estimator model state of leader in
+        simulations."""
+        _building_model_state = leader.building_model.get_state_snapshot()
+        _state_estimator_model_state = leader.state_estimator_model.get_state_snapshot()
+        for sim in simulations:
+            sim.building_model.set_state_snapshot(_building_model_state)
+            sim.state_estimator_model.set_state_snapshot(_state_estimator_model_state)
+
+    def step_controller(self, sim, i, t_start, step_sensor_input):
+        sim.controller_model.update_settings(t_idx=i)
+        if sim.controller_steps is None or sim.controller_steps[i]:
+            sim.controller_model.do_step(
+                t_start=t_start,
+                t_step=self.step_size_seconds,
+                step_thermostat_input=sim.step_inputs.thermostat.step(i),
+                step_sensor_input=step_sensor_input,
+                step_weather_input=sim.step_inputs.weather.step(i),
+                step_weather_forecast_input=sim.get_step_weather_forecast(i),
+            )
+        else:
+            sim.controller_model.hold_step(
+                t_start=t_start, t_step=self.step_size_seconds
+            )
+
+    def step(self, i):
+        """Advance all branches by one time step, forking branches whose
+        control inputs differ."""
+        _t_start = self.sim_time[i]
+        _branches = []
+        for branch in self.branches:
+            _leader = branch[0]
+            _leader.state_estimator_model.do_step(
+                t_start=_t_start,
+                t_step=self.step_size_seconds,
+                step_sensor_input=_leader.building_model.step_output,
+            )
+            for sim in branch:
+                self.step_controller(
+                    sim, i, _t_start, _leader.state_estimator_model.step_output
+                )
+
+            _split_branches = self.split_branch(branch)
+            if len(_split_branches) > 1:
+                logger.debug(
+                    f"Forking {_leader.sim_name} into {len(_split_branches)} "
+                    + f"branches at step: {i}"
+                )
+                # leader state before its building model step
+                self.copy_state(_leader, [b[0] for b in _split_branches[1:]])
+                self.n_forks += len(_split_branches) - 1
+            _branches.extend(_split_branches)
+
+        for branch in _branches:
+            _leader = branch[0]
+            _leader.building_model.do_step(
+                t_start=_t_start,
+                t_step=self.step_size_seconds,
+                step_control_input=_leader.controller_model.step_output,
+                step_sensor_input=_leader.step_inputs.sensors.step(i),
+                step_weather_input=_leader.step_inputs.weather.step(i),
+            )
+        self.branches = _branches
+
+    def finalize(self):
+        """Copy building and state estimator model state of each leader to
+        the other simulations of its branch so that each simulation can be
+        finalized independently."""
+        for branch in self.branches:
+            if len(branch) > 1:
+                self.copy_state(branch[0], branch[1:])
+
+        for sim in self.simulations:
+            sim.finalize()
+
+    def run(self):
+        """Fork sweep co-simulation loop"""
+        logger.info(f"Initializing {len(self.simulations)} fork sweep simulations")
+        self.initialize()
+
+        _sim_start_wall_time = time.perf_counter()
+        _sim_start_proc_time = time.process_time()
+
+        for i in trange(self.n_steps, desc="Fork sweep co-simulation steps"):
+            self.step(i)
+
+        logger.info(
+            f"Finished fork sweep co-simulation with {self.n_forks} forks "
+            + f"into {len(self.branches)} branches\n"
+            + f"Elapsed time: {time.perf_counter() - _sim_start_wall_time} seconds\n"
+            + f"Process time: {time.process_time() - _sim_start_proc_time} seconds"
+        )
+
+        self.finalize()
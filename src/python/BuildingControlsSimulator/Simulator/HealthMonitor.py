@@ -0,0 +1,104 @@
+import logging
+
+import attr
+import numpy as np
+
+from BuildingControlsSimulator.DataClients.DataStates import STATES
+
+logger = logging.getLogger(__name__)
+
+
+class SimulationHealthError(ValueError):
+    """Simulation aborted by its HealthMonitor."""
+
+    pass
+
+
+@attr.s(kw_only=True)
+class HealthMonitor:
+    """Counts unhealthy steps of a running Simulation and aborts it early.
+
+    Every check_steps steps the output of the building model since the
+    previous check is checked for failed model steps, e.g. FMU do_step
+    status, NaN thermostat temperatures, and temperatures outside of
+    [min_temperature, max_temperature]. Models may report further counters,
+    e.g. conflicting actuation, see BuildingModel.get_health_counters.
+
+    Problems are counted instead of logged per step. The abort policy is the
+    max count of each counter, a simulation is aborted with a
+    SimulationHealthError when a count exceeds its max. Counters with a max
+    of None never abort.
+    """
+
+    check_steps = attr.ib(default=288)
+    min_temperature = attr.ib(default=-40.0)
+    max_temperature = attr.ib(default=70.0)
+    max_counts = attr.ib()
+    counters = attr.ib(factory=dict)
+    # index of next step to be checked
+    checked_idx = attr.ib(default=0)
+
+    @max_counts.default
+    def get_default_max_counts(self):
+        return {
+            "failed_steps": 0,
+            "nan_temperature_steps": 0,
+            "implausible_temperature_steps": 0,
+            "conflicting_actuations": None,
+        }
+
+    def copy(self):
+        """HealthMonitor with the same policy and reset counters."""
+        return attr.evolve(self, counters={}, checked_idx=0)
+
+    def reset(self, start_idx=0):
+        self.counters = {}
+        self.checked_idx = start_idx
+
+    def check(self, building_model, end_idx):
+        """Update counters with steps [checked_idx, end_idx) of building_model
+        output and apply abort policy."""
+        _start_idx = self.checked_idx
+        if end_idx > _start_idx:
+            _counts = {}
+            _failed = building_model.get_failed_steps(_start_idx, end_idx)
+            if _failed is not None:
+                _counts["failed_steps"] = int(np.count_nonzero(_failed))
+
+            _temperature = building_model.output[STATES.THERMOSTAT_TEMPERATURE][
+                _start_idx:end_idx
+            ]
+            _nan = np.isnan(_temperature)
+            _counts["nan_temperature_steps"] = int(np.count_nonzero(_nan))
+            _counts["implausible_temperature_steps"] = int(
+                np.count_nonzero(
+                    ~_nan
+                    & (
+                        (_temperature < self.min_temperature)
+                        | (_temperature > self.max_temperature)
+                    )
+                )
+            )
+            for _name, _count in _counts.items():
+                self.counters[_name] = self.counters.get(_name, 0) + _count
+            self.checked_idx = end_idx
+
+        # model counters are totals since model initialization
+        self.counters.update(building_model.get_health_counters())
+
+        _exceeded = {
+            _name: _count
+            for _name, _count in self.counters.items()
+            if self.max_counts.get(_name) is not None
+            and _count > self.max_counts[_name]
+        }
+        if _exceeded:
+            raise SimulationHealthError(
+                f"Simulation unhealthy after {self.checked_idx} steps, counts "
+                + f"exceeding max_counts: {_exceeded}. Counters: {self.counters}"
+            )
+
+    def log_summary(self, sim_name):
+        _nonzero = {k: v for k, v in self.counters.items() if v}
+        if _nonzero:
+            logger.warning(f"Simulation {sim_name} health counters: {_nonzero}")
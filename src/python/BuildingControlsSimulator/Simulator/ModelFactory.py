@@ -0,0 +1,54 @@
+import logging
+import copy
+
+import attr
+import pandas as pd
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@attr.s(kw_only=True)
+class ModelFactory:
+    """Lightweight recipe for building a model when its simulation is scheduled.
+
+    The model is built as `model_class(**kwargs)`. kwargs values that are
+    themselves a ModelFactory are built recursively so that stateful
+    sub-objects (e.g. an IDFPreprocessor) are never shared between simulations.
+
+    Example:
+        ModelFactory(
+            model_class=EnergyPlusBuildingModel,
+            kwargs={
+                "idf": ModelFactory(
+                    model_class=IDFPreprocessor,
+                    kwargs={"idf_file": "Furnace.idf"},
+                ),
+                "step_size_seconds": 300,
+            },
+        )
+
+    Model instances given in place of a factory are wrapped as a prototype
+    that is deep copied on build.
+    """
+
+    model_class = attr.ib(default=None)
+    kwargs = attr.ib(factory=dict)
+    prototype = attr.ib(default=None)
+
+    @staticmethod
+    def from_model(model):
+        if isinstance(model, ModelFactory):
+            return model
+        return ModelFactory(prototype=model)
+
+    def build(self):
+        if self.prototype is not None:
+            return copy.deepcopy(self.prototype)
+
+        return self.model_class(
+            **{
+                k: v.build() if isinstance(v, ModelFactory) else v
+                for k, v in self.kwargs.items()
+            }
+        )
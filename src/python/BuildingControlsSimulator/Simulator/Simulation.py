@@ -10,7 +10,21 @@ import attr
 from tqdm import trange
 
 from BuildingControlsSimulator.DataClients.DataStates import STATES
+from BuildingControlsSimulator.Conversions.Conversions import Conversions
+from BuildingControlsSimulator.DataClients.StepInputs import (
+    StepInputs,
+    StepInputColumns,
+)
+from BuildingControlsSimulator.DataClients.DataClient import DataClient
+from BuildingControlsSimulator.DataClients.PerfectWeatherForecast import (
+    PerfectWeatherForecast,
+)
 from BuildingControlsSimulator.OutputAnalysis.OutputAnalysis import OutputAnalysis
+from BuildingControlsSimulator.Simulator.WarmStartSnapshot import WarmStartSnapshot
+from BuildingControlsSimulator.Simulator.SimulationCheckpoint import (
+    SimulationCheckpoint,
+)
+from BuildingControlsSimulator.Simulator.StateBus import StateBus
 
 logger = logging.getLogger(__name__)
 
@@ -29,6 +43,49 @@ class Simulation:
     end_utc = attr.ib(default=None)
     output = attr.ib(default=None)
     full_input = attr.ib(default=None)
+    step_inputs = attr.ib(default=None)
+    weather_forecast = attr.ib(default=None)
+    forecast_horizon_steps = attr.ib(default=0)
+    # if set, output is assembled and stored every output_chunk_steps steps
+    # instead of all at once at the end of the simulation, see flush_output.
+    # This bounds the memory of output DataFrames, model output arrays are
+    # still allocated for all steps. The stored output is not kept in
+    # self.output.
+    output_chunk_steps = attr.ib(default=None)
+    output_stream = attr.ib(default=None)
+    output_flushed_idx = attr.ib(default=0)
+    output_datetimes_ns = attr.ib(default=None)
+    # opt-in per component timing of simulation steps, see StepTimer
+    step_timer = attr.ib(default=None)
+    # WarmStartSnapshot restored instead of simulating the warm-up period
+    warm_start = attr.ib(default=None)
+    # capture WarmStartSnapshot at end of warm-up period as warm_start_snapshot
+    capture_warm_start = attr.ib(default=False)
+    warm_start_snapshot = attr.ib(default=None)
+    # write SimulationCheckpoint to checkpoint_dir every checkpoint_steps steps
+    # and resume from it, sim_run_identifier must be the same to resume
+    checkpoint_dir = attr.ib(default=None)
+    checkpoint_steps = attr.ib(default=None)
+    # states exchanged between models during run are read and written on a
+    # shared StateBus by models that support it instead of step_output dicts
+    use_state_bus = attr.ib(default=True)
+    state_bus = attr.ib(default=None)
+    state_bus_models = attr.ib(factory=list)
+    state_bus_views = attr.ib(factory=dict)
+    # store output with the data client destination in finalize, disabled for
+    # simulations of a TimeChunk whose output is stored once stitched
+    store_output = attr.ib(default=True)
+    # open-loop replay: drive the building model with the recorded equipment
+    # runtimes of the data client, controller and state estimator models are
+    # not stepped, see run_replay
+    replay = attr.ib(default=False)
+    # check building model output every health_monitor.check_steps steps and
+    # abort unhealthy simulations early, see HealthMonitor
+    health_monitor = attr.ib(default=None)
+    # step the controller model only every discretization_size_seconds and
+    # hold its output in between, see get_controller_steps
+    multi_rate = attr.ib(default=True)
+    controller_steps = attr.ib(default=None)
 
     def __attrs_post_init__(self):
         """validate input/output specs
@@ -90,6 +147,16 @@ class Simulation:
                 f"Missing building model output keys: {missing_building_output_keys}\n",
             )
 
+        if self.use_state_bus:
+            self.state_bus = StateBus.from_models(
+                models=[
+                    self.state_estimator_model,
+                    self.controller_model,
+                    self.building_model,
+                ],
+                data_spec=self.data_client.internal_spec,
+            )
+
     @property
     def step_size_seconds(self):
         return int(self.config["sim_step_size_seconds"])
@@ -149,6 +216,8 @@ class Simulation:
                 _controller_model_name,
             ]
         )
+        if "chunk_idx" in self.config:
+            _sim_name += f"_chunk_{self.config['chunk_idx']}"
         # safely remove any errant . characters breaking extension handling
         _sim_name.replace(".", "_")
         return _sim_name
@@ -164,6 +233,17 @@ class Simulation:
                 preprocess_check=preprocess_check,
             )
 
+    def set_scratch_dir(self, scratch_dir):
+        """Write generated simulation files (EPWs, FMUs, preprocessed IDFs)
+        to scratch_dir, e.g. a directory owned by a single worker process."""
+        self.data_client.simulation_epw_dir = os.path.join(scratch_dir, "epw")
+        os.makedirs(self.data_client.simulation_epw_dir, exist_ok=True)
+        if self.data_client.weather:
+            self.data_client.weather.simulation_epw_dir = (
+                self.data_client.simulation_epw_dir
+            )
+        self.building_model.set_scratch_dir(scratch_dir)
+
     def initialize(self, data_spec):
         """initialize sub-system models and memory for simulation"""
         # get simulation time from data client
@@ -176,6 +256,9 @@ class Simulation:
         if not self.end_utc:
             raise ValueError("end_utc is None.")
 
+        # extract channel data into column arrays once before the main loop
+        self.step_inputs = StepInputs.from_data_client(self.data_client)
+
         self.state_estimator_model.initialize(
             start_utc=self.start_utc,
             t_start=self.start_time_seconds,
@@ -191,6 +274,14 @@ class Simulation:
             init=True,
             time_utc=None,
         )
+        # settings change points are indexed by simulation step once so that
+        # per step settings updates only occur on steps with a settings event
+        self.controller_model.compile_settings_timeline(
+            change_points_schedule=self.data_client.thermostat.change_points_schedule,
+            change_points_comfort_prefs=self.data_client.thermostat.change_points_comfort_prefs,
+            change_points_hvac_mode=self.data_client.thermostat.change_points_hvac_mode,
+            step_datetimes=self.step_inputs.datetime.columns[STATES.DATE_TIME],
+        )
 
         self.controller_model.initialize(
             start_utc=self.start_utc,
@@ -210,17 +301,240 @@ class Simulation:
             categories_dict=self.data_client.thermostat.get_categories_dict(),
         )
 
+        self.initialize_weather_forecast()
+
         self.allocate_memory()
 
+        if self.step_timer:
+            self.building_model.set_step_timer(self.step_timer)
+
+        if self.output_chunk_steps:
+            self.initialize_output_stream()
+
+    def initialize_weather_forecast(self):
+        """Cache max forecast horizon and build perfect forecast block once."""
+        self.forecast_horizon_steps = PerfectWeatherForecast.get_max_horizon_steps(
+            self.controller_model
+        )
+        if self.data_client.weather.weather_forecast_source == "perfect":
+            # perfect weather forecast windows are views into one block
+            # this saves significant RAM and per step copies
+            self.weather_forecast = PerfectWeatherForecast.from_dataframe(
+                df=self.data_client.weather.data,
+                horizon_steps=self.forecast_horizon_steps,
+            )
+
     def allocate_memory(self):
         """Allocate memory for simulation output"""
         self.output = {}
 
+    def initialize_output_stream(self):
+        # resampling chunks aligned to output steps is only equivalent to
+        # resampling the whole output when steps are aggregated
+        if (
+            self.output_step_size_seconds < self.step_size_seconds
+            or self.output_step_size_seconds % self.step_size_seconds
+        ):
+            raise ValueError(
+                "Streaming output requires output_step_size_seconds to be a "
+                + "multiple of sim_step_size_seconds, got: "
+                + f"{self.output_step_size_seconds} and {self.step_size_seconds}"
+            )
+
+        self.output_datetimes_ns = (
+            self.data_client.datetime.data[STATES.DATE_TIME]
+            .to_numpy(dtype="datetime64[ns]")
+            .view("int64")
+        )
+        self.output_flushed_idx = 0
+        self.output_stream = self.data_client.open_output_stream(
+            sim_name=self.sim_name,
+            src_spec=self.data_client.internal_spec,
+        )
+
+    def get_warmup_steps(self):
+        """Number of steps before the simulation period of the sim_config,
+        see DataClient.eplus_day_fill_simulation_time."""
+        _sim_start_utc = self.data_client.sim_config["start_utc"]
+        if self.data_client.full_data_periods:
+            _sim_start_utc = max(
+                _sim_start_utc, self.data_client.full_data_periods[0][0]
+            )
+
+        return int(
+            pd.DatetimeIndex(
+                self.step_inputs.datetime.columns[STATES.DATE_TIME]
+            ).searchsorted(_sim_start_utc)
+        )
+
+    def get_warm_start_snapshot(self, warmup_steps):
+        """Snapshot of model state after warmup_steps steps, or None if the
+        building model does not support state snapshots."""
+        self.write_state_bus_output()
+        _building_model_state = self.building_model.get_state_snapshot()
+        if _building_model_state is None:
+            return None
+
+        return WarmStartSnapshot(
+            warmup_steps=warmup_steps,
+            building_model_state=_building_model_state,
+            state_estimator_model_state=self.state_estimator_model.get_state_snapshot(),
+            controller_model_name=self.controller_model.get_model_name(),
+            controller_model_state=self.controller_model.get_state_snapshot(),
+        )
+
+    def is_warm_start_controller(self, warm_start):
+        """True if warm_start was captured with the same controller model."""
+        _model_name = self.controller_model.get_model_name()
+        return (
+            _model_name is not None
+            and warm_start.controller_model_state is not None
+            and warm_start.controller_model_name == _model_name
+        )
+
+    def restore_warm_start(self, warm_start):
+        """Restore models to the end of the warm-up period.
+
+        :return: index of first step to simulate
+        """
+        logger.info(f"Warm start from step: {warm_start.warmup_steps}")
+        self.building_model.set_state_snapshot(warm_start.building_model_state)
+        self.state_estimator_model.set_state_snapshot(
+            warm_start.state_estimator_model_state
+        )
+
+        if self.is_warm_start_controller(warm_start):
+            self.controller_model.set_state_snapshot(
+                warm_start.controller_model_state
+            )
+            return warm_start.warmup_steps
+
+        # controller starts at end of warm-up with settings up to that step
+        self.controller_model.current_t_idx = warm_start.warmup_steps
+        for _t_idx in np.sort(self.controller_model.settings_timeline.event_steps):
+            if _t_idx < warm_start.warmup_steps:
+                self.controller_model.update_settings(t_idx=int(_t_idx))
+
+        return warm_start.warmup_steps
+
+    @property
+    def checkpoint_fpath(self):
+        return SimulationCheckpoint.get_fpath(self.checkpoint_dir, self.sim_name)
+
+    def get_checkpoint_fingerprint(self):
+        """Simulation time and models of the checkpoints of this simulation."""
+        return {
+            "start_utc": self.start_utc,
+            "end_utc": self.end_utc,
+            "step_size_seconds": self.step_size_seconds,
+            "n_steps": len(self.get_sim_time()),
+            "building_model_name": self.building_model.get_model_name(),
+            "controller_model_name": self.controller_model.get_model_name(),
+            "state_estimator_model_name": self.state_estimator_model.get_model_name(),
+        }
+
+    def save_checkpoint(self, t_idx):
+        """Checkpoint state after t_idx steps. Checkpoints are disabled if the
+        building model does not support state snapshots."""
+        self.write_state_bus_output()
+        _building_model_state = self.building_model.get_state_snapshot()
+        if _building_model_state is None:
+            logger.warning(
+                "Building model does not support state snapshots, "
+                + f"checkpoints are disabled for: {self.sim_name}"
+            )
+            self.checkpoint_steps = None
+            return
+
+        SimulationCheckpoint(
+            t_idx=t_idx,
+            fingerprint=self.get_checkpoint_fingerprint(),
+            building_model_state=_building_model_state,
+            controller_model_state=self.controller_model.get_state_snapshot(),
+            state_estimator_model_state=self.state_estimator_model.get_state_snapshot(),
+        ).save(self.checkpoint_fpath)
+
+    def restore_checkpoint(self, checkpoint):
+        """Restore models from checkpoint.
+
+        :return: index of first step to simulate
+        """
+        _fingerprint = self.get_checkpoint_fingerprint()
+        if checkpoint.fingerprint != _fingerprint:
+            raise ValueError(
+                f"Checkpoint {self.checkpoint_fpath} does not match simulation: "
+                + f"{self.sim_name}. Checkpoint: {checkpoint.fingerprint}, "
+                + f"simulation: {_fingerprint}. Remove the checkpoint to "
+                + "restart the simulation."
+            )
+
+        logger.info(f"Resuming {self.sim_name} from step: {checkpoint.t_idx}")
+        self.building_model.set_state_snapshot(checkpoint.building_model_state)
+        self.controller_model.set_state_snapshot(checkpoint.controller_model_state)
+        self.state_estimator_model.set_state_snapshot(
+            checkpoint.state_estimator_model_state
+        )
+        return checkpoint.t_idx
+
+    def attach_state_bus(self, n_steps, start_idx):
+        """Bind models that support it to state_bus, seeded with the current
+        step_output of all models. The bus is only used during run, models
+        of lockstep simulations are stepped by BatchSimulation."""
+        self.state_bus.allocate(n_steps=n_steps, start_idx=start_idx)
+        self.state_bus_models = []
+        self.state_bus_views = {}
+        for model in [
+            self.state_estimator_model,
+            self.controller_model,
+            self.building_model,
+        ]:
+            self.state_bus.set_values(model.step_output)
+            if model.set_state_bus(self.state_bus):
+                self.state_bus_models.append(model)
+                self.state_bus_views[id(model)] = self.state_bus.get_view(
+                    model.output_states
+                )
+
+        if not self.state_bus_models:
+            logger.info("No models support the state bus, passing step_output.")
+
+    def detach_state_bus(self):
+        """Write recorded states to model output memory and unbind models."""
+        self.write_state_bus_output()
+        for model in self.state_bus_models:
+            model.set_state_bus(None)
+        self.state_bus_models = []
+        self.state_bus_views = {}
+
+    def write_state_bus_output(self):
+        if self.state_bus_models:
+            self.state_bus.write_output(self.state_bus_models)
+
+    def get_step_output(self, model):
+        """Outputs of model passed to the next model: a view of the state bus
+        if model writes to the bus, otherwise its step_output."""
+        return self.state_bus_views.get(id(model), model.step_output)
+
+    def put_step_output(self, model):
+        """Compatibility shim copying step_output of a model that does not
+        support the state bus into the bus for bus-aware models."""
+        if self.state_bus_models and id(model) not in self.state_bus_views:
+            self.state_bus.set_values(model.step_output)
+
     def tear_down(self):
         logger.info("Tearing down co-simulation models")
         self.building_model.tear_down()
         self.controller_model.tear_down()
 
+    def get_sim_time(self):
+        """Simulation time in seconds of each step."""
+        return np.arange(
+            self.start_time_seconds,
+            self.final_time_seconds + self.step_size_seconds,
+            self.step_size_seconds,
+            dtype="int64",
+        )
+
     def run(self, local=True):
         """Main co-simulation loop"""
         logger.info("Initializing co-simulation models")
@@ -231,45 +545,234 @@ class Simulation:
         )
         _sim_start_wall_time = time.perf_counter()
         _sim_start_proc_time = time.process_time()
-        _sim_time = np.arange(
-            self.start_time_seconds,
-            self.final_time_seconds + self.step_size_seconds,
-            self.step_size_seconds,
-            dtype="int64",
+        _sim_time = self.get_sim_time()
+
+        _start_idx = 0
+        _warmup_steps = None
+        _checkpoint = None
+        # the controller has output before the first step if restored
+        _controller_restored = False
+        if self.checkpoint_dir:
+            os.makedirs(self.checkpoint_dir, exist_ok=True)
+            _checkpoint = SimulationCheckpoint.load(self.checkpoint_fpath)
+
+        if _checkpoint:
+            _start_idx = self.restore_checkpoint(_checkpoint)
+            _controller_restored = True
+        elif self.warm_start:
+            _start_idx = self.restore_warm_start(self.warm_start)
+            _controller_restored = self.is_warm_start_controller(self.warm_start)
+
+        if self.capture_warm_start and not self.warm_start:
+            _warmup_steps = self.get_warmup_steps()
+
+        if self.state_bus and not self.replay:
+            self.attach_state_bus(n_steps=len(_sim_time), start_idx=_start_idx)
+
+        if self.health_monitor:
+            self.health_monitor.reset(start_idx=_start_idx)
+
+        self.controller_steps = self.get_controller_steps(
+            n_steps=len(_sim_time), first_idx=0 if _controller_restored else _start_idx
         )
 
         # main loop using optimzied tqdm iteration
-        for i in trange(len(_sim_time), desc="Co-simulation steps"):
-            self.state_estimator_model.do_step(
-                t_start=_sim_time[i],
-                t_step=self.step_size_seconds,
-                step_sensor_input=self.building_model.step_output,
-            )
+        try:
+            if self.replay:
+                self.run_replay(_sim_time, _start_idx, _warmup_steps)
+            else:
+                for i in trange(
+                    _start_idx, len(_sim_time), desc="Co-simulation steps"
+                ):
+                    if i == _warmup_steps:
+                        self.warm_start_snapshot = self.get_warm_start_snapshot(i)
+                    self.step(i=i, t_start=_sim_time[i])
+                    if self.output_stream and (i + 1) % self.output_chunk_steps == 0:
+                        self.flush_output(i)
+                    # unhealthy state is not checkpointed
+                    if (
+                        self.health_monitor
+                        and (i + 1) % self.health_monitor.check_steps == 0
+                    ):
+                        self.check_health(i + 1)
+                    if self.checkpoint_steps and (i + 1) % self.checkpoint_steps == 0:
+                        self.save_checkpoint(i + 1)
+            if self.health_monitor:
+                self.check_health(len(_sim_time))
+        except Exception:
+            self.detach_state_bus()
+            if self.output_stream:
+                self.output_stream.abort()
+            raise
+
+        if self.health_monitor:
+            self.health_monitor.log_summary(self.sim_name)
 
-            self.controller_model.update_settings(
-                change_points_schedule=self.data_client.thermostat.change_points_schedule,
-                change_points_comfort_prefs=self.data_client.thermostat.change_points_comfort_prefs,
-                change_points_hvac_mode=self.data_client.thermostat.change_points_hvac_mode,
-                time_utc=self.data_client.datetime.data.iloc[i][STATES.DATE_TIME],
+        logger.info(
+            "Finished co-simulation\n"
+            + f"Elapsed time: {time.perf_counter() - _sim_start_wall_time} seconds\n"
+            + f"Process time: {time.process_time() - _sim_start_proc_time} seconds"
+        )
+
+        self.finalize()
+        if self.checkpoint_dir and os.path.exists(self.checkpoint_fpath):
+            os.remove(self.checkpoint_fpath)
+
+    def get_controller_steps(self, n_steps, first_idx):
+        """Mask of steps on which the controller model is stepped, or None if
+        it is stepped on every step.
+
+        Controller steps are spaced by its discretization_size_seconds and the
+        controller holds its output on the steps in between. A controller
+        without prior output is stepped on first_idx.
+        """
+        if not self.multi_rate:
+            return None
+
+        _interval = self.controller_model.get_step_interval(self.step_size_seconds)
+        if _interval == 1:
+            return None
+
+        if self.controller_model.discretization_size_seconds % self.step_size_seconds:
+            logger.warning(
+                "Controller discretization_size_seconds: "
+                + f"{self.controller_model.discretization_size_seconds} is not a "
+                + f"multiple of step size: {self.step_size_seconds}, controller "
+                + f"is stepped every {_interval} steps."
             )
+        _controller_steps = np.arange(n_steps) % _interval == 0
+        if first_idx < n_steps:
+            _controller_steps[first_idx] = True
+        return _controller_steps
+
+    def check_health(self, end_idx):
+        """Check building model output of steps before end_idx, raises
+        SimulationHealthError to abort an unhealthy simulation."""
+        self.write_state_bus_output()
+        self.health_monitor.check(self.building_model, end_idx)
+
+    def get_replay_control_input(self):
+        """Recorded equipment runtimes of the building model input states as
+        float64 column arrays of all steps, missing runtimes are 0."""
+        _equipment = self.data_client.equipment.data
+        _n_steps = len(self.data_client.datetime.data)
+        return StepInputColumns(
+            columns={
+                state: _equipment[state].to_numpy(dtype="float64", na_value=0.0)
+                if state in _equipment.columns
+                else np.zeros(_n_steps, dtype="float64")
+                for state in self.building_model.input_states
+            },
+            n_steps=_n_steps,
+        )
 
-            self.controller_model.do_step(
-                t_start=_sim_time[i],
+    def run_replay(self, sim_time, start_idx, warmup_steps=None):
+        """Open-loop replay of steps [start_idx, len(sim_time)).
+
+        The building model is driven by the recorded runtimes as a
+        precomputed control input trajectory in blocks of steps, blocks end
+        at the steps where output is flushed, checkpoints are saved, and the
+        warm start snapshot is captured. The recorded runtimes are written to
+        the controller output.
+        """
+        _control_input = self.get_replay_control_input()
+        for state in self.controller_model.output_states:
+            if state in _control_input.columns:
+                self.controller_model.output[state][:] = _control_input.columns[
+                    state
+                ]
+
+        _block_ends = {len(sim_time)}
+        if warmup_steps is not None:
+            _block_ends.add(warmup_steps)
+        for _steps in [
+            self.output_chunk_steps if self.output_stream else None,
+            self.checkpoint_steps,
+            self.health_monitor.check_steps if self.health_monitor else None,
+        ]:
+            if _steps:
+                _block_ends.update(range(_steps, len(sim_time), _steps))
+
+        _start_idx = start_idx
+        for _end_idx in sorted(i for i in _block_ends if i > start_idx):
+            if _start_idx == warmup_steps:
+                self.warm_start_snapshot = self.get_warm_start_snapshot(_start_idx)
+            self.building_model.do_replay(
+                sim_time=sim_time,
                 t_step=self.step_size_seconds,
-                step_thermostat_input=self.data_client.thermostat.data.iloc[i],
-                step_sensor_input=self.state_estimator_model.step_output,
-                step_weather_input=self.data_client.weather.data.iloc[i],
-                step_weather_forecast_input=self.get_step_weather_forecast(i),
+                control_input=_control_input,
+                sensor_input=self.step_inputs.sensors,
+                weather_input=self.step_inputs.weather,
+                start_idx=_start_idx,
+                end_idx=_end_idx,
             )
+            if self.output_stream and _end_idx % self.output_chunk_steps == 0:
+                self.flush_output(_end_idx - 1)
+            if self.health_monitor:
+                self.check_health(_end_idx)
+            if self.checkpoint_steps and _end_idx % self.checkpoint_steps == 0:
+                self.save_checkpoint(_end_idx)
+            _start_idx = _end_idx
+
+    def step(self, i, t_start):
+        """Advance all co-simulation models by one time step."""
+        _timer = self.step_timer
+        if _timer:
+            _t_ns = time.perf_counter_ns()
+
+        self.state_estimator_model.do_step(
+            t_start=t_start,
+            t_step=self.step_size_seconds,
+            step_sensor_input=self.get_step_output(self.building_model),
+        )
+        self.put_step_output(self.state_estimator_model)
+        if _timer:
+            _t_ns = _timer.lap("state_estimator", _t_ns)
 
-            self.building_model.do_step(
-                t_start=_sim_time[i],
+        self.controller_model.update_settings(t_idx=i)
+        if _timer:
+            _t_ns = _timer.lap("update_settings", _t_ns)
+
+        # step inputs are cheap views into pre-extracted column arrays
+        _step_weather_input = self.step_inputs.weather.step(i)
+        if self.controller_steps is None or self.controller_steps[i]:
+            _step_weather_forecast_input = self.get_step_weather_forecast(i)
+            if _timer:
+                _t_ns = _timer.lap("weather_forecast", _t_ns)
+
+            self.controller_model.do_step(
+                t_start=t_start,
                 t_step=self.step_size_seconds,
-                step_control_input=self.controller_model.step_output,
-                step_sensor_input=self.data_client.sensors.data.iloc[i],
-                step_weather_input=self.data_client.weather.data.iloc[i],
+                step_thermostat_input=self.step_inputs.thermostat.step(i),
+                step_sensor_input=self.get_step_output(self.state_estimator_model),
+                step_weather_input=_step_weather_input,
+                step_weather_forecast_input=_step_weather_forecast_input,
             )
+            self.put_step_output(self.controller_model)
+        else:
+            self.controller_model.hold_step(
+                t_start=t_start, t_step=self.step_size_seconds
+            )
+        if _timer:
+            _t_ns = _timer.lap("controller", _t_ns)
 
+        self.building_model.do_step(
+            t_start=t_start,
+            t_step=self.step_size_seconds,
+            step_control_input=self.get_step_output(self.controller_model),
+            step_sensor_input=self.step_inputs.sensors.step(i),
+            step_weather_input=_step_weather_input,
+        )
+        if self.state_bus_models:
+            self.put_step_output(self.building_model)
+            # recording all model outputs of a step is a single row copy
+            self.state_bus.record_step(i)
+        if _timer:
+            _timer.lap("building", _t_ns)
+
+    def finalize(self):
+        """Tear down models, then assemble and store simulation output."""
+        self.detach_state_bus()
         # t_ctrl output is time-shifted to make runtime integral over preceeding timestep
         # final timestep controller output will be repeated
         # TODO: recompute t_ctrl given final state
@@ -277,53 +780,147 @@ class Simulation:
             0:-1
         ] = self.controller_model.output[STATES.TEMPERATURE_CTRL][1:]
 
-        logger.info(
-            "Finished co-simulation\n"
-            + f"Elapsed time: {time.perf_counter() - _sim_start_wall_time} seconds\n"
-            + f"Process time: {time.process_time() - _sim_start_proc_time} seconds"
-        )
-
         self.tear_down()
 
-        # convert output to dataframe
-        logger.info("converting output")
-        self.output = pd.DataFrame.from_dict(
+        if self.step_timer:
+            _t_ns = time.perf_counter_ns()
+
+        self.full_input = self.data_client.get_full_input()
+
+        if self.output_stream:
+            # write remaining steps and finish output file
+            self.output_stream.write(
+                self.process_output_chunk(
+                    self.get_output_chunk(
+                        self.output_flushed_idx,
+                        len(self.output_datetimes_ns),
+                    )
+                )
+            )
+            self.output_stream.close()
+            self.output_stream = None
+        else:
+            # convert output to dataframe
+            logger.info("converting output")
+            self.output = self.process_output_chunk(
+                self.get_output_chunk(0, len(self.data_client.datetime.data))
+            )
+
+            # save output
+            if self.store_output:
+                logger.info("saving output")
+                self.data_client.store_output(
+                    output=self.output,
+                    sim_name=self.sim_name,
+                    src_spec=self.data_client.internal_spec,
+                )
+
+        if self.step_timer:
+            self.step_timer.lap("output", _t_ns)
+            logger.info(
+                "Simulation step timing:\n"
+                + self.step_timer.get_summary_dataframe().to_string()
+            )
+
+        logger.info("simulation complete.")
+
+    def get_output_chunk(self, start_idx, end_idx, shift_t_ctrl=False):
+        """Model output of steps [start_idx, end_idx) as a DataFrame.
+
+        :param shift_t_ctrl: apply the t_ctrl time-shift of finalize for steps
+        before it is applied to the whole output array
+        """
+
+        def _get_columns(model):
+            # categorical output is recorded as integer codes
+            return {
+                k: Conversions.codes_to_categorical(
+                    v[start_idx:end_idx], model.output_categories[k]
+                )
+                if k in model.output_categories
+                else v[start_idx:end_idx]
+                for k, v in model.output.items()
+            }
+
+        _df = pd.DataFrame.from_dict(
             {
-                STATES.DATE_TIME: self.data_client.datetime.data[STATES.DATE_TIME].copy(
-                    deep=True
-                ),
-                **self.controller_model.output,
-                **self.building_model.output,
+                STATES.DATE_TIME: self.data_client.datetime.data[
+                    STATES.DATE_TIME
+                ].array[start_idx:end_idx],
+                **_get_columns(self.controller_model),
+                **_get_columns(self.building_model),
             }
         )
+        if shift_t_ctrl:
+            _df[STATES.TEMPERATURE_CTRL] = self.controller_model.output[
+                STATES.TEMPERATURE_CTRL
+            ][start_idx + 1 : end_idx + 1]
 
+        return _df
+
+    def process_output_chunk(self, df):
+        """Resample output to output step size and keep only records within
+        data periods."""
         # resample output time steps to output step size frequency
-        self.output = self.data_client.resample_to_step_size(
-            df=self.output,
-            step_size_seconds=self.output_step_size_seconds,
-            data_spec=self.data_client.internal_spec,
+        if self.output_step_size_seconds > self.step_size_seconds:
+            # output steps are uniform so that bins follow from timestamps
+            df = DataClient.downsample_arrays_to_step_size(
+                df=df,
+                step_size_seconds=self.output_step_size_seconds,
+                data_spec=self.data_client.internal_spec,
+            )
+        else:
+            df = self.data_client.resample_to_step_size(
+                df=df,
+                step_size_seconds=self.output_step_size_seconds,
+                data_spec=self.data_client.internal_spec,
+            )
+
+        # only consider data within data periods as output
+        _mask = DataClient.get_periods_mask(
+            df[STATES.DATE_TIME], self.data_client.full_data_periods
         )
+        return df[_mask].reset_index(drop=True)
 
-        self.full_input = self.data_client.get_full_input()
+    def flush_output(self, i):
+        """Store output of completed steps before step i that fill whole
+        output steps.
 
-        # create initial mask against index (should be all False)
-        _mask = self.output[STATES.DATE_TIME].isnull()
-        # only consider data within data periods as output
-        for dp_start, dp_end in self.data_client.full_data_periods:
-            _mask = _mask | (self.output[STATES.DATE_TIME] >= dp_start) & (
-                self.output[STATES.DATE_TIME] < dp_end
-            )
+        The t_ctrl of a step is only known after the next step, and resampling
+        requires at least 2 records per chunk, so at least the final 2 steps
+        are always left for finalize.
+        """
+        _output_step_ns = self.output_step_size_seconds * 10 ** 9
+        # resample bins start at midnight of first day
+        _origin_ns = self.output_datetimes_ns[0] - (
+            self.output_datetimes_ns[0] % (86400 * 10 ** 9)
+        )
+        # the output step of the last record that may be flushed is not
+        # complete, chunks end at its start
+        _last_idx = min(i, len(self.output_datetimes_ns) - 2)
+        _boundary_ns = self.output_datetimes_ns[_last_idx] - (
+            (self.output_datetimes_ns[_last_idx] - _origin_ns) % _output_step_ns
+        )
+        _end_idx = int(np.searchsorted(self.output_datetimes_ns, _boundary_ns))
+        if _end_idx - self.output_flushed_idx < 2:
+            return
 
-        self.output = self.output[_mask].reset_index(drop=True)
+        self.write_state_bus_output()
 
-        # save output
-        logger.info("saving output")
-        self.data_client.store_output(
-            output=self.output,
-            sim_name=self.sim_name,
-            src_spec=self.data_client.internal_spec,
+        if self.step_timer:
+            _t_ns = time.perf_counter_ns()
+
+        self.output_stream.write(
+            self.process_output_chunk(
+                self.get_output_chunk(
+                    self.output_flushed_idx, _end_idx, shift_t_ctrl=True
+                )
+            )
         )
-        logger.info("simulation complete.")
+        self.output_flushed_idx = _end_idx
+
+        if self.step_timer:
+            self.step_timer.lap("output", _t_ns)
 
     def show_plots(self):
         output_analysis = OutputAnalysis(df=self.output_df)
@@ -332,35 +929,15 @@ class Simulation:
     def get_step_weather_forecast(self, i):
         """
         Do 1) OR 2)
-        1) generate perfect weather forecasts on-the-fly
+        1) return perfect weather forecast window view for step
         2) prepend historic weather to external forecast to allow for lagged
         feature calculation
         """
         if self.data_client.weather.weather_forecast_source == "perfect":
-            # perfect weather forecast can be generated on the fly
-            # this saves significant RAM
-            _max_horizon = 0
-            if hasattr(self.controller_model, "controllers"):
-                # if the controller_model is an ensemble model iterate through
-                # each model and take max horizon for generating forecast data
-                _max_horizon = max(
-                    [
-                        _c.horizon_steps if hasattr(_c, "horizon_steps") else 0
-                        for _c in self.controller_model.controllers
-                    ]
-                )
-            elif hasattr(self.controller_model, "horizon_steps"):
-                _max_horizon = self.controller_model.horizon_steps
-
-            _step_forecast = self.data_client.weather.data[i : (i + _max_horizon)]
-
-            # forward project last record at end of simulation when data runs out
-            if len(_step_forecast) < _max_horizon:
-                _step_forecast = pd.concat(
-                    [_step_forecast]
-                    + [_step_forecast.tail(1)] * (_max_horizon - len(_step_forecast))
-                ).reset_index(drop=True)
-
+            if self.controller_model.weather_forecast_as_dataframe:
+                _step_forecast = self.weather_forecast.get_step_forecast_dataframe(i)
+            else:
+                _step_forecast = self.weather_forecast.get_step_forecast(i)
         else:
             # for external sourced forecasts all forecasts should be pre-loaded
             _step_forecast = self.data_client.weather.forecasts[i]
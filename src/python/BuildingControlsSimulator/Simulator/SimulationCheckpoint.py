@@ -0,0 +1,51 @@
+import os
+import logging
+import pickle
+
+import attr
+import pandas as pd
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@attr.s(kw_only=True)
+class SimulationCheckpoint:
+    """State of all models of a simulation after t_idx steps.
+
+    Checkpoints are written periodically during Simulation.run so that a
+    simulation interrupted by a crash or preemption resumes from its latest
+    checkpoint instead of the first step. Output already filled is part of
+    the model state, see e.g. ControllerModel.get_state_snapshot.
+
+    Checkpoints are named by sim_name only, the fingerprint identifies the
+    simulation time and models a checkpoint was saved for so that a stale
+    checkpoint is never restored, see Simulation.get_checkpoint_fingerprint.
+    """
+
+    t_idx = attr.ib()
+    fingerprint = attr.ib()
+    building_model_state = attr.ib()
+    controller_model_state = attr.ib()
+    state_estimator_model_state = attr.ib()
+
+    @staticmethod
+    def get_fpath(checkpoint_dir, sim_name):
+        return os.path.join(checkpoint_dir, f"{sim_name}.checkpoint")
+
+    def save(self, fpath):
+        # write to temporary file first so that a checkpoint interrupted
+        # while writing never replaces the previous one
+        _tmp_fpath = fpath + ".tmp"
+        with open(_tmp_fpath, "wb") as f:
+            pickle.dump(self, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(_tmp_fpath, fpath)
+
+    @staticmethod
+    def load(fpath):
+        """Return SimulationCheckpoint stored at fpath or None."""
+        if not os.path.isfile(fpath):
+            return None
+
+        with open(fpath, "rb") as f:
+            return pickle.load(f)
@@ -0,0 +1,31 @@
+import logging
+
+import attr
+import pandas as pd
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@attr.s(kw_only=True)
+class SimulationResult:
+    """Outcome of running a single simulation in a worker process.
+
+    Errors are captured per simulation so that one failed simulation does
+    not abort the other simulations of a run.
+    """
+
+    sim_idx = attr.ib()
+    sim_name = attr.ib(default=None)
+    success = attr.ib(default=False)
+    error = attr.ib(default=None)
+    traceback = attr.ib(default=None)
+    wall_time_seconds = attr.ib(default=None)
+    worker_pid = attr.ib(default=None)
+    output = attr.ib(default=None)
+    # full_data_periods of the simulation, used to stitch TimeChunk outputs
+    full_data_periods = attr.ib(default=None)
+    # per component timing summary if Simulator.step_timing is enabled
+    step_timing = attr.ib(default=None)
+    # HealthMonitor counters, also of simulations aborted as unhealthy
+    health_counters = attr.ib(default=None)
@@ -0,0 +1,63 @@
+import logging
+
+import attr
+import pandas as pd
+import numpy as np
+
+from BuildingControlsSimulator.Simulator.Simulation import Simulation
+from BuildingControlsSimulator.Simulator.StepTimer import StepTimer
+
+logger = logging.getLogger(__name__)
+
+
+@attr.s(kw_only=True)
+class SimulationSpec:
+    """Everything required to build a Simulation when it is scheduled.
+
+    Specs are cheap to create and pickle: models are given as ModelFactory
+    and the DataClient has not loaded any data yet, or its data is published
+    as SharedChannelData that the built simulation attaches to read-only.
+    """
+
+    sim_idx = attr.ib()
+    sim_config = attr.ib()
+    data_client = attr.ib()
+    building_model_factory = attr.ib()
+    controller_model_factory = attr.ib()
+    state_estimator_model_factory = attr.ib()
+    sim_run_identifier = attr.ib()
+    shared_channel_data = attr.ib(default=None)
+    output_chunk_steps = attr.ib(default=None)
+    step_timing = attr.ib(default=False)
+    checkpoint_dir = attr.ib(default=None)
+    checkpoint_steps = attr.ib(default=None)
+    store_output = attr.ib(default=True)
+    replay = attr.ib(default=False)
+    # policy of the HealthMonitor of each built simulation
+    health_monitor = attr.ib(default=None)
+    # TimeChunk if the spec simulates a time chunk of its parent sim_config
+    time_chunk = attr.ib(default=None)
+
+    def build(self):
+        if self.shared_channel_data:
+            _data_client = self.shared_channel_data.attach()
+        else:
+            _data_client = self.data_client
+
+        return Simulation(
+            config=self.sim_config,
+            data_client=_data_client,
+            building_model=self.building_model_factory.build(),
+            controller_model=self.controller_model_factory.build(),
+            state_estimator_model=self.state_estimator_model_factory.build(),
+            sim_run_identifier=self.sim_run_identifier,
+            output_chunk_steps=self.output_chunk_steps,
+            step_timer=StepTimer() if self.step_timing else None,
+            checkpoint_dir=self.checkpoint_dir,
+            checkpoint_steps=self.checkpoint_steps,
+            store_output=self.store_output,
+            replay=self.replay,
+            health_monitor=self.health_monitor.copy()
+            if self.health_monitor
+            else None,
+        )
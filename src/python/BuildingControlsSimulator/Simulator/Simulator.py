@@ -2,7 +2,11 @@
 
 import os
 import logging
-import copy
+import shutil
+import tempfile
+import time
+import traceback
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
 from datetime import datetime
 import uuid
 
@@ -11,6 +15,12 @@ import numpy as np
 import attr
 
 from BuildingControlsSimulator.Simulator.Simulation import Simulation
+from BuildingControlsSimulator.Simulator.SimulationSpec import SimulationSpec
+from BuildingControlsSimulator.Simulator.ModelFactory import ModelFactory
+from BuildingControlsSimulator.Simulator.BatchSimulation import BatchSimulation
+from BuildingControlsSimulator.Simulator.ForkSweep import ForkSweep
+from BuildingControlsSimulator.Simulator.SimulationResult import SimulationResult
+from BuildingControlsSimulator.Simulator.TimeChunk import TimeChunk
 from BuildingControlsSimulator.BuildingModels.BuildingModel import BuildingModel
 from BuildingControlsSimulator.BuildingModels.EnergyPlusBuildingModel import (
     EnergyPlusBuildingModel,
@@ -18,6 +28,7 @@ from BuildingControlsSimulator.BuildingModels.EnergyPlusBuildingModel import (
 from BuildingControlsSimulator.BuildingModels.IDFPreprocessor import IDFPreprocessor
 from BuildingControlsSimulator.ControllerModels.ControllerModel import ControllerModel
 from BuildingControlsSimulator.DataClients.DataClient import DataClient
+from BuildingControlsSimulator.DataClients.SharedChannelData import SharedChannelData
 from BuildingControlsSimulator.ControllerModels.FMIController import FMIController
 from BuildingControlsSimulator.ControllerModels.Deadband import Deadband
 from BuildingControlsSimulator.StateEstimatorModels.StateEstimatorModel import (
@@ -27,35 +38,112 @@ from BuildingControlsSimulator.OutputAnalysis.OutputAnalysis import OutputAnalys
 
 logger = logging.getLogger(__name__)
 
+# scratch directory owned by the current worker process, see init_worker
+_WORKER_SCRATCH_DIR = None
+
+
+def init_worker(scratch_dir):
+    """Give each worker process its own scratch directory and working
+    directory because EnergyPlusToFMU writes temporary files to the cwd."""
+    global _WORKER_SCRATCH_DIR
+    _WORKER_SCRATCH_DIR = os.path.join(scratch_dir, f"worker_{os.getpid()}")
+    os.makedirs(_WORKER_SCRATCH_DIR, exist_ok=True)
+    os.chdir(_WORKER_SCRATCH_DIR)
+
+
+def run_simulation_worker(sim_spec, preprocess_check=False, return_output=False):
+    """Build and run a single simulation capturing any error in the
+    SimulationResult."""
+    _start_wall_time = time.perf_counter()
+    sim_idx = sim_spec.sim_idx
+    result = SimulationResult(sim_idx=sim_idx, worker_pid=os.getpid())
+    sim = None
+    try:
+        sim = sim_spec.build()
+        result.sim_name = sim.sim_name
+        if _WORKER_SCRATCH_DIR:
+            sim.set_scratch_dir(_WORKER_SCRATCH_DIR)
+        # weather data is required during model creation
+        sim.data_client.get_data()
+        sim.create_models(preprocess_check=preprocess_check)
+        sim.run(local=True)
+        # model names may depend on options applied during initialization
+        result.sim_name = sim.sim_name
+        result.success = True
+        if sim.step_timer:
+            result.step_timing = sim.step_timer.get_summary()
+        if return_output:
+            result.output = sim.output
+            result.full_data_periods = sim.data_client.full_data_periods
+    except Exception as e:
+        logger.error(f"Simulation {sim_idx}: {result.sim_name} failed: {e!r}")
+        result.error = repr(e)
+        result.traceback = traceback.format_exc()
+
+    if sim and sim.health_monitor:
+        result.health_counters = dict(sim.health_monitor.counters)
+    result.wall_time_seconds = time.perf_counter() - _start_wall_time
+    return result
+
 
 @attr.s(kw_only=True)
 class Simulator:
-    """Creates list of lazy init simulations with same building model and controller model"""
+    """Lazily builds and runs simulations for each permutation of sim_config,
+    building model, controller model, and state estimator model.
+
+    Models may be given as instances or as ModelFactory. Simulations are only
+    built when they are scheduled, see `iter_simulation_specs`.
+    """
 
     sim_config = attr.ib()
     data_client = attr.ib(validator=attr.validators.instance_of(DataClient))
     building_models = attr.ib(
         validator=attr.validators.deep_iterable(
-            member_validator=attr.validators.instance_of(BuildingModel),
+            member_validator=attr.validators.instance_of((BuildingModel, ModelFactory)),
             iterable_validator=attr.validators.instance_of(list),
         )
     )
     controller_models = attr.ib(
         validator=attr.validators.deep_iterable(
-            member_validator=attr.validators.instance_of(ControllerModel),
+            member_validator=attr.validators.instance_of((ControllerModel, ModelFactory)),
             iterable_validator=attr.validators.instance_of(list),
         )
     )
     state_estimator_models = attr.ib(
         validator=attr.validators.deep_iterable(
-            member_validator=attr.validators.instance_of(StateEstimatorModel),
+            member_validator=attr.validators.instance_of((StateEstimatorModel, ModelFactory)),
             iterable_validator=attr.validators.instance_of(list),
         )
     )
 
+    # simulations are appended as they are run
     simulations = attr.ib(factory=list)
+    simulation_results = attr.ib(factory=list)
 
     sim_run_identifier = attr.ib()
+    # store output of each simulation in chunks of steps, see Simulation
+    output_chunk_steps = attr.ib(default=None)
+    # record per component step timing of each simulation, see StepTimer
+    step_timing = attr.ib(default=False)
+    # reuse model state after the warm-up period across controller models,
+    # see WarmStartSnapshot
+    warm_start = attr.ib(default=False)
+    # periodically checkpoint each simulation to checkpoint_dir and resume
+    # from existing checkpoints, see SimulationCheckpoint. Checkpoints are
+    # named by sim_name so sim_run_identifier must be given to resume a run.
+    checkpoint_dir = attr.ib(default=None)
+    checkpoint_steps = attr.ib(default=None)
+    # split each simulation of a parallel run into time chunks of at least
+    # min_chunk_period of its sim_config simulated in parallel, each chunk
+    # starts chunk_warmup_period early from a cold start, see TimeChunk
+    time_chunks = attr.ib(default=False)
+    chunk_warmup_period = attr.ib(default="7D")
+    # drive building models with recorded equipment runtimes instead of
+    # controller models, see Simulation.replay
+    replay = attr.ib(default=False)
+    # HealthMonitor policy copied to each simulation to abort unhealthy
+    # simulations early
+    health_monitor = attr.ib(default=None)
 
     @sim_run_identifier.default
     def get_sim_run_identifier(self):
@@ -65,41 +153,477 @@ class Simulator:
         return datetime.utcnow().strftime("%Y_%m_%d_%H_%M_%S") + uuid.uuid4().hex[-6:]
 
     def __attrs_post_init__(self):
-        """Lazy init of all simulations"""
-        # simulation for each permutation: data, building, and controller
-        logger.info(f"Initializing simulation run: {self.sim_run_identifier}")
+        logger.info(
+            f"Initializing simulation run: {self.sim_run_identifier} "
+            + f"with {self.n_simulations} simulations"
+        )
+
+    @property
+    def n_simulations(self):
+        return (
+            len(self.sim_config)
+            * len(self.building_models)
+            * len(self.controller_models)
+            * len(self.state_estimator_models)
+        )
+
+    def iter_simulation_specs(self):
+        """Lazily generate SimulationSpec for each permutation: data, building,
+        controller, and state estimator."""
+        _building_model_factories = [
+            ModelFactory.from_model(_b) for _b in self.building_models
+        ]
+        _controller_model_factories = [
+            ModelFactory.from_model(_c) for _c in self.controller_models
+        ]
+        _state_estimator_model_factories = [
+            ModelFactory.from_model(_e) for _e in self.state_estimator_models
+        ]
+        _sim_idx = 0
         for _idx, _sim_config in self.sim_config.iterrows():
 
             # the data client is copied once per sim_config so that permutations
             # of building and controller models can reuse data where possible
-            dc = copy.deepcopy(self.data_client)
-            dc.sim_config = _sim_config.to_dict()
-
-            for _b in self.building_models:
-                for _c in self.controller_models:
-                    for _e in self.state_estimator_models:
-
-                        # lazy init of simulation model
-                        # deep copies are used so that models can be in user code
-                        # and then be fully initialized lazily per simulation
-                        self.simulations.append(
-                            Simulation(
-                                config=_sim_config,
-                                data_client=dc,
-                                building_model=copy.deepcopy(_b),
-                                controller_model=copy.deepcopy(_c),
-                                state_estimator_model=copy.deepcopy(_e),
-                                sim_run_identifier=self.sim_run_identifier,
-                            )
+            dc = self.data_client.copy_for_sim_config(_sim_config.to_dict())
+
+            for _b in _building_model_factories:
+                for _c in _controller_model_factories:
+                    for _e in _state_estimator_model_factories:
+                        yield SimulationSpec(
+                            sim_idx=_sim_idx,
+                            sim_config=_sim_config,
+                            data_client=dc,
+                            building_model_factory=_b,
+                            controller_model_factory=_c,
+                            state_estimator_model_factory=_e,
+                            sim_run_identifier=self.sim_run_identifier,
+                            output_chunk_steps=self.output_chunk_steps,
+                            step_timing=self.step_timing,
+                            checkpoint_dir=self.checkpoint_dir,
+                            checkpoint_steps=self.checkpoint_steps,
+                            replay=self.replay,
+                            health_monitor=self.health_monitor,
                         )
+                        _sim_idx += 1
+
+    def iter_time_chunk_specs(self):
+        """Generate a SimulationSpec for each TimeChunk of each simulation.
+
+        Chunk simulations return their output to the parent process instead
+        of storing it, see `stitch_time_chunk_results`.
+        """
+        _sim_idx = 0
+        for sim_spec in self.iter_simulation_specs():
+            for _chunk in TimeChunk.make_chunks(
+                parent_sim_idx=sim_spec.sim_idx,
+                sim_config=sim_spec.sim_config,
+                warmup_period=self.chunk_warmup_period,
+            ):
+                _sim_config = _chunk.get_sim_config(sim_spec.sim_config)
+                yield attr.evolve(
+                    sim_spec,
+                    sim_idx=_sim_idx,
+                    sim_config=_sim_config,
+                    data_client=sim_spec.data_client.copy_for_sim_config(
+                        _sim_config.to_dict()
+                    ),
+                    # chunk output is kept in memory until stitched
+                    output_chunk_steps=None,
+                    store_output=False,
+                    time_chunk=_chunk,
+                )
+                _sim_idx += 1
+
+    def stitch_time_chunk_results(self, sim_specs, results, return_output=False):
+        """Stitch outputs of time chunk simulations into the output of their
+        parent simulation, which is stored with the data client.
+
+        :param sim_specs: dict of sim_idx -> SimulationSpec of chunk
+        :param results: SimulationResult of each chunk simulation
+        :return: list of SimulationResult, one per parent simulation
+        """
+        _chunk_results = {}
+        for _result in results:
+            _chunk = sim_specs[_result.sim_idx].time_chunk
+            _chunk_results.setdefault(_chunk.parent_sim_idx, []).append(
+                (_chunk, _result)
+            )
+
+        parent_results = []
+        for _parent_sim_idx, _chunks in _chunk_results.items():
+            _chunks = sorted(_chunks, key=lambda c: c[0].chunk_idx)
+            _sim_spec = sim_specs[_chunks[0][1].sim_idx]
+            result = SimulationResult(
+                sim_idx=_parent_sim_idx,
+                wall_time_seconds=sum(r.wall_time_seconds or 0 for _, r in _chunks),
+            )
+            _failed = [r for _, r in _chunks if not r.success]
+            if _failed:
+                result.error = "; ".join(
+                    f"chunk {r.sim_idx}: {r.error}" for r in _failed
+                )
+                parent_results.append(result)
+                continue
+
+            _suffix = f"_chunk_{_chunks[0][0].chunk_idx}"
+            result.sim_name = _chunks[0][1].sim_name[: -len(_suffix)]
+            try:
+                _output, result.full_data_periods = TimeChunk.stitch(
+                    chunks=[c for c, _ in _chunks],
+                    outputs=[r.output for _, r in _chunks],
+                    full_data_periods=[r.full_data_periods for _, r in _chunks],
+                    min_sim_period=_sim_spec.sim_config["min_sim_period"],
+                )
+                _sim_spec.data_client.store_output(
+                    output=_output,
+                    sim_name=result.sim_name,
+                    src_spec=_sim_spec.data_client.internal_spec,
+                )
+                result.success = True
+                if return_output:
+                    result.output = _output
+            except Exception as e:
+                logger.error(
+                    f"Stitching simulation {_parent_sim_idx}: {result.sim_name} "
+                    + f"failed: {e!r}"
+                )
+                result.error = repr(e)
+                result.traceback = traceback.format_exc()
+            parent_results.append(result)
+
+        return parent_results
+
+    def iter_shared_simulation_specs(self, shared_dir, shared_channel_data):
+        """Generate SimulationSpec with data loaded once per sim_config and
+        published as SharedChannelData instead of a DataClient.
+
+        :param shared_channel_data: list that published SharedChannelData is
+        appended to so that the caller can unlink it when done
+        """
+        _data_client = None
+        _shared = None
+        for sim_spec in self.iter_simulation_specs():
+            # specs of the same sim_config are consecutive and share the
+            # same data client
+            if sim_spec.data_client is not _data_client:
+                _data_client = sim_spec.data_client
+                _shared = None
+                try:
+                    _data_client.get_data()
+                    _shared = SharedChannelData.publish(_data_client, shared_dir)
+                    shared_channel_data.append(_shared)
+                except Exception as e:
+                    # the simulation loads its own data and reports any
+                    # error in its SimulationResult
+                    logger.error(
+                        "Could not share input data of sim_config "
+                        + f"{sim_spec.sim_config['identifier']}: {e!r}"
+                    )
+
+            if _shared:
+                yield attr.evolve(
+                    sim_spec, data_client=None, shared_channel_data=_shared
+                )
+            else:
+                yield sim_spec
 
-    def simulate(self, local=True, preprocess_check=False):
+    def iter_fork_sweeps(self, preprocess_check=False):
+        """Generate lists of created simulations that differ only by their
+        controller model, one per sim_config, building model, and state
+        estimator model, see ForkSweep."""
+        _data_client = None
+        _sweeps = {}
+        for sim_spec in self.iter_simulation_specs():
+            # specs of the same sim_config are consecutive
+            if sim_spec.data_client is not _data_client:
+                yield from _sweeps.values()
+                _data_client = sim_spec.data_client
+                _sweeps = {}
+            sim = sim_spec.build()
+            sim.data_client.get_data()
+            sim.create_models(preprocess_check=preprocess_check)
+            _key = (
+                id(sim_spec.building_model_factory),
+                id(sim_spec.state_estimator_model_factory),
+            )
+            _sweeps.setdefault(_key, []).append(sim)
+        yield from _sweeps.values()
+
+    def get_step_timing(self):
+        """Step timing summary of each run simulation by sim_name, requires
+        step_timing to be enabled."""
+        if self.simulation_results:
+            return {
+                r.sim_name: r.step_timing
+                for r in self.simulation_results
+                if r.step_timing
+            }
+        return {
+            sim.sim_name: sim.step_timer.get_summary()
+            for sim in self.simulations
+            if sim.step_timer
+        }
+
+    def simulate(
+        self,
+        local=True,
+        preprocess_check=False,
+        batch=False,
+        n_workers=1,
+        ordered=True,
+        scratch_dir=None,
+        return_output=False,
+        mp_context=None,
+        keep_simulations=True,
+        share_input_data=None,
+        fork=False,
+        max_pending=None,
+    ):
         """Run all simulations locally or in cloud.
         :param local: run simulations locally
+        :param batch: advance simulations with the same step size in lockstep
+        using vectorized model steps where models support them
+        :param fork: run simulations that differ only by controller model as
+        a ForkSweep, sharing the simulation of each step until their
+        controller models diverge
+        :param n_workers: number of worker processes, if > 1 simulations are run
+        in a process pool, see `simulate_parallel`
+        :param keep_simulations: append run simulations to self.simulations,
+        disable for large runs to release memory of each finished simulation
+
+        If warm_start is set, serial local simulations of the same sim_config,
+        building model, and state estimator model restore the model state at
+        the end of the warm-up period of the first of them, see
+        WarmStartSnapshot.
         """
-        if local:
-            for sim in self.simulations:
+        if self.time_chunks and not (local and n_workers > 1):
+            logger.warning("time_chunks requires n_workers > 1 and is ignored.")
+        if fork and not (local and n_workers == 1):
+            logger.warning("fork requires n_workers == 1 and is ignored.")
+
+        if local and n_workers > 1:
+            self.simulation_results = self.simulate_parallel(
+                n_workers=n_workers,
+                preprocess_check=preprocess_check,
+                ordered=ordered,
+                scratch_dir=scratch_dir,
+                return_output=return_output,
+                mp_context=mp_context,
+                share_input_data=share_input_data,
+                max_pending=max_pending,
+            )
+        elif local and fork:
+            if self.checkpoint_dir or self.replay or self.health_monitor:
+                logger.warning(
+                    "checkpoint_dir, replay, and health_monitor are ignored "
+                    + "by fork sweeps."
+                )
+            for _simulations in self.iter_fork_sweeps(
+                preprocess_check=preprocess_check
+            ):
+                logger.info(f"Running {len(_simulations)} simulations as fork sweep")
+                ForkSweep(simulations=_simulations).run()
+                if keep_simulations:
+                    self.simulations.extend(_simulations)
+        elif local and batch:
+            _batches = {}
+            for sim_spec in self.iter_simulation_specs():
+                sim = sim_spec.build()
+                sim.data_client.get_data()
+                sim.create_models(preprocess_check=preprocess_check)
+                _batches.setdefault(sim.step_size_seconds, []).append(sim)
+
+            for _step_size_seconds, _simulations in _batches.items():
+                logger.info(
+                    f"Running {len(_simulations)} simulations in lockstep "
+                    + f"with step size: {_step_size_seconds} seconds"
+                )
+                BatchSimulation(simulations=_simulations).run()
+                if keep_simulations:
+                    self.simulations.extend(_simulations)
+        elif local:
+            _data_client = None
+            _warm_starts = {}
+            for sim_spec in self.iter_simulation_specs():
+                sim = sim_spec.build()
                 # weather data is required during model creation
                 sim.data_client.get_data()
                 sim.create_models(preprocess_check=preprocess_check)
+                if self.warm_start:
+                    # specs of the same sim_config are consecutive
+                    if sim_spec.data_client is not _data_client:
+                        _data_client = sim_spec.data_client
+                        _warm_starts = {}
+                    _key = (
+                        id(sim_spec.building_model_factory),
+                        id(sim_spec.state_estimator_model_factory),
+                    )
+                    if _key in _warm_starts:
+                        # None if models do not support snapshots
+                        sim.warm_start = _warm_starts[_key]
+                    else:
+                        sim.capture_warm_start = True
                 sim.run(local=True)
+                if sim.capture_warm_start:
+                    _warm_starts[_key] = sim.warm_start_snapshot
+                    sim.warm_start_snapshot = None
+                if keep_simulations:
+                    self.simulations.append(sim)
+
+    def simulate_parallel(
+        self,
+        n_workers,
+        preprocess_check=False,
+        ordered=True,
+        scratch_dir=None,
+        return_output=False,
+        mp_context=None,
+        share_input_data=None,
+        max_pending=None,
+    ):
+        """Run simulations in a pool of worker processes.
+
+        :param ordered: return results in order of `iter_simulation_specs`,
+        otherwise in order of completion
+        :param scratch_dir: parent of per-worker scratch directories for FMUs,
+        EPWs, and preprocessed IDFs. A temporary directory is used and removed
+        afterwards if not given.
+        :param return_output: return simulation output in each SimulationResult
+        :param share_input_data: load data once per sim_config in the parent
+        process and share it with workers through memory-mapped files, see
+        SharedChannelData. Defaults to sharing when there are multiple model
+        permutations per sim_config.
+        :param max_pending: maximum number of submitted simulations that have
+        not finished, defaults to 2 * n_workers. Simulation specs are
+        generated and shared input data is published only as simulations are
+        submitted, and shared input data is unlinked once all simulations of
+        its sim_config have finished.
+        :return: list of SimulationResult, one per simulation
+
+        If time_chunks is set each simulation is run as time chunks, see
+        `iter_time_chunk_specs`. Chunks load their own data.
+        """
+        _remove_scratch_dir = scratch_dir is None
+        if _remove_scratch_dir:
+            scratch_dir = tempfile.mkdtemp(prefix=f"{self.sim_run_identifier}_")
+        else:
+            os.makedirs(scratch_dir, exist_ok=True)
+
+        if share_input_data is None:
+            share_input_data = (
+                self.n_simulations > len(self.sim_config) and not self.time_chunks
+            )
+        if max_pending is None:
+            max_pending = 2 * n_workers
+
+        logger.info(
+            f"Running {self.n_simulations} simulations with {n_workers} workers"
+        )
+        results = []
+        _shared_channel_data = []
+        if self.time_chunks:
+            _sim_specs = self.iter_time_chunk_specs()
+        elif share_input_data:
+            _sim_specs = self.iter_shared_simulation_specs(
+                shared_dir=os.path.join(scratch_dir, "shared_input_data"),
+                shared_channel_data=_shared_channel_data,
+            )
+        else:
+            _sim_specs = self.iter_simulation_specs()
+
+        # submitted futures in order of submission
+        _pending = {}
+        # number of unfinished simulations of each SharedChannelData by id
+        _n_unfinished = {}
+        # SharedChannelData of the last submitted spec may have more specs
+        _last_shared = None
+        # specs of time chunks are required for stitching
+        _chunk_specs = {}
+
+        def collect(future):
+            _sim_spec = _pending.pop(future)
+            try:
+                results.append(future.result())
+            except Exception as e:
+                # errors outside of the simulation, e.g. pickling or
+                # a worker process being killed
+                logger.error(f"Simulation {_sim_spec.sim_idx} failed: {e!r}")
+                results.append(
+                    SimulationResult(
+                        sim_idx=_sim_spec.sim_idx,
+                        error=repr(e),
+                        traceback=traceback.format_exc(),
+                    )
+                )
+            if _sim_spec.shared_channel_data is not None:
+                _n_unfinished[id(_sim_spec.shared_channel_data)] -= 1
+
+        def unlink_finished():
+            # data is published before the first spec of its sim_config is
+            # submitted
+            for _shared in list(_shared_channel_data):
+                if _shared is not _last_shared and _n_unfinished.get(id(_shared)) == 0:
+                    _shared.unlink()
+                    _shared_channel_data.remove(_shared)
+
+        def collect_next():
+            """Collect the first submitted or any completed simulation."""
+            if ordered:
+                _done = [next(iter(_pending))]
+            else:
+                _done, _ = wait(_pending, return_when=FIRST_COMPLETED)
+            for _future in _done:
+                collect(_future)
+            unlink_finished()
+
+        try:
+            with ProcessPoolExecutor(
+                max_workers=n_workers,
+                mp_context=mp_context,
+                initializer=init_worker,
+                initargs=(scratch_dir,),
+            ) as executor:
+                for sim_spec in _sim_specs:
+                    while len(_pending) >= max_pending:
+                        collect_next()
+
+                    # specs are small to pickle, simulations are built in workers
+                    _future = executor.submit(
+                        run_simulation_worker,
+                        sim_spec=sim_spec,
+                        preprocess_check=preprocess_check,
+                        # time chunk outputs are stitched in this process
+                        return_output=return_output or self.time_chunks,
+                    )
+                    _pending[_future] = sim_spec
+                    if self.time_chunks:
+                        _chunk_specs[sim_spec.sim_idx] = sim_spec
+                    # specs of the same sim_config are consecutive
+                    _last_shared = sim_spec.shared_channel_data
+                    if _last_shared is not None:
+                        _n_unfinished[id(_last_shared)] = (
+                            _n_unfinished.get(id(_last_shared), 0) + 1
+                        )
+                    unlink_finished()
+
+                _last_shared = None
+                while _pending:
+                    collect_next()
+        finally:
+            for _shared in _shared_channel_data:
+                _shared.unlink()
+            if _remove_scratch_dir:
+                shutil.rmtree(scratch_dir, ignore_errors=True)
+
+        if self.time_chunks:
+            results = self.stitch_time_chunk_results(
+                sim_specs=_chunk_specs,
+                results=results,
+                return_output=return_output,
+            )
+
+        _n_failed = len([r for r in results if not r.success])
+        if _n_failed:
+            logger.error(f"{_n_failed} of {len(results)} simulations failed.")
+
+        return results
@@ -0,0 +1,148 @@
+import logging
+
+import attr
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@attr.s(kw_only=True)
+class StateBusView:
+    """Mapping of states to current values of a StateBus. Passed to dict-based
+    models in place of the step_output of a bus-aware model, and written to by
+    bus-aware models in place of their step_output."""
+
+    values = attr.ib()
+    slots = attr.ib()
+
+    def __getitem__(self, state):
+        return self.values[self.slots[state]]
+
+    def __setitem__(self, state, value):
+        self.values[self.slots[state]] = value
+
+    def __contains__(self, state):
+        return state in self.slots
+
+    def __iter__(self):
+        return iter(self.slots)
+
+    def __len__(self):
+        return len(self.slots)
+
+    def get(self, state, default=None):
+        if state in self.slots:
+            return self.values[self.slots[state]]
+        return default
+
+    def keys(self):
+        return self.slots.keys()
+
+    def items(self):
+        return [(state, self.values[slot]) for state, slot in self.slots.items()]
+
+    def to_dict(self):
+        return dict(self.items())
+
+
+@attr.s(kw_only=True)
+class StateBus:
+    """Preallocated state vector shared by the models of a Simulation.
+
+    Each state exchanged between models has a fixed slot in values. Bus-aware
+    models get a StateBusView of their output states once in `set_state_bus`
+    and write to it each step in place of their step_output dict. Models that
+    do not support the bus keep their step_output dict, which is copied into
+    the bus after each of their steps by `set_values`.
+
+    Each completed step is recorded as a single row copy of values into
+    record, which is written back to the output memory of bus-aware models by
+    `write_output`. Values are float64, boolean and integer states are
+    cast to the dtype of model output memory when written back, unset (NaN)
+    values of these states keep the value in output memory.
+    """
+
+    slots = attr.ib()
+    values = attr.ib()
+    record = attr.ib(default=None)
+    # index of next step to be recorded
+    recorded_idx = attr.ib(default=0)
+    # index of next recorded step to be written to model output memory
+    written_idx = attr.ib(default=0)
+
+    @classmethod
+    def from_models(cls, models, data_spec):
+        """Assign a slot to each numeric output state of exactly one of models,
+        states are ordered by first declaration."""
+        _producers = {}
+        for m in models:
+            for state in m.output_states:
+                _producers[state] = _producers.get(state, 0) + 1
+
+        _states = [
+            state
+            for state, n_producers in _producers.items()
+            if n_producers == 1 and data_spec.full.spec[state]["dtype"] != "category"
+        ]
+        return cls(
+            slots={state: n for n, state in enumerate(_states)},
+            values=np.full(len(_states), np.nan, dtype="float64"),
+        )
+
+    def allocate(self, n_steps, start_idx=0):
+        self.record = np.full((n_steps, len(self.slots)), np.nan, dtype="float64")
+        self.recorded_idx = start_idx
+        self.written_idx = start_idx
+
+    def supports(self, states):
+        """All of states have a slot on the bus."""
+        return all(state in self.slots for state in states)
+
+    def get_slots(self, states):
+        """Slot of each of states, in order."""
+        try:
+            return [self.slots[state] for state in states]
+        except KeyError as e:
+            raise ValueError(f"State {e} is not on the state bus.") from None
+
+    def get_view(self, states):
+        return StateBusView(
+            values=self.values,
+            slots={state: self.slots[state] for state in states},
+        )
+
+    def set_values(self, step_output):
+        """Copy step_output of a dict-based model into the bus."""
+        for state, value in step_output.items():
+            if state in self.slots:
+                self.values[self.slots[state]] = np.nan if value is None else value
+
+    def record_step(self, i):
+        self.record[i] = self.values
+        self.recorded_idx = i + 1
+
+    def write_output(self, models):
+        """Write steps recorded since the last call into output memory of
+        bus-aware models and refresh their step_output for state snapshots."""
+        _start, _end = self.written_idx, self.recorded_idx
+        if _end <= _start:
+            return
+
+        for model in models:
+            for state in model.output_states:
+                _output = model.output[state]
+                _record = self.record[_start:_end, self.slots[state]]
+                if _output.dtype.kind == "f":
+                    _output[_start:_end] = _record
+                else:
+                    # NaN cannot be cast to boolean and integer states, slots
+                    # never written by the model keep its own value
+                    _set = ~np.isnan(_record)
+                    _output[_start:_end][_set] = _record[_set]
+                # float states keep the bus precision as step_output does when
+                # models pass step_output dicts
+                if _output.dtype.kind == "f":
+                    model.step_output[state] = self.record[_end - 1, self.slots[state]]
+                else:
+                    model.step_output[state] = _output[_end - 1]
+        self.written_idx = _end
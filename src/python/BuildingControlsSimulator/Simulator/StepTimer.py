@@ -0,0 +1,89 @@
+import logging
+import time
+
+import attr
+import pandas as pd
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@attr.s(kw_only=True)
+class StepTimer:
+    """Records the wall time spent in each component of a simulation step.
+
+    Durations are stored in nanoseconds in growable int64 arrays, one per
+    component, and summarized once at the end of the simulation. Histogram
+    bin edges are fixed so that histograms of different simulations and
+    deployments can be summed.
+    """
+
+    durations = attr.ib(factory=dict)
+    counts = attr.ib(factory=dict)
+    percentiles = attr.ib(factory=lambda: [50, 90, 99])
+    # log spaced bin edges from 1 microsecond to 100 seconds with underflow
+    # and overflow bins so that every duration is counted
+    histogram_bin_edges_seconds = attr.ib(
+        factory=lambda: np.concatenate(
+            [[0.0], 10.0 ** np.arange(-6.0, 2.25, 0.25), [np.inf]]
+        )
+    )
+
+    def record(self, component, duration_ns):
+        _count = self.counts.get(component, 0)
+        _durations = self.durations.get(component)
+        if _durations is None:
+            _durations = np.empty(1024, dtype="int64")
+            self.durations[component] = _durations
+        elif _count == len(_durations):
+            _durations = np.concatenate([_durations, np.empty_like(_durations)])
+            self.durations[component] = _durations
+
+        _durations[_count] = duration_ns
+        self.counts[component] = _count + 1
+
+    def lap(self, component, t_start_ns):
+        """Record time since t_start_ns and return current time to chain
+        timing of consecutive components."""
+        _t_end_ns = time.perf_counter_ns()
+        self.record(component, _t_end_ns - t_start_ns)
+        return _t_end_ns
+
+    def get_durations_seconds(self, component):
+        return self.durations[component][: self.counts[component]] / 1e9
+
+    def get_summary(self):
+        """Per component count, total, mean, percentiles, and histogram of
+        durations in seconds."""
+        _summary = {}
+        for component in self.durations.keys():
+            _durations = self.get_durations_seconds(component)
+            _histogram_counts, _ = np.histogram(
+                _durations, bins=self.histogram_bin_edges_seconds
+            )
+            _summary[component] = {
+                "count": len(_durations),
+                "total_seconds": float(np.sum(_durations)),
+                "mean_seconds": float(np.mean(_durations)),
+                **{
+                    f"p{_p}_seconds": float(_v)
+                    for _p, _v in zip(
+                        self.percentiles, np.percentile(_durations, self.percentiles)
+                    )
+                },
+                "max_seconds": float(np.max(_durations)),
+                "histogram_counts": _histogram_counts.tolist(),
+            }
+        return _summary
+
+    def get_summary_dataframe(self):
+        """Summary without histograms as a DataFrame, one row per component."""
+        return pd.DataFrame.from_dict(
+            {
+                component: {
+                    k: v for k, v in _summary.items() if k != "histogram_counts"
+                }
+                for component, _summary in self.get_summary().items()
+            },
+            orient="index",
+        )
@@ -0,0 +1,162 @@
+import logging
+
+import attr
+import pandas as pd
+import numpy as np
+
+from BuildingControlsSimulator.DataClients.DataStates import STATES
+from BuildingControlsSimulator.DataClients.DataClient import DataClient
+
+logger = logging.getLogger(__name__)
+
+
+@attr.s(kw_only=True)
+class TimeChunk:
+    """Time period of a simulation that is run as a separate simulation so
+    that a long simulation can be run in parallel processes.
+
+    A simulation is split into chunks of at least min_chunk_period of its
+    sim_config. Each chunk simulation starts warmup_period before the chunk
+    and simulates the overlap with the previous chunk from a cold start, its
+    output before start_utc is discarded when chunks are stitched.
+
+    Accuracy: model state at the start of a chunk differs from the serial
+    simulation only by the initial state at warmup_start_utc. The difference
+    decays with the slowest time constant of the building model, e.g. the
+    thermal mass of an RC model, so warmup_period should be several time
+    constants long. Controller and state estimator state, e.g. filtered
+    temperatures, recovers within hours but equipment cycles are not in phase
+    with the serial simulation. Use `get_max_abs_error` of daily means
+    against a serial run of representative homes to validate warmup_period.
+    """
+
+    parent_sim_idx = attr.ib()
+    chunk_idx = attr.ib()
+    n_chunks = attr.ib()
+    warmup_start_utc = attr.ib()
+    # output of chunk is [start_utc, end_utc), the last chunk includes end_utc
+    start_utc = attr.ib()
+    end_utc = attr.ib()
+
+    @property
+    def is_last(self):
+        return self.chunk_idx == self.n_chunks - 1
+
+    @staticmethod
+    def make_chunks(parent_sim_idx, sim_config, warmup_period):
+        """Split simulation period of sim_config into chunks of at least
+        min_chunk_period, chunk boundaries are aligned to simulation and
+        output steps."""
+        _start_utc = sim_config["start_utc"]
+        _end_utc = sim_config["end_utc"]
+        _n_chunks = max(
+            1,
+            int(
+                (_end_utc - _start_utc)
+                // pd.Timedelta(sim_config["min_chunk_period"])
+            ),
+        )
+        _align_seconds = int(
+            np.lcm(
+                int(sim_config["sim_step_size_seconds"]),
+                int(sim_config["output_step_size_seconds"]),
+            )
+        )
+        _chunk_period = (_end_utc - _start_utc) / _n_chunks
+        _boundaries = (
+            [_start_utc]
+            + [
+                (_start_utc + n * _chunk_period).floor(f"{_align_seconds}S")
+                for n in range(1, _n_chunks)
+            ]
+            + [_end_utc]
+        )
+        return [
+            TimeChunk(
+                parent_sim_idx=parent_sim_idx,
+                chunk_idx=n,
+                n_chunks=_n_chunks,
+                warmup_start_utc=max(
+                    _start_utc, _boundaries[n] - pd.Timedelta(warmup_period)
+                ),
+                start_utc=_boundaries[n],
+                end_utc=_boundaries[n + 1],
+            )
+            for n in range(_n_chunks)
+        ]
+
+    def get_sim_config(self, sim_config):
+        """sim_config of chunk simulation. All full data periods of the chunk
+        are simulated, min_sim_period is applied to the stitched periods."""
+        _sim_config = sim_config.copy()
+        _sim_config["start_utc"] = self.warmup_start_utc
+        _sim_config["end_utc"] = self.end_utc
+        _sim_config["min_sim_period"] = pd.Timedelta(0)
+        _sim_config["chunk_idx"] = self.chunk_idx
+        return _sim_config
+
+    def get_output_mask(self, datetimes):
+        _mask = datetimes >= self.start_utc
+        if not self.is_last:
+            _mask &= datetimes < self.end_utc
+        return _mask
+
+    def get_full_data_periods(self, full_data_periods):
+        """full_data_periods of chunk simulation clipped to chunk."""
+        _periods = []
+        for _start, _end in full_data_periods:
+            _start = max(_start, self.start_utc)
+            if not self.is_last:
+                _end = min(_end, self.end_utc)
+            if _start < _end:
+                _periods.append([_start, _end])
+        return _periods
+
+    @staticmethod
+    def stitch(chunks, outputs, full_data_periods, min_sim_period):
+        """Output and full_data_periods of the chunked simulation.
+
+        :param chunks: TimeChunk of each chunk simulation in order
+        :param outputs: output DataFrame of each chunk simulation
+        :param full_data_periods: full_data_periods of each chunk simulation
+        :param min_sim_period: min_sim_period of the chunked sim_config
+        """
+        # periods split at chunk boundaries are merged before min_sim_period
+        _periods = []
+        for _chunk, _chunk_periods in zip(chunks, full_data_periods):
+            for _start, _end in _chunk.get_full_data_periods(_chunk_periods):
+                if _periods and _start <= _periods[-1][1]:
+                    _periods[-1][1] = max(_periods[-1][1], _end)
+                else:
+                    _periods.append([_start, _end])
+        _periods = [
+            p for p in _periods if p[1] - p[0] >= pd.Timedelta(min_sim_period)
+        ]
+
+        _output = pd.concat(
+            [
+                _output[_chunk.get_output_mask(_output[STATES.DATE_TIME])]
+                for _chunk, _output in zip(chunks, outputs)
+            ],
+            ignore_index=True,
+        )
+        _mask = DataClient.get_periods_mask(_output[STATES.DATE_TIME], _periods)
+        return _output[_mask].reset_index(drop=True), _periods
+
+    @staticmethod
+    def get_max_abs_error(output, reference_output, states, period="1D"):
+        """Max absolute difference of period means of states between stitched
+        output and output of the serial simulation.
+
+        Equipment cycles of chunks are not in phase with the serial simulation
+        after the warm-up, so single steps are not compared.
+        """
+        _means = [
+            _df.set_index(STATES.DATE_TIME)[states]
+            .astype("float64")
+            .resample(period)
+            .mean()
+            for _df in [output, reference_output]
+        ]
+        _diff = (_means[0] - _means[1]).abs()
+        return {state: float(_diff[state].max()) for state in states}
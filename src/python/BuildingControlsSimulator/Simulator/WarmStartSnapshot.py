@@ -0,0 +1,28 @@
+import logging
+
+import attr
+import pandas as pd
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+
+@attr.s(kw_only=True)
+class WarmStartSnapshot:
+    """State of building, state estimator, and controller models at the end
+    of the EnergyPlus warm-up period of a simulation.
+
+    Simulations of the same data, building model, and state estimator model
+    restore the snapshot instead of simulating the warm-up period again.
+    The warm-up period is excluded from output, see
+    DataClient.eplus_day_fill_simulation_time. It is simulated once with the
+    controller of the simulation that captured the snapshot. The controller
+    model state is only restored in simulations of a controller model with
+    the same name, so that their output is identical to a cold start.
+    """
+
+    warmup_steps = attr.ib()
+    building_model_state = attr.ib()
+    state_estimator_model_state = attr.ib()
+    controller_model_name = attr.ib(default=None)
+    controller_model_state = attr.ib(default=None)
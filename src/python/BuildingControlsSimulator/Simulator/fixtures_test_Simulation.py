@@ -0,0 +1,252 @@
+"""
+Shared inputs of co-simulation tests of the RC building model, deadband
+controller, and low pass filter:
+    run_model_steps:
+        Model level co-simulation loop, see Simulation.step, with a daily
+        outdoor temperature cycle and a night setback.
+    SyntheticHome:
+        Dummy DonateYourData input data and weather file in a local cache to
+        run Simulation and Simulator without external data.
+"""
+
+import os
+
+import attr
+import pandas as pd
+import numpy as np
+
+from BuildingControlsSimulator.Simulator.Config import Config
+from BuildingControlsSimulator.Simulator.Simulation import Simulation
+from BuildingControlsSimulator.DataClients.DataClient import DataClient
+from BuildingControlsSimulator.DataClients.LocalSource import LocalSource
+from BuildingControlsSimulator.DataClients.LocalDestination import LocalDestination
+from BuildingControlsSimulator.DataClients.DataSpec import (
+    DonateYourDataSpec,
+    Internal,
+)
+from BuildingControlsSimulator.DataClients.DataStates import STATES
+from BuildingControlsSimulator.Conversions.Conversions import Conversions
+from BuildingControlsSimulator.BuildingModels.RCBuildingModel import RCBuildingModel
+from BuildingControlsSimulator.ControllerModels.Deadband import Deadband
+from BuildingControlsSimulator.StateEstimatorModels.LowPassFilter import LowPassFilter
+
+STEP_SIZE_SECONDS = 300
+
+
+def get_outdoor_temperature(hours):
+    """Daily outdoor temperature cycle in Celsius of hours since midnight."""
+    return -5.0 + 5.0 * np.sin(2 * np.pi * hours / 24.0)
+
+
+def get_stp_heat(hours):
+    # night setback
+    return np.where(hours % 24 < 8, 17.0, 21.0)
+
+
+def get_models(deadband=0.5, building_model_class=RCBuildingModel):
+    """State estimator, controller, and building model in step order."""
+    return [
+        LowPassFilter(alpha_temperature=0.5, alpha_humidity=0.5),
+        Deadband(
+            options={"deadband": deadband},
+            step_size_seconds=STEP_SIZE_SECONDS,
+            discretization_size_seconds=60,
+        ),
+        building_model_class(step_size_seconds=60),
+    ]
+
+
+def initialize_models(models, n_steps):
+    for model in models:
+        model.initialize(
+            start_utc=pd.Timestamp("2018-01-01", tz="utc"),
+            t_start=0,
+            t_end=(n_steps - 1) * STEP_SIZE_SECONDS,
+            t_step=STEP_SIZE_SECONDS,
+            data_spec=Internal(),
+            categories_dict={},
+        )
+    return models
+
+
+def run_model_steps(models, hours, start_idx=0, state_bus=None):
+    """Step models of get_models over steps [start_idx, len(hours)).
+
+    :param hours: hours since midnight of each step, the inputs of a step
+    are those of its hour
+    :param state_bus: StateBus the steps are recorded on
+    """
+    state_estimator_model, controller_model, building_model = models
+
+    def get_step_output(model):
+        # bus-aware models write their outputs to the state bus
+        if model.state_bus is not None:
+            return model.state_bus_output
+        return model.step_output
+
+    _outdoor_temperature = get_outdoor_temperature(hours)
+    _stp_heat = get_stp_heat(hours)
+    for i in range(start_idx, len(hours)):
+        _t_start = i * STEP_SIZE_SECONDS
+        state_estimator_model.do_step(
+            t_start=_t_start,
+            t_step=STEP_SIZE_SECONDS,
+            step_sensor_input=get_step_output(building_model),
+        )
+        controller_model.do_step(
+            t_start=_t_start,
+            t_step=STEP_SIZE_SECONDS,
+            step_thermostat_input={
+                STATES.TEMPERATURE_STP_COOL: 26.0,
+                STATES.TEMPERATURE_STP_HEAT: _stp_heat[i],
+            },
+            step_sensor_input=get_step_output(state_estimator_model),
+            step_weather_input={},
+            step_weather_forecast_input=None,
+        )
+        building_model.do_step(
+            t_start=_t_start,
+            t_step=STEP_SIZE_SECONDS,
+            step_control_input=get_step_output(controller_model),
+            step_sensor_input={STATES.THERMOSTAT_MOTION: False},
+            step_weather_input={STATES.OUTDOOR_TEMPERATURE: _outdoor_temperature[i]},
+        )
+        if state_bus:
+            state_bus.record_step(i)
+
+
+@attr.s(kw_only=True)
+class SyntheticHome:
+    """Dummy input data with the outdoor temperature cycle of
+    get_outdoor_temperature and the default schedule of
+    DataClient.generate_dummy_data, written to local_cache over
+    [data_start_utc, data_end_utc]."""
+
+    local_cache = attr.ib()
+    identifier = attr.ib(default="synthetic_home")
+    data_start_utc = attr.ib(default="2018-01-01")
+    data_end_utc = attr.ib(default="2018-01-15")
+    epw_path = attr.ib(default=None)
+
+    def __attrs_post_init__(self):
+        _sim_config = self.get_sim_config(
+            start_utc=self.data_start_utc, end_utc=self.data_end_utc
+        )
+        _datetimes = pd.date_range(
+            self.data_start_utc,
+            self.data_end_utc,
+            freq=f"{DonateYourDataSpec().data_period_seconds}S",
+        )
+        _hours = (_datetimes - _datetimes[0]).total_seconds().to_numpy() / 3600.0
+        _df = DataClient.generate_dummy_data(
+            sim_config=_sim_config,
+            spec=DonateYourDataSpec(),
+            outdoor_weather={
+                STATES.OUTDOOR_TEMPERATURE: Conversions.C2F(
+                    get_outdoor_temperature(_hours)
+                )
+            },
+        )
+        _source_dir = os.path.join(self.local_cache, "input", "local")
+        os.makedirs(_source_dir, exist_ok=True)
+        _df.to_csv(
+            os.path.join(_source_dir, f"{self.identifier}.csv.zip"), index=False
+        )
+        self.epw_path = os.path.join(self.local_cache, f"{self.identifier}.epw")
+        self.write_epw(self.epw_path)
+
+    def write_epw(self, fpath):
+        """Minimal EPW of a year with constant weather, outdoor temperature
+        is given by the input data."""
+        _header = [
+            "LOCATION,Chicago,IL,USA,TMY3,725300,41.98,-87.92,-6.0,201.0",
+            "DESIGN CONDITIONS,0",
+            "TYPICAL/EXTREME PERIODS,0",
+            "GROUND TEMPERATURES,0",
+            "HOLIDAYS/DAYLIGHT SAVINGS,No,0,0,0",
+            "COMMENTS 1,synthetic",
+            "COMMENTS 2,synthetic",
+            "DATA PERIODS,1,1,Data,Sunday, 1/ 1,12/31",
+        ]
+        # fields after the hour of each hourly record
+        _fields = [0, "?", 0.0, -5.0, 70, 101325, 0, 0, 300] + [0] * 11
+        _fields += [9999, 99999, 9, 999999999, 0, 0, 0, 99, 0, 0, 0]
+        with open(fpath, "w") as f:
+            f.write("\n".join(_header) + "\n")
+            for _t in pd.date_range("2018-01-01", periods=8760, freq="H"):
+                _record = [_t.year, _t.month, _t.day, _t.hour + 1] + _fields
+                f.write(",".join(map(str, _record)) + "\n")
+
+    def get_sim_config(
+        self,
+        start_utc="2018-01-02",
+        end_utc="2018-01-06",
+        sim_step_size_seconds=STEP_SIZE_SECONDS,
+        output_step_size_seconds=STEP_SIZE_SECONDS,
+        min_chunk_period="30D",
+    ):
+        return Config.make_sim_config(
+            identifier=self.identifier,
+            latitude=41.8781,
+            longitude=-87.6298,
+            start_utc=start_utc,
+            end_utc=end_utc,
+            min_sim_period="1D",
+            sim_step_size_seconds=sim_step_size_seconds,
+            output_step_size_seconds=output_step_size_seconds,
+            min_chunk_period=min_chunk_period,
+        )
+
+    def get_data_client(self, sim_config=None):
+        """DataClient of the local cache, with data of sim_config if given."""
+        _weather_dir = os.path.join(self.local_cache, "weather")
+        data_client = DataClient(
+            source=LocalSource(
+                local_cache=self.local_cache, data_spec=DonateYourDataSpec()
+            ),
+            destination=LocalDestination(
+                local_cache=self.local_cache, data_spec=DonateYourDataSpec()
+            ),
+            nrel_dev_api_key=None,
+            weather_dir=_weather_dir,
+            archive_tmy3_dir=os.path.join(_weather_dir, "archive_tmy3"),
+            archive_tmy3_meta=None,
+            archive_tmy3_data_dir=os.path.join(_weather_dir, "tmy3_data"),
+            ep_tmy3_cache_dir=os.path.join(_weather_dir, "ep_tmy3_cache"),
+            nsrdb_cache_dir=os.path.join(_weather_dir, "nsrdb"),
+            simulation_epw_dir=os.path.join(_weather_dir, "simulation_epw"),
+            epw_path=self.epw_path,
+        )
+        if sim_config is not None:
+            data_client.sim_config = sim_config
+            data_client.get_data()
+        return data_client
+
+    def get_simulation(
+        self,
+        sim_config,
+        deadband=0.5,
+        building_model_class=RCBuildingModel,
+        sim_run_identifier="test",
+        **kwargs,
+    ):
+        """Simulation of the models of get_models, kwargs are passed to
+        Simulation."""
+        state_estimator_model, controller_model, building_model = get_models(
+            deadband=deadband, building_model_class=building_model_class
+        )
+        return Simulation(
+            config=sim_config,
+            data_client=self.get_data_client(sim_config),
+            building_model=building_model,
+            controller_model=controller_model,
+            state_estimator_model=state_estimator_model,
+            sim_run_identifier=sim_run_identifier,
+            **kwargs,
+        )
+
+    def read_output(self, sim_name):
+        """Output of sim_name stored with the local destination."""
+        return pd.read_parquet(
+            self.get_data_client().destination.get_local_cache_file(sim_name)
+        )
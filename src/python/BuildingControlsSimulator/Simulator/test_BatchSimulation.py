@@ -0,0 +1,253 @@
+import logging
+import copy
+import tempfile
+import shutil
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from BuildingControlsSimulator.DataClients.DataStates import STATES
+from BuildingControlsSimulator.DataClients.DataSpec import Internal
+from BuildingControlsSimulator.DataClients.StepInputs import StepInputView
+from BuildingControlsSimulator.ControllerModels.Deadband import Deadband
+from BuildingControlsSimulator.StateEstimatorModels.LowPassFilter import LowPassFilter
+from BuildingControlsSimulator.Simulator.BatchSimulation import (
+    BatchModelGroup,
+    BatchSimulation,
+)
+from BuildingControlsSimulator.Simulator.fixtures_test_Simulation import (
+    SyntheticHome,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class TestBatchSimulation:
+    @classmethod
+    def setup_class(cls):
+        cls.step_size_seconds = 300
+        cls.n_steps = 500
+        cls.n_sims = 4
+        rng = np.random.default_rng(seed=1)
+        # sensor temperatures wander across heating and cooling set points
+        cls.temperature = (
+            21.0 + np.cumsum(rng.normal(0, 0.3, (cls.n_steps, cls.n_sims)), axis=0)
+        ).astype("float32")
+        cls.humidity = rng.uniform(20, 80, (cls.n_steps, cls.n_sims)).astype(
+            "float32"
+        )
+        cls.motion = rng.uniform(size=(cls.n_steps, cls.n_sims)) > 0.5
+        cls.stp_heat = np.full((cls.n_steps, cls.n_sims), 20.0, dtype="float32")
+        cls.stp_cool = np.full((cls.n_steps, cls.n_sims), 23.5, dtype="float32")
+        cls.stp_cool[: cls.n_steps // 2, 0] = 20.5
+        cls.sim_time = np.tile(
+            np.arange(0, cls.n_steps * cls.step_size_seconds, cls.step_size_seconds),
+            (cls.n_sims, 1),
+        ).T
+        cls.local_cache = tempfile.mkdtemp()
+        cls.synthetic_home = SyntheticHome(local_cache=cls.local_cache)
+
+    @classmethod
+    def teardown_class(cls):
+        """teardown any state that was previously setup with a call to
+        setup_class.
+        """
+        shutil.rmtree(cls.local_cache)
+
+    def initialize_model(self, model):
+        model.initialize(
+            start_utc=pd.Timestamp("2018-01-01", tz="utc"),
+            t_start=0,
+            t_end=(self.n_steps - 1) * self.step_size_seconds,
+            t_step=self.step_size_seconds,
+            data_spec=Internal(),
+            categories_dict={},
+        )
+        return model
+
+    def get_estimators(self):
+        return [
+            self.initialize_model(
+                LowPassFilter(alpha_temperature=_alpha, alpha_humidity=_alpha)
+            )
+            for _alpha in np.linspace(0.2, 1.0, self.n_sims)
+        ]
+
+    def get_controllers(self):
+        return [
+            self.initialize_model(
+                Deadband(
+                    options={"deadband": _deadband},
+                    step_size_seconds=self.step_size_seconds,
+                    discretization_size_seconds=self.step_size_seconds,
+                )
+            )
+            for _deadband in np.linspace(0.5, 2.0, self.n_sims)
+        ]
+
+    def get_sensor_input(self, i):
+        return {
+            STATES.THERMOSTAT_TEMPERATURE: self.temperature[i],
+            STATES.THERMOSTAT_HUMIDITY: self.humidity[i],
+            STATES.THERMOSTAT_MOTION: self.motion[i],
+        }
+
+    def get_thermostat_input(self, i):
+        return {
+            STATES.TEMPERATURE_STP_HEAT: self.stp_heat[i],
+            STATES.TEMPERATURE_STP_COOL: self.stp_cool[i],
+        }
+
+    def run_per_instance(self):
+        estimators = self.get_estimators()
+        controllers = self.get_controllers()
+        for i in range(self.n_steps):
+            for n in range(self.n_sims):
+                estimators[n].do_step(
+                    t_start=self.sim_time[i, n],
+                    t_step=self.step_size_seconds,
+                    step_sensor_input=StepInputView(self.get_sensor_input(i), n),
+                )
+                controllers[n].do_step(
+                    t_start=self.sim_time[i, n],
+                    t_step=self.step_size_seconds,
+                    step_thermostat_input=StepInputView(
+                        self.get_thermostat_input(i), n
+                    ),
+                    step_sensor_input=estimators[n].step_output,
+                    step_weather_input={},
+                    step_weather_forecast_input=None,
+                )
+        return estimators, controllers
+
+    def run_batch(self, estimators, controllers):
+        _n_steps = np.full(self.n_sims, self.n_steps)
+        _active_idxs = np.arange(self.n_sims)
+        estimator_group = BatchModelGroup(models=estimators, n_steps=_n_steps)
+        controller_group = BatchModelGroup(models=controllers, n_steps=_n_steps)
+        estimator_group.initialize()
+        controller_group.initialize()
+
+        for i in range(self.n_steps):
+            if estimator_group.vectorized:
+                _sensor_input = self.get_sensor_input(i)
+            else:
+                _sensor_input = lambda n: StepInputView(self.get_sensor_input(i), n)
+            estimator_group.do_step(
+                i=i,
+                active_idxs=_active_idxs,
+                t_start=self.sim_time[i],
+                t_step=self.step_size_seconds,
+                step_inputs={"step_sensor_input": _sensor_input},
+            )
+            controller_group.do_step(
+                i=i,
+                active_idxs=_active_idxs,
+                t_start=self.sim_time[i],
+                t_step=self.step_size_seconds,
+                step_inputs={
+                    "step_thermostat_input": self.get_thermostat_input(i),
+                    "step_sensor_input": estimator_group.get_step_output_arrays(),
+                    "step_weather_input": {},
+                    "step_weather_forecast_input": None,
+                },
+            )
+
+        estimator_group.write_output()
+        controller_group.write_output()
+        return estimator_group, controller_group
+
+    def assert_outputs_equal(self, models, batch_models):
+        for _model, _batch_model in zip(models, batch_models):
+            assert _model.current_t_idx == _batch_model.current_t_idx
+            for state in _model.output_states:
+                np.testing.assert_array_equal(
+                    _model.output[state], _batch_model.output[state]
+                )
+
+    def test_vectorized_matches_per_instance(self):
+        estimators, controllers = self.run_per_instance()
+        estimator_group, controller_group = self.run_batch(
+            estimators=self.get_estimators(), controllers=self.get_controllers()
+        )
+        assert estimator_group.vectorized
+        assert controller_group.vectorized
+        # heating and cooling both occur in the test data
+        assert np.any(controllers[0].output[STATES.AUXHEAT1] > 0)
+        assert np.any(controllers[0].output[STATES.COMPCOOL1] > 0)
+        self.assert_outputs_equal(estimators, estimator_group.models)
+        self.assert_outputs_equal(controllers, controller_group.models)
+
+    def test_mixed_model_classes_fall_back(self):
+        class CustomLowPassFilter(LowPassFilter):
+            pass
+
+        estimators, controllers = self.run_per_instance()
+        _batch_estimators = self.get_estimators()
+        _batch_estimators[0] = self.initialize_model(
+            CustomLowPassFilter(alpha_temperature=0.2, alpha_humidity=0.2)
+        )
+        estimator_group, controller_group = self.run_batch(
+            estimators=_batch_estimators, controllers=self.get_controllers()
+        )
+        assert not estimator_group.vectorized
+        assert controller_group.vectorized
+        self.assert_outputs_equal(estimators, estimator_group.models)
+        self.assert_outputs_equal(controllers, controller_group.models)
+
+    def test_stack_columns(self):
+        _stacked = BatchSimulation.stack_columns(
+            columns_list=[
+                {"a": np.arange(3), "b": np.arange(3)},
+                {"a": np.arange(5)},
+            ],
+            n_steps=[3, 5],
+        )
+        assert list(_stacked.keys()) == ["a"]
+        np.testing.assert_array_equal(
+            _stacked["a"], np.array([[0, 0], [1, 1], [2, 2], [2, 3], [2, 4]])
+        )
+
+    def test_controller_steps_match_serial(self):
+        """test that lockstep simulations hold controller output in between
+        controller steps as serial simulations do."""
+        sim_config = self.synthetic_home.get_sim_config().iloc[0]
+
+        def get_simulations(sim_run_identifier):
+            simulations = []
+            for _deadband, _discretization_size_seconds in [(0.5, 900), (1.0, 1800)]:
+                sim = self.synthetic_home.get_simulation(
+                    sim_config,
+                    deadband=_deadband,
+                    sim_run_identifier=sim_run_identifier,
+                )
+                sim.controller_model.discretization_size_seconds = (
+                    _discretization_size_seconds
+                )
+                simulations.append(sim)
+            return simulations
+
+        simulations = get_simulations("serial")
+        for sim in simulations:
+            sim.run()
+            assert sim.step_size_seconds == self.step_size_seconds
+            assert sim.controller_steps is not None
+
+        batch_simulations = get_simulations("batch")
+        batch_sim = BatchSimulation(simulations=batch_simulations)
+        batch_sim.run()
+        assert batch_sim.controller_group.vectorized
+
+        for sim, batch_sim in zip(simulations, batch_simulations):
+            # heating is cycled by the controller
+            assert np.any(sim.controller_model.output[STATES.AUXHEAT1] > 0)
+            for model, batch_model in [
+                (sim.controller_model, batch_sim.controller_model),
+                (sim.building_model, batch_sim.building_model),
+            ]:
+                for state in model.output_states:
+                    np.testing.assert_array_equal(
+                        batch_model.output[state], model.output[state]
+                    )
+            pd.testing.assert_frame_equal(batch_sim.output, sim.output)
@@ -0,0 +1,87 @@
+import logging
+import tempfile
+import shutil
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from BuildingControlsSimulator.DataClients.DataStates import STATES
+from BuildingControlsSimulator.BuildingModels.RCBuildingModel import RCBuildingModel
+from BuildingControlsSimulator.Simulator.ForkSweep import ForkSweep
+from BuildingControlsSimulator.Simulator.fixtures_test_Simulation import (
+    SyntheticHome,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class NoSnapshotRCBuildingModel(RCBuildingModel):
+    def get_state_snapshot(self):
+        return None
+
+
+class TestForkSweep:
+    @classmethod
+    def setup_class(cls):
+        cls.local_cache = tempfile.mkdtemp()
+        cls.synthetic_home = SyntheticHome(local_cache=cls.local_cache)
+        cls.sim_config = cls.synthetic_home.get_sim_config().iloc[0]
+        # equal deadbands never diverge
+        cls.deadbands = [0.5, 1.0, 0.5, 2.0]
+
+        cls.reference_simulations = cls.get_simulations("independent")
+        for sim in cls.reference_simulations:
+            sim.run()
+
+    @classmethod
+    def teardown_class(cls):
+        """teardown any state that was previously setup with a call to
+        setup_class.
+        """
+        shutil.rmtree(cls.local_cache)
+
+    @classmethod
+    def get_simulations(cls, sim_run_identifier, building_model_class=RCBuildingModel):
+        return [
+            cls.synthetic_home.get_simulation(
+                cls.sim_config,
+                deadband=_deadband,
+                building_model_class=building_model_class,
+                # equal deadbands have equal sim_name
+                sim_run_identifier=f"{sim_run_identifier}_{n}",
+            )
+            for n, _deadband in enumerate(cls.deadbands)
+        ]
+
+    @pytest.mark.parametrize(
+        "building_model_class,n_forks",
+        [(RCBuildingModel, 2), (NoSnapshotRCBuildingModel, 0)],
+    )
+    def test_fork_matches_independent(self, building_model_class, n_forks):
+        simulations = self.get_simulations(
+            f"fork_{building_model_class.__name__}", building_model_class
+        )
+        fork_sweep = ForkSweep(simulations=simulations)
+        fork_sweep.run()
+
+        assert fork_sweep.n_forks == n_forks
+        assert len(fork_sweep.branches) == (3 if n_forks else 4)
+        if n_forks:
+            # equal deadbands share a branch
+            assert [simulations[0], simulations[2]] in fork_sweep.branches
+
+        for sim, reference_sim in zip(simulations, self.reference_simulations):
+            _model_name = reference_sim.controller_model.get_model_name()
+            assert sim.sim_name.endswith(_model_name)
+            assert len(sim.output) > 0
+            pd.testing.assert_frame_equal(sim.output, reference_sim.output)
+            pd.testing.assert_frame_equal(
+                self.synthetic_home.read_output(sim.sim_name),
+                self.synthetic_home.read_output(reference_sim.sim_name),
+            )
+        # simulations diverge
+        assert not np.array_equal(
+            simulations[0].output[STATES.AUXHEAT1],
+            simulations[3].output[STATES.AUXHEAT1],
+        )
@@ -0,0 +1,95 @@
+import logging
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from BuildingControlsSimulator.DataClients.DataStates import STATES
+from BuildingControlsSimulator.DataClients.DataSpec import Internal
+from BuildingControlsSimulator.BuildingModels.RCBuildingModel import RCBuildingModel
+from BuildingControlsSimulator.Simulator.HealthMonitor import (
+    HealthMonitor,
+    SimulationHealthError,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class TestHealthMonitor:
+    @classmethod
+    def setup_class(cls):
+        cls.step_size_seconds = 300
+        cls.n_steps = 288
+
+    @classmethod
+    def teardown_class(cls):
+        """teardown any state that was previously setup with a call to
+        setup_class.
+        """
+        pass
+
+    def get_building_model(self, outdoor_temperature):
+        building_model = RCBuildingModel(step_size_seconds=60)
+        building_model.initialize(
+            start_utc=pd.Timestamp("2018-01-01", tz="utc"),
+            t_start=0,
+            t_end=(self.n_steps - 1) * self.step_size_seconds,
+            t_step=self.step_size_seconds,
+            data_spec=Internal(),
+            categories_dict={},
+        )
+        for i in range(self.n_steps):
+            building_model.do_step(
+                t_start=i * self.step_size_seconds,
+                t_step=self.step_size_seconds,
+                step_control_input={
+                    state: 0 for state in building_model.stage_capacities.keys()
+                },
+                step_sensor_input={STATES.THERMOSTAT_MOTION: False},
+                step_weather_input={
+                    STATES.OUTDOOR_TEMPERATURE: outdoor_temperature[i]
+                },
+            )
+        return building_model
+
+    def test_healthy(self):
+        building_model = self.get_building_model(np.full(self.n_steps, 5.0))
+        health_monitor = HealthMonitor(check_steps=48)
+        for _end_idx in range(48, self.n_steps + 1, 48):
+            health_monitor.check(building_model, _end_idx)
+
+        assert health_monitor.checked_idx == self.n_steps
+        assert health_monitor.counters == {
+            "nan_temperature_steps": 0,
+            "implausible_temperature_steps": 0,
+        }
+
+    def test_abort(self):
+        _outdoor_temperature = np.full(self.n_steps, 5.0)
+        # weather data error: implausible outdoor temperature
+        _outdoor_temperature[100:] = 1000.0
+        building_model = self.get_building_model(_outdoor_temperature)
+        building_model.output[STATES.THERMOSTAT_TEMPERATURE][50] = np.nan
+
+        health_monitor = HealthMonitor(check_steps=48)
+        health_monitor.check(building_model, 48)
+        with pytest.raises(SimulationHealthError, match="nan_temperature_steps"):
+            health_monitor.check(building_model, 96)
+        assert health_monitor.counters["nan_temperature_steps"] == 1
+
+        # counters without max never abort
+        _policy = HealthMonitor(
+            max_counts={
+                "nan_temperature_steps": None,
+                "implausible_temperature_steps": 10,
+            }
+        )
+        health_monitor = _policy.copy()
+        health_monitor.check(building_model, 96)
+        with pytest.raises(
+            SimulationHealthError, match="implausible_temperature_steps"
+        ):
+            health_monitor.check(building_model, self.n_steps)
+        assert health_monitor.counters["implausible_temperature_steps"] > 10
+        # copies of the policy have their own counters
+        assert _policy.counters == {}
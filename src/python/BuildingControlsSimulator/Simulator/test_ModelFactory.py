@@ -0,0 +1,67 @@
+import logging
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from BuildingControlsSimulator.ControllerModels.Deadband import Deadband
+from BuildingControlsSimulator.StateEstimatorModels.LowPassFilter import LowPassFilter
+from BuildingControlsSimulator.Simulator.ModelFactory import ModelFactory
+
+logger = logging.getLogger(__name__)
+
+
+class TestModelFactory:
+    @classmethod
+    def setup_class(cls):
+        cls.step_size_seconds = 300
+
+    @classmethod
+    def teardown_class(cls):
+        """teardown any state that was previously setup with a call to
+        setup_class.
+        """
+        pass
+
+    def test_build_from_class(self):
+        factory = ModelFactory(
+            model_class=Deadband,
+            kwargs={
+                "options": {"deadband": 1.5},
+                "step_size_seconds": self.step_size_seconds,
+                "discretization_size_seconds": self.step_size_seconds,
+            },
+        )
+        controller_a = factory.build()
+        controller_b = factory.build()
+        assert isinstance(controller_a, Deadband)
+        assert controller_a.options == {"deadband": 1.5}
+        # each build gets its own mutable state
+        assert controller_a is not controller_b
+        assert controller_a.output is not controller_b.output
+
+    def test_build_nested_factories(self):
+        class Wrapper:
+            def __init__(self, state_estimator_model):
+                self.state_estimator_model = state_estimator_model
+
+        factory = ModelFactory(
+            model_class=Wrapper,
+            kwargs={
+                "state_estimator_model": ModelFactory(
+                    model_class=LowPassFilter, kwargs={"alpha_temperature": 0.5}
+                )
+            },
+        )
+        wrapper_a = factory.build()
+        wrapper_b = factory.build()
+        assert wrapper_a.state_estimator_model.alpha_temperature == 0.5
+        assert wrapper_a.state_estimator_model is not wrapper_b.state_estimator_model
+
+    def test_from_model_prototype(self):
+        prototype = LowPassFilter(alpha_temperature=0.25)
+        factory = ModelFactory.from_model(prototype)
+        assert ModelFactory.from_model(factory) is factory
+        model = factory.build()
+        assert model is not prototype
+        assert model.alpha_temperature == 0.25
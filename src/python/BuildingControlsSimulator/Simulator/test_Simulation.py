@@ -0,0 +1,177 @@
+import logging
+import os
+import tempfile
+import shutil
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from BuildingControlsSimulator.DataClients.DataStates import STATES
+from BuildingControlsSimulator.DataClients.DataSpec import DonateYourDataSpec
+from BuildingControlsSimulator.ControllerModels.SettingsTimeline import (
+    SettingsEvent,
+)
+from BuildingControlsSimulator.Simulator.SimulationCheckpoint import (
+    SimulationCheckpoint,
+)
+from BuildingControlsSimulator.Simulator.fixtures_test_Simulation import (
+    SyntheticHome,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class Interrupt(Exception):
+    pass
+
+
+def interrupt_at(sim, t_idx):
+    """Raise Interrupt on step t_idx of sim."""
+    _step = sim.step
+
+    def step(i, t_start):
+        if i == t_idx:
+            raise Interrupt()
+        _step(i=i, t_start=t_start)
+
+    sim.step = step
+
+
+class TestSimulation:
+    @classmethod
+    def setup_class(cls):
+        cls.local_cache = tempfile.mkdtemp()
+        cls.synthetic_home = SyntheticHome(local_cache=cls.local_cache)
+
+    @classmethod
+    def teardown_class(cls):
+        """teardown any state that was previously setup with a call to
+        setup_class.
+        """
+        shutil.rmtree(cls.local_cache)
+
+    def test_output_stream(self):
+        """test that streamed output is identical to output stored at once
+        when the last flush is on the last step and the last record starts
+        an output step."""
+        sim_config = self.synthetic_home.get_sim_config(
+            output_step_size_seconds=3600
+        ).iloc[0]
+        sim = self.synthetic_home.get_simulation(
+            sim_config, sim_run_identifier="output"
+        )
+        sim.run()
+
+        stream_sim = self.synthetic_home.get_simulation(
+            sim_config, sim_run_identifier="output_stream", output_chunk_steps=37
+        )
+        stream_sim.run()
+        _datetimes = stream_sim.data_client.datetime.data[STATES.DATE_TIME]
+        assert len(_datetimes) % stream_sim.output_chunk_steps == 0
+        assert _datetimes.iloc[-1] == _datetimes.iloc[-1].floor("1D")
+
+        output = self.synthetic_home.read_output(sim.sim_name)
+        stream_output = self.synthetic_home.read_output(stream_sim.sim_name)
+        assert output[DonateYourDataSpec().datetime_column].is_unique
+        pd.testing.assert_frame_equal(stream_output, output)
+
+    def test_warm_start(self):
+        """test that a simulation warm started with the same controller model
+        is identical to a cold start, and that other controller models start
+        with the settings events of the warm-up period replayed."""
+        # heating cycles at the end of the warm-up period
+        sim_config = self.synthetic_home.get_sim_config(
+            start_utc="2018-01-02 12:00"
+        ).iloc[0]
+        sim = self.synthetic_home.get_simulation(
+            sim_config, sim_run_identifier="cold", capture_warm_start=True
+        )
+        sim.run()
+        warm_start = sim.warm_start_snapshot
+        assert warm_start.warmup_steps == sim.get_warmup_steps()
+        assert warm_start.warmup_steps > 0
+        assert warm_start.controller_model_name == "Deadband_0_5"
+
+        warm_sim = self.synthetic_home.get_simulation(
+            sim_config, sim_run_identifier="warm", warm_start=warm_start
+        )
+        warm_sim.run()
+        assert warm_sim.is_warm_start_controller(warm_start)
+        assert warm_sim.warm_start_snapshot is None
+        assert len(warm_sim.output) > 0
+        pd.testing.assert_frame_equal(warm_sim.output, sim.output)
+
+        other_sim = self.synthetic_home.get_simulation(
+            sim_config, deadband=1.0, warm_start=warm_start
+        )
+        other_sim.initialize(data_spec=other_sim.data_client.internal_spec)
+        assert not other_sim.is_warm_start_controller(warm_start)
+        # warm-up data is filled from the simulation start, add settings
+        # events within and after the warm-up period
+        other_sim.controller_model.settings_timeline.events.update(
+            {
+                warm_start.warmup_steps - 1: SettingsEvent(hvac_mode="off"),
+                warm_start.warmup_steps: SettingsEvent(hvac_mode="cool"),
+            }
+        )
+        assert other_sim.controller_model.settings["hvac_mode"] == "heat"
+        assert other_sim.restore_warm_start(warm_start) == warm_start.warmup_steps
+        assert other_sim.controller_model.current_t_idx == warm_start.warmup_steps
+        assert other_sim.controller_model.settings["hvac_mode"] == "off"
+
+    def test_checkpoint_resume(self):
+        """test that a simulation interrupted after a checkpoint resumes from
+        it with output identical to an uninterrupted simulation."""
+        checkpoint_dir = os.path.join(self.local_cache, "checkpoint")
+        sim_config = self.synthetic_home.get_sim_config().iloc[0]
+        sim = self.synthetic_home.get_simulation(
+            sim_config, sim_run_identifier="uninterrupted"
+        )
+        sim.run()
+
+        def get_simulation(sim_config):
+            return self.synthetic_home.get_simulation(
+                sim_config,
+                sim_run_identifier="checkpoint",
+                checkpoint_dir=checkpoint_dir,
+                checkpoint_steps=100,
+            )
+
+        interrupted_sim = get_simulation(sim_config)
+        interrupt_at(interrupted_sim, 250)
+        with pytest.raises(Interrupt):
+            interrupted_sim.run()
+        checkpoint = SimulationCheckpoint.load(interrupted_sim.checkpoint_fpath)
+        assert checkpoint.t_idx == 200
+        assert checkpoint.fingerprint["n_steps"] == len(sim.get_sim_time())
+
+        resumed_sim = get_simulation(sim_config)
+        _step_idxs = []
+        _step = resumed_sim.step
+
+        def step(i, t_start):
+            _step_idxs.append(i)
+            _step(i=i, t_start=t_start)
+
+        resumed_sim.step = step
+        resumed_sim.run()
+        assert _step_idxs[0] == 200
+        pd.testing.assert_frame_equal(resumed_sim.output, sim.output)
+        pd.testing.assert_frame_equal(
+            self.synthetic_home.read_output(resumed_sim.sim_name),
+            self.synthetic_home.read_output(sim.sim_name),
+        )
+        # checkpoints are removed after the simulation finished
+        assert not os.path.exists(resumed_sim.checkpoint_fpath)
+
+        # the checkpoint of another simulation period is not restored
+        interrupted_sim = get_simulation(sim_config)
+        interrupt_at(interrupted_sim, 250)
+        with pytest.raises(Interrupt):
+            interrupted_sim.run()
+        other_sim = get_simulation(
+            self.synthetic_home.get_sim_config(end_utc="2018-01-05").iloc[0]
+        )
+        with pytest.raises(ValueError, match="does not match"):
+            other_sim.run()
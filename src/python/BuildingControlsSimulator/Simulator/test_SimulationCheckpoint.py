@@ -0,0 +1,75 @@
+import logging
+import os
+import tempfile
+import shutil
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from BuildingControlsSimulator.Simulator.SimulationCheckpoint import (
+    SimulationCheckpoint,
+)
+from BuildingControlsSimulator.Simulator.fixtures_test_Simulation import (
+    get_models,
+    initialize_models,
+    run_model_steps,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class TestSimulationCheckpoint:
+    @classmethod
+    def setup_class(cls):
+        cls.checkpoint_dir = tempfile.mkdtemp()
+        cls.step_size_seconds = 300
+        cls.n_steps = 500
+        cls.hours = np.arange(cls.n_steps) * cls.step_size_seconds / 3600.0
+
+    @classmethod
+    def teardown_class(cls):
+        """teardown any state that was previously setup with a call to
+        setup_class.
+        """
+        shutil.rmtree(cls.checkpoint_dir)
+
+    def get_initialized_models(self):
+        return initialize_models(get_models(), n_steps=self.n_steps)
+
+    def test_resume_from_checkpoint(self):
+        fpath = SimulationCheckpoint.get_fpath(self.checkpoint_dir, "sim_test")
+        assert SimulationCheckpoint.load(fpath) is None
+
+        models = self.get_initialized_models()
+        state_estimator_model, controller_model, building_model = models
+        run_model_steps(models, hours=self.hours[:200])
+        SimulationCheckpoint(
+            t_idx=200,
+            fingerprint={"n_steps": self.n_steps},
+            building_model_state=building_model.get_state_snapshot(),
+            controller_model_state=controller_model.get_state_snapshot(),
+            state_estimator_model_state=state_estimator_model.get_state_snapshot(),
+        ).save(fpath)
+        run_model_steps(models, hours=self.hours, start_idx=200)
+        assert os.listdir(self.checkpoint_dir) == [os.path.basename(fpath)]
+
+        # resume as a new process would
+        checkpoint = SimulationCheckpoint.load(fpath)
+        assert checkpoint.t_idx == 200
+        resumed_models = self.get_initialized_models()
+        for resumed_model, _state in zip(
+            resumed_models,
+            [
+                checkpoint.state_estimator_model_state,
+                checkpoint.controller_model_state,
+                checkpoint.building_model_state,
+            ],
+        ):
+            resumed_model.set_state_snapshot(_state)
+        run_model_steps(resumed_models, hours=self.hours, start_idx=checkpoint.t_idx)
+
+        for model, resumed_model in zip(models, resumed_models):
+            assert resumed_model.current_t_idx == model.current_t_idx
+            for k, v in model.output.items():
+                np.testing.assert_array_equal(resumed_model.output[k], v)
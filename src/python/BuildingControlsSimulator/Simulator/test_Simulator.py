@@ -6,6 +6,7 @@ import pytest
 import pandas as pd
 import os
 import shutil
+import tempfile
 
 from BuildingControlsSimulator.Simulator.Simulator import Simulator
 from BuildingControlsSimulator.Simulator.Config import Config
@@ -18,6 +19,7 @@ from BuildingControlsSimulator.BuildingModels.IDFPreprocessor import IDFPreproce
 from BuildingControlsSimulator.BuildingModels.EnergyPlusBuildingModel import (
     EnergyPlusBuildingModel,
 )
+from BuildingControlsSimulator.BuildingModels.RCBuildingModel import RCBuildingModel
 from BuildingControlsSimulator.DataClients.LocalDestination import LocalDestination
 from BuildingControlsSimulator.DataClients.DataSpec import (
     DonateYourDataSpec,
@@ -27,7 +29,12 @@ from BuildingControlsSimulator.DataClients.DataSpec import (
 from BuildingControlsSimulator.ControllerModels.FMIController import FMIController
 from BuildingControlsSimulator.ControllerModels.Deadband import Deadband
 from BuildingControlsSimulator.DataClients.DataStates import STATES
+from BuildingControlsSimulator.DataClients.SharedChannelData import SharedChannelData
 from BuildingControlsSimulator.StateEstimatorModels.LowPassFilter import LowPassFilter
+from BuildingControlsSimulator.Simulator.fixtures_test_Simulation import (
+    SyntheticHome,
+    get_models,
+)
 import BuildingControlsSimulator.Simulator.params_test_Simulator as params
 
 logger = logging.getLogger(__name__)
@@ -280,3 +287,174 @@ class TestSimulator:
             )
             == output_format_mean_thermostat_humidity
         )
+
+    def test_warm_start(self):
+        """test that warm starts are captured by the first simulation of each
+        sim_config, building model, and state estimator model and restored in
+        the following simulations of other controller models."""
+        with tempfile.TemporaryDirectory() as local_cache:
+            synthetic_home = SyntheticHome(local_cache=local_cache)
+            state_estimator_model, controller_model, _ = get_models(deadband=0.5)
+            _, other_controller_model, _ = get_models(deadband=1.0)
+            master = Simulator(
+                sim_config=pd.concat(
+                    [
+                        synthetic_home.get_sim_config(
+                            start_utc="2018-01-02 12:00", end_utc="2018-01-04"
+                        ),
+                        synthetic_home.get_sim_config(
+                            start_utc="2018-01-05 12:00", end_utc="2018-01-07"
+                        ),
+                    ],
+                    ignore_index=True,
+                ),
+                data_client=synthetic_home.get_data_client(),
+                building_models=[
+                    RCBuildingModel(step_size_seconds=60),
+                    RCBuildingModel(step_size_seconds=60),
+                ],
+                controller_models=[controller_model, other_controller_model],
+                state_estimator_models=[state_estimator_model],
+                sim_run_identifier="test_warm_start",
+                warm_start=True,
+            )
+            master.simulate(local=True)
+
+            # permutations loop over sim_config, building model, then
+            # controller model
+            assert len(master.simulations) == 8
+            for _idx in range(0, 8, 2):
+                sim, warm_sim = master.simulations[_idx : _idx + 2]
+                assert sim.capture_warm_start
+                assert sim.warm_start is None
+                # snapshots are released after being passed on
+                assert sim.warm_start_snapshot is None
+                assert not warm_sim.capture_warm_start
+                assert warm_sim.warm_start.controller_model_name == "Deadband_0_5"
+                assert not warm_sim.is_warm_start_controller(warm_sim.warm_start)
+                assert warm_sim.warm_start.warmup_steps == sim.get_warmup_steps()
+                # output covers the same period
+                assert len(warm_sim.output) == len(sim.output)
+
+            _warm_starts = [sim.warm_start for sim in master.simulations[1::2]]
+            assert len(set(id(_w) for _w in _warm_starts)) == 4
+            # models of the same building model factory are equal
+            pd.testing.assert_frame_equal(
+                master.simulations[0].output, master.simulations[2].output
+            )
+            pd.testing.assert_frame_equal(
+                master.simulations[1].output, master.simulations[3].output
+            )
+
+    def test_fork_sweep(self):
+        """test that fork sweeps group simulations by sim_config, building
+        model, and state estimator model, and that their output is identical
+        to that of independent simulations."""
+        with tempfile.TemporaryDirectory() as local_cache:
+            synthetic_home = SyntheticHome(local_cache=local_cache)
+
+            def get_simulator(sim_run_identifier):
+                state_estimator_model, _, _ = get_models()
+                return Simulator(
+                    sim_config=pd.concat(
+                        [
+                            synthetic_home.get_sim_config(end_utc="2018-01-04"),
+                            synthetic_home.get_sim_config(
+                                start_utc="2018-01-05", end_utc="2018-01-07"
+                            ),
+                        ],
+                        ignore_index=True,
+                    ),
+                    data_client=synthetic_home.get_data_client(),
+                    building_models=[
+                        RCBuildingModel(step_size_seconds=60),
+                        RCBuildingModel(step_size_seconds=60),
+                    ],
+                    controller_models=[
+                        get_models(deadband=_deadband)[1]
+                        for _deadband in [0.5, 1.0, 2.0]
+                    ],
+                    state_estimator_models=[state_estimator_model],
+                    sim_run_identifier=sim_run_identifier,
+                )
+
+            sweeps = list(get_simulator("test_sweeps").iter_fork_sweeps())
+            assert [len(_sweep) for _sweep in sweeps] == [3, 3, 3, 3]
+            for _sweep in sweeps:
+                assert len(set(id(sim.data_client) for sim in _sweep)) == 1
+                assert len(set(id(sim.building_model) for sim in _sweep)) == 3
+            assert sweeps[0][0].data_client is sweeps[1][0].data_client
+            assert sweeps[0][0].data_client is not sweeps[2][0].data_client
+
+            master = get_simulator("test_independent")
+            master.simulate(local=True)
+            fork_master = get_simulator("test_fork")
+            fork_master.simulate(local=True, fork=True)
+
+            assert len(fork_master.simulations) == len(master.simulations) == 12
+            for sim, reference_sim in zip(
+                fork_master.simulations, master.simulations
+            ):
+                assert sim.config.equals(reference_sim.config)
+                assert (
+                    sim.controller_model.get_model_name()
+                    == reference_sim.controller_model.get_model_name()
+                )
+                pd.testing.assert_frame_equal(sim.output, reference_sim.output)
+
+    def test_simulate_parallel_shared_input_data(self, monkeypatch):
+        """test that shared input data is published as simulations are
+        submitted and unlinked once all simulations of its sim_config have
+        finished."""
+        _events = []
+        _publish = SharedChannelData.publish
+        _unlink = SharedChannelData.unlink
+
+        def publish(data_client, shared_dir):
+            _shared = _publish(data_client, shared_dir)
+            _events.append(("publish", data_client.sim_config["start_utc"].day))
+            return _shared
+
+        def unlink(self):
+            _events.append(("unlink", self.data_client.sim_config["start_utc"].day))
+            _unlink(self)
+
+        monkeypatch.setattr(SharedChannelData, "publish", staticmethod(publish))
+        monkeypatch.setattr(SharedChannelData, "unlink", unlink)
+
+        with tempfile.TemporaryDirectory() as local_cache:
+            synthetic_home = SyntheticHome(local_cache=local_cache)
+            state_estimator_model, controller_model, building_model = get_models()
+            _, other_controller_model, _ = get_models(deadband=1.0)
+            master = Simulator(
+                sim_config=pd.concat(
+                    [
+                        synthetic_home.get_sim_config(
+                            start_utc=f"2018-01-{_day:02}",
+                            end_utc=f"2018-01-{_day + 1:02}",
+                        )
+                        for _day in [2, 4, 6]
+                    ],
+                    ignore_index=True,
+                ),
+                data_client=synthetic_home.get_data_client(),
+                building_models=[building_model],
+                controller_models=[controller_model, other_controller_model],
+                state_estimator_models=[state_estimator_model],
+                sim_run_identifier="test_shared_input_data",
+            )
+            master.simulate(
+                local=True, n_workers=2, share_input_data=True, max_pending=1
+            )
+
+        assert [r.sim_idx for r in master.simulation_results] == list(range(6))
+        assert all(r.success for r in master.simulation_results)
+        # at most the data of 2 sim_configs is published at the same time
+        assert _events == [
+            ("publish", 2),
+            ("publish", 4),
+            ("unlink", 2),
+            ("publish", 6),
+            ("unlink", 4),
+            ("unlink", 6),
+        ]
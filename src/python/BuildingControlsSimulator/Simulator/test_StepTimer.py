@@ -0,0 +1,67 @@
+import logging
+import time
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from BuildingControlsSimulator.Simulator.StepTimer import StepTimer
+
+logger = logging.getLogger(__name__)
+
+
+class TestStepTimer:
+    @classmethod
+    def setup_class(cls):
+        # more records than the initial buffer size
+        cls.n_records = 3000
+        cls.durations_ns = np.arange(1, cls.n_records + 1, dtype="int64") * 1000
+
+    @classmethod
+    def teardown_class(cls):
+        """teardown any state that was previously setup with a call to
+        setup_class.
+        """
+        pass
+
+    def test_summary(self):
+        step_timer = StepTimer()
+        for _duration_ns in self.durations_ns:
+            step_timer.record("controller", _duration_ns)
+        step_timer.record("output", 2 * 10 ** 9)
+
+        summary = step_timer.get_summary()
+        assert summary["controller"]["count"] == self.n_records
+        assert summary["controller"]["total_seconds"] == pytest.approx(
+            np.sum(self.durations_ns) / 1e9
+        )
+        assert summary["controller"]["p50_seconds"] == pytest.approx(
+            np.percentile(self.durations_ns, 50) / 1e9
+        )
+        assert summary["controller"]["max_seconds"] == pytest.approx(3e-3)
+        assert sum(summary["controller"]["histogram_counts"]) == self.n_records
+        assert summary["output"]["count"] == 1
+        # durations outside of the log spaced bins are counted
+        step_timer.record("output", 0)
+        step_timer.record("output", 200 * 10 ** 9)
+        _histogram_counts = step_timer.get_summary()["output"]["histogram_counts"]
+        assert sum(_histogram_counts) == 3
+        assert _histogram_counts[0] == 1 and _histogram_counts[-1] == 1
+
+        summary_df = step_timer.get_summary_dataframe()
+        assert list(summary_df.index) == ["controller", "output"]
+        assert "histogram_counts" not in summary_df.columns
+
+    def test_percentiles_not_shared(self):
+        step_timer = StepTimer()
+        step_timer.percentiles.append(75)
+        assert StepTimer().percentiles == [50, 90, 99]
+
+    def test_lap(self):
+        step_timer = StepTimer()
+        _t_ns = time.perf_counter_ns()
+        time.sleep(0.01)
+        _t_ns = step_timer.lap("building", _t_ns)
+        step_timer.lap("controller", _t_ns)
+        assert step_timer.get_durations_seconds("building")[0] >= 0.01
+        assert step_timer.get_durations_seconds("controller")[0] < 0.01
@@ -0,0 +1,279 @@
+import logging
+import tempfile
+import shutil
+
+import pytest
+import pandas as pd
+import numpy as np
+
+from BuildingControlsSimulator.DataClients.DataStates import STATES
+from BuildingControlsSimulator.Simulator.Simulator import Simulator
+from BuildingControlsSimulator.Simulator.SimulationResult import SimulationResult
+from BuildingControlsSimulator.Simulator.TimeChunk import TimeChunk
+from BuildingControlsSimulator.Simulator.fixtures_test_Simulation import (
+    SyntheticHome,
+    get_models,
+    initialize_models,
+    run_model_steps,
+)
+
+logger = logging.getLogger(__name__)
+
+
+class TestTimeChunk:
+    @classmethod
+    def setup_class(cls):
+        cls.step_size_seconds = 300
+        cls.sim_config = pd.Series(
+            {
+                "identifier": "test",
+                "start_utc": pd.Timestamp("2018-01-01", tz="utc"),
+                "end_utc": pd.Timestamp("2018-01-13", tz="utc"),
+                "min_sim_period": pd.Timedelta("1D"),
+                "min_chunk_period": pd.Timedelta("4D"),
+                "sim_step_size_seconds": cls.step_size_seconds,
+                "output_step_size_seconds": 3600,
+            }
+        )
+        cls.datetimes = pd.Series(
+            pd.date_range(
+                cls.sim_config["start_utc"],
+                cls.sim_config["end_utc"],
+                freq=f"{cls.step_size_seconds}S",
+            )
+        )
+        cls.local_cache = tempfile.mkdtemp()
+        cls.synthetic_home = SyntheticHome(local_cache=cls.local_cache)
+
+    @classmethod
+    def teardown_class(cls):
+        """teardown any state that was previously setup with a call to
+        setup_class.
+        """
+        shutil.rmtree(cls.local_cache)
+
+    def simulate(self, start_utc, end_utc):
+        """Output of the RC building, deadband controller, and low pass filter
+        simulated over [start_utc, end_utc] from a cold start."""
+        _idxs = np.flatnonzero(
+            ((self.datetimes >= start_utc) & (self.datetimes <= end_utc)).to_numpy()
+        )
+        models = initialize_models(get_models(), n_steps=len(_idxs))
+        run_model_steps(models, hours=_idxs * self.step_size_seconds / 3600.0)
+        _, controller_model, building_model = models
+
+        return pd.DataFrame(
+            {
+                STATES.DATE_TIME: self.datetimes[_idxs].reset_index(drop=True),
+                STATES.THERMOSTAT_TEMPERATURE: building_model.output[
+                    STATES.THERMOSTAT_TEMPERATURE
+                ],
+                STATES.AUXHEAT1: controller_model.output[STATES.AUXHEAT1],
+            }
+        )
+
+    def simulate_chunks(self, warmup_period):
+        chunks = TimeChunk.make_chunks(
+            parent_sim_idx=0, sim_config=self.sim_config, warmup_period=warmup_period
+        )
+        return TimeChunk.stitch(
+            chunks=chunks,
+            outputs=[self.simulate(c.warmup_start_utc, c.end_utc) for c in chunks],
+            full_data_periods=[[[c.warmup_start_utc, c.end_utc]] for c in chunks],
+            min_sim_period=self.sim_config["min_sim_period"],
+        )
+
+    def test_make_chunks(self):
+        chunks = TimeChunk.make_chunks(
+            parent_sim_idx=3, sim_config=self.sim_config, warmup_period="2D"
+        )
+        assert len(chunks) == 3
+        assert chunks[0].start_utc == self.sim_config["start_utc"]
+        assert chunks[-1].end_utc == self.sim_config["end_utc"]
+        assert chunks[-1].is_last and not chunks[0].is_last
+        for _prev, _chunk in zip(chunks[:-1], chunks[1:]):
+            assert _prev.end_utc == _chunk.start_utc
+            assert _chunk.start_utc - _chunk.warmup_start_utc == pd.Timedelta("2D")
+            # boundaries are aligned to output steps
+            assert _chunk.start_utc == _chunk.start_utc.floor("3600S")
+        # first chunk has no warm-up before the simulation start
+        assert chunks[0].warmup_start_utc == self.sim_config["start_utc"]
+
+        _sim_config = chunks[1].get_sim_config(self.sim_config)
+        assert _sim_config["start_utc"] == chunks[1].warmup_start_utc
+        assert _sim_config["end_utc"] == chunks[1].end_utc
+        assert _sim_config["chunk_idx"] == 1
+        # original sim_config is not modified
+        assert "chunk_idx" not in self.sim_config
+
+        # simulation shorter than min_chunk_period is a single chunk
+        _short_config = self.sim_config.copy()
+        _short_config["min_chunk_period"] = pd.Timedelta("30D")
+        assert len(TimeChunk.make_chunks(0, _short_config, "2D")) == 1
+
+    def test_stitch_full_data_periods(self):
+        chunks = TimeChunk.make_chunks(
+            parent_sim_idx=0, sim_config=self.sim_config, warmup_period="1D"
+        )
+        _b = [c.start_utc for c in chunks[1:]]
+        outputs = [
+            pd.DataFrame(
+                {
+                    STATES.DATE_TIME: self.datetimes[
+                        (self.datetimes >= c.warmup_start_utc)
+                        & (self.datetimes <= c.end_utc)
+                    ].reset_index(drop=True)
+                }
+            )
+            for c in chunks
+        ]
+        _h = pd.Timedelta("12H")
+        # data period spanning a boundary is merged, short periods within
+        # a chunk are removed after merging
+        full_data_periods = [
+            [[chunks[0].start_utc, _b[0]]],
+            [[chunks[1].warmup_start_utc, _b[0] + _h], [_b[1] - _h, _b[1]]],
+            [[_b[1], _b[1] + _h / 2], [_b[1] + 4 * _h, chunks[2].end_utc]],
+        ]
+        output, periods = TimeChunk.stitch(
+            chunks=chunks,
+            outputs=outputs,
+            full_data_periods=full_data_periods,
+            min_sim_period="1D",
+        )
+        assert periods == [
+            [chunks[0].start_utc, _b[0] + _h],
+            [_b[1] + 4 * _h, chunks[2].end_utc],
+        ]
+        # each datetime is output once
+        assert output[STATES.DATE_TIME].is_unique
+        assert output[STATES.DATE_TIME].iloc[0] == chunks[0].start_utc
+        assert output[STATES.DATE_TIME].iloc[-1] < chunks[2].end_utc
+        assert not (
+            (output[STATES.DATE_TIME] >= _b[0] + _h)
+            & (output[STATES.DATE_TIME] < _b[1] + 4 * _h)
+        ).any()
+
+    def test_accuracy_against_serial(self):
+        """Daily means of chunked output converge to those of the serial
+        output with a warm-up period that is long compared to the thermal
+        time constant of the building model."""
+        serial_output = self.simulate(
+            self.sim_config["start_utc"], self.sim_config["end_utc"]
+        )
+        _states = [STATES.THERMOSTAT_TEMPERATURE, STATES.AUXHEAT1]
+        _errors = {}
+        for _warmup_period in ["0D", "2D"]:
+            output, periods = self.simulate_chunks(_warmup_period)
+            # full data periods exclude their end
+            assert output[STATES.DATE_TIME].equals(
+                serial_output[STATES.DATE_TIME].iloc[:-1]
+            )
+            assert periods == [
+                [self.sim_config["start_utc"], self.sim_config["end_utc"]]
+            ]
+            _errors[_warmup_period] = TimeChunk.get_max_abs_error(
+                output, serial_output.iloc[:-1], _states
+            )
+
+        for state in _states:
+            assert _errors["2D"][state] < _errors["0D"][state]
+        assert _errors["2D"][STATES.THERMOSTAT_TEMPERATURE] < 0.1
+        # mean runtime per 300 second step
+        assert _errors["2D"][STATES.AUXHEAT1] < 5.0
+
+    def get_simulator(self):
+        state_estimator_model, controller_model, building_model = get_models()
+        return Simulator(
+            sim_config=self.synthetic_home.get_sim_config(
+                start_utc="2018-01-02",
+                end_utc="2018-01-14",
+                output_step_size_seconds=3600,
+                min_chunk_period="4D",
+            ),
+            data_client=self.synthetic_home.get_data_client(),
+            building_models=[building_model],
+            controller_models=[controller_model],
+            state_estimator_models=[state_estimator_model],
+            sim_run_identifier="test_time_chunks",
+            time_chunks=True,
+            chunk_warmup_period="2D",
+        )
+
+    def test_iter_time_chunk_specs(self):
+        sim_specs = list(self.get_simulator().iter_time_chunk_specs())
+        assert [s.sim_idx for s in sim_specs] == [0, 1, 2]
+        for chunk_idx, sim_spec in enumerate(sim_specs):
+            assert sim_spec.time_chunk.parent_sim_idx == 0
+            assert sim_spec.time_chunk.chunk_idx == chunk_idx
+            assert sim_spec.sim_config["chunk_idx"] == chunk_idx
+            assert (
+                sim_spec.data_client.sim_config["start_utc"]
+                == sim_spec.time_chunk.warmup_start_utc
+            )
+            assert (
+                sim_spec.data_client.sim_config["end_utc"]
+                == sim_spec.time_chunk.end_utc
+            )
+            # chunk output is returned to the parent process to be stitched
+            assert not sim_spec.store_output
+            assert sim_spec.output_chunk_steps is None
+        # each chunk loads its own data
+        assert len(set(id(s.data_client) for s in sim_specs)) == len(sim_specs)
+
+        sim_names = [s.build().sim_name for s in sim_specs]
+        _sim_name = sim_names[0][: -len("_chunk_0")]
+        assert sim_names == [f"{_sim_name}_chunk_{n}" for n in range(3)]
+
+    def test_simulate_parallel(self):
+        simulator = self.get_simulator()
+        simulator.simulate(n_workers=2, return_output=True)
+        assert len(simulator.simulation_results) == 1
+        result = simulator.simulation_results[0]
+        assert result.success, result.error
+
+        serial_sim = self.synthetic_home.get_simulation(
+            simulator.sim_config.iloc[0],
+            sim_run_identifier=simulator.sim_run_identifier,
+            store_output=False,
+        )
+        serial_sim.run()
+        # parent simulation is named without chunk suffix
+        assert result.sim_name == serial_sim.sim_name
+        assert result.full_data_periods == serial_sim.data_client.full_data_periods
+        assert result.output[STATES.DATE_TIME].equals(
+            serial_sim.output[STATES.DATE_TIME]
+        )
+        _errors = TimeChunk.get_max_abs_error(
+            result.output,
+            serial_sim.output,
+            [STATES.THERMOSTAT_TEMPERATURE, STATES.AUXHEAT1],
+        )
+        assert _errors[STATES.THERMOSTAT_TEMPERATURE] < 0.1
+        # mean runtime per 3600 second output step
+        assert _errors[STATES.AUXHEAT1] < 60.0
+
+        # stitched output is stored with the data client
+        stored_output = self.synthetic_home.read_output(result.sim_name)
+        assert len(stored_output) == len(result.output)
+
+    def test_stitch_failed_chunk(self):
+        simulator = self.get_simulator()
+        sim_specs = {s.sim_idx: s for s in simulator.iter_time_chunk_specs()}
+        results = [
+            SimulationResult(sim_idx=0, success=True, wall_time_seconds=1.0),
+            SimulationResult(sim_idx=2, success=True, wall_time_seconds=1.0),
+            SimulationResult(sim_idx=1, error="ValueError('unhealthy')"),
+        ]
+        parent_results = simulator.stitch_time_chunk_results(
+            sim_specs=sim_specs, results=results
+        )
+        assert len(parent_results) == 1
+        result = parent_results[0]
+        assert result.sim_idx == 0
+        assert not result.success
+        assert result.error == "chunk 1: ValueError('unhealthy')"
+        assert result.wall_time_seconds == 2.0
+        # nothing is stitched or stored
+        assert result.sim_name is None
+        assert result.output is None
@@ -21,6 +21,8 @@ class LowPassFilter(StateEstimatorModel):
     step_output = attr.ib(factory=dict)
     step_size_seconds = attr.ib(default=None)
     current_t_idx = attr.ib(default=None)
+    state_bus = attr.ib(default=None)
+    state_bus_output = attr.ib(default=None)
 
     output = attr.ib(factory=dict)
 
@@ -77,6 +79,7 @@ class LowPassFilter(StateEstimatorModel):
         """preallocate output memory to speed up simulation"""
         # reset output
         self.output = {}
+        self.output_categories = {}
 
         self.output = {
             STATES.SIMULATION_TIME: np.arange(
@@ -88,11 +91,15 @@ class LowPassFilter(StateEstimatorModel):
         # add state variables
         for state in self.output_states:
             if data_spec.full.spec[state]["dtype"] == "category":
-                self.output[state] = pd.Series(
-                    pd.Categorical(
-                        pd.Series(index=np.arange(n_s)),
-                        categories=categories_dict[state],
-                    )
+                # categorical states are recorded as integer codes, categories
+                # are attached when output is assembled
+                self.output_categories[state] = pd.Index(categories_dict[state])
+                self.output[state] = np.full(
+                    n_s,
+                    -1,
+                    dtype=Conversions.get_category_code_dtype(
+                        self.output_categories[state]
+                    ),
                 )
             else:
                 (
@@ -123,13 +130,26 @@ class LowPassFilter(StateEstimatorModel):
 
     @staticmethod
     def filter(state, prev_state_estimate, alpha):
-        if prev_state_estimate:
-            # y[i] := y[i-1] + α * (x[i] - y[i-1])
-            state_estimate = prev_state_estimate + alpha * (state - prev_state_estimate)
-        else:
-            # cold start
-            state_estimate = state
-        return state_estimate
+        """Filter arrays of shape (N,) of N state estimators, `do_step` filters
+        a single estimator with N=1.
+
+        Unset (NaN) and zero previous estimates are cold started.
+        """
+        _state = np.asarray(state, dtype="float64")
+        _prev = np.asarray(prev_state_estimate, dtype="float64")
+        _cold_start = np.isnan(_prev) | (_prev == 0.0)
+        # y[i] := y[i-1] + α * (x[i] - y[i-1])
+        return np.where(_cold_start, _state, _prev + alpha * (_state - _prev))
+
+    def set_state_bus(self, state_bus):
+        if state_bus is None or not state_bus.supports(self.output_states):
+            self.state_bus = None
+            self.state_bus_output = None
+            return False
+
+        self.state_bus = state_bus
+        self.state_bus_output = state_bus.get_view(self.output_states)
+        return True
 
     def do_step(
         self,
@@ -137,35 +157,96 @@ class LowPassFilter(StateEstimatorModel):
         t_step,
         step_sensor_input,
     ):
-        """Simulate controller time step."""
-        self.step_output[STATES.STEP_STATUS] = 1
-
-        self.step_output[STATES.THERMOSTAT_TEMPERATURE_ESTIMATE] = LowPassFilter.filter(
-            state=step_sensor_input[STATES.THERMOSTAT_TEMPERATURE],
-            prev_state_estimate=self.step_output[
-                STATES.THERMOSTAT_TEMPERATURE_ESTIMATE
-            ],
-            alpha=self.alpha_temperature,
-        )
-
-        self.step_output[STATES.THERMOSTAT_HUMIDITY_ESTIMATE] = LowPassFilter.filter(
-            state=step_sensor_input[STATES.THERMOSTAT_HUMIDITY],
-            prev_state_estimate=self.step_output[STATES.THERMOSTAT_HUMIDITY_ESTIMATE],
-            alpha=self.alpha_temperature,
-        )
+        """Simulate controller time step. Outputs are written to step_output,
+        or to the state bus if attached, in which case output memory is written
+        by the Simulation from the recorded bus."""
+        if self.state_bus is not None:
+            _step_output = self.state_bus_output
+        else:
+            _step_output = self.step_output
+            _step_output[STATES.STEP_STATUS] = 1
+
+        for state, estimate_state in [
+            (STATES.THERMOSTAT_TEMPERATURE, STATES.THERMOSTAT_TEMPERATURE_ESTIMATE),
+            # humidity is filtered using alpha_temperature
+            (STATES.THERMOSTAT_HUMIDITY, STATES.THERMOSTAT_HUMIDITY_ESTIMATE),
+        ]:
+            # unset estimates (None) are converted to NaN
+            _step_output[estimate_state] = LowPassFilter.filter(
+                state=np.array([step_sensor_input[state]], dtype="float64"),
+                prev_state_estimate=np.array(
+                    [_step_output[estimate_state]], dtype="float64"
+                ),
+                alpha=self.alpha_temperature,
+            )[0]
 
         # non filtered states
-        self.step_output[STATES.THERMOSTAT_MOTION_ESTIMATE] = step_sensor_input[
+        _step_output[STATES.THERMOSTAT_MOTION_ESTIMATE] = step_sensor_input[
             STATES.THERMOSTAT_MOTION
         ]
 
-        self.step_output[STATES.STEP_STATUS] = 0
-        self.add_step_to_output(self.step_output)
+        if self.state_bus is None:
+            _step_output[STATES.STEP_STATUS] = 0
+            self.add_step_to_output(self.step_output)
         self.current_t_idx += 1
 
-        return self.step_output[STATES.STEP_STATUS]
+        return 0
+
+    @staticmethod
+    def init_batch_state(models):
+        """Stack per-instance state of lockstep simulations into arrays."""
+        _states = [
+            STATES.THERMOSTAT_TEMPERATURE_ESTIMATE,
+            STATES.THERMOSTAT_HUMIDITY_ESTIMATE,
+        ]
+        _batch_state = {
+            "alpha_temperature": np.array(
+                [m.alpha_temperature for m in models], dtype="float64"
+            ),
+            # unset estimates (None) are NaN
+            "step_output": {
+                state: np.array([m.step_output[state] for m in models], dtype="float64")
+                for state in _states
+            },
+        }
+        _batch_state["step_output"][STATES.THERMOSTAT_MOTION_ESTIMATE] = np.array(
+            [m.step_output[STATES.THERMOSTAT_MOTION_ESTIMATE] for m in models]
+        )
+        _batch_state["step_output"][STATES.STEP_STATUS] = np.zeros(
+            len(models), dtype="int8"
+        )
+        return _batch_state
+
+    @staticmethod
+    def do_step_batch(batch_state, t_start, t_step, step_sensor_input):
+        """Vectorized `do_step` over arrays of shape (N,) of N state estimators."""
+        _step_output = batch_state["step_output"]
+        for state, estimate_state in [
+            (STATES.THERMOSTAT_TEMPERATURE, STATES.THERMOSTAT_TEMPERATURE_ESTIMATE),
+            # humidity is filtered using alpha_temperature
+            (STATES.THERMOSTAT_HUMIDITY, STATES.THERMOSTAT_HUMIDITY_ESTIMATE),
+        ]:
+            _step_output[estimate_state] = LowPassFilter.filter(
+                state=step_sensor_input[state],
+                prev_state_estimate=_step_output[estimate_state],
+                alpha=batch_state["alpha_temperature"],
+            )
+
+        # non filtered states
+        _step_output[STATES.THERMOSTAT_MOTION_ESTIMATE] = np.asarray(
+            step_sensor_input[STATES.THERMOSTAT_MOTION]
+        )
+        return _step_output
 
     def add_step_to_output(self, step_output):
+        if self.output_categories:
+            step_output = {
+                k: Conversions.get_category_code(self.output_categories[k], v)
+                if k in self.output_categories
+                else v
+                for k, v in step_output.items()
+            }
+
         for k, v in step_output.items():
             self.output[k][self.current_t_idx] = v
 
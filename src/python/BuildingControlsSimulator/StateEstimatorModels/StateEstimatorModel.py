@@ -3,6 +3,7 @@
 from abc import ABC, abstractmethod
 from enum import IntEnum
 import logging
+import copy
 
 import attr
 import pandas as pd
@@ -17,6 +18,8 @@ class StateEstimatorModel(ABC):
     output_states = attr.ib()
 
     output = attr.ib(factory=dict)
+    # categories of categorical output states, which are recorded as codes
+    output_categories = attr.ib(factory=dict)
     step_output = attr.ib(factory=dict)
     settings = attr.ib(factory=dict)
 
@@ -39,3 +42,27 @@ class StateEstimatorModel(ABC):
     def get_model_name(self):
         """Defines human readable uniquely identifing name"""
         pass
+
+    def set_state_bus(self, state_bus):
+        """Read and write states directly on state_bus, see StateBus. Models
+        that do not support the bus return False and keep passing step_output,
+        a state_bus of None restores step_output passing."""
+        return False
+
+    def get_state_snapshot(self):
+        """Copy of model state after current_t_idx steps, for warm starts of
+        other instances of the same model, see set_state_snapshot."""
+        return {
+            "current_t_idx": self.current_t_idx,
+            "step_output": copy.deepcopy(self.step_output),
+            "output": {
+                k: v[: self.current_t_idx].copy() for k, v in self.output.items()
+            },
+        }
+
+    def set_state_snapshot(self, snapshot):
+        """Restore state of initialized model from get_state_snapshot."""
+        for k, v in snapshot["output"].items():
+            self.output[k][: len(v)] = v
+        self.step_output = copy.deepcopy(snapshot["step_output"])
+        self.current_t_idx = snapshot["current_t_idx"]
@@ -9,6 +9,7 @@ import numpy as np
 from BuildingControlsSimulator.DataClients.DataStates import STATES
 from BuildingControlsSimulator.DataClients.DataSpec import Internal
 from BuildingControlsSimulator.StateEstimatorModels.LowPassFilter import LowPassFilter
+from BuildingControlsSimulator.Conversions.Conversions import Conversions
 
 logger = logging.getLogger(__name__)
 
@@ -85,3 +86,88 @@ class TestLowPassFilter:
             test_sensor_data[STATES.THERMOSTAT_HUMIDITY].mean()
             > test_output[STATES.THERMOSTAT_HUMIDITY_ESTIMATE].mean()
         )
+
+    def test_state_snapshot(self):
+        n_steps = 200
+        warmup_steps = 50
+        rng = np.random.default_rng(seed=1)
+        test_sensor_data = pd.DataFrame.from_dict(
+            {
+                STATES.THERMOSTAT_TEMPERATURE: rng.normal(20, 1, n_steps),
+                STATES.THERMOSTAT_HUMIDITY: rng.uniform(20, 60, n_steps),
+                STATES.THERMOSTAT_MOTION: np.full(n_steps, False),
+            }
+        )
+
+        def get_initialized_model():
+            model = LowPassFilter(alpha_temperature=0.5, alpha_humidity=0.5)
+            model.initialize(
+                start_utc=pd.Timestamp("now"),
+                t_start=0,
+                t_end=n_steps * self.step_size_seconds,
+                t_step=self.step_size_seconds,
+                data_spec=Internal(),
+                categories_dict={},
+            )
+            return model
+
+        def run_steps(model, start, end):
+            for i in range(start, end):
+                model.do_step(
+                    t_start=i * self.step_size_seconds,
+                    t_step=self.step_size_seconds,
+                    step_sensor_input=test_sensor_data.iloc[i],
+                )
+
+        cold_model = get_initialized_model()
+        run_steps(cold_model, 0, warmup_steps)
+        snapshot = cold_model.get_state_snapshot()
+        run_steps(cold_model, warmup_steps, n_steps)
+
+        warm_model = get_initialized_model()
+        warm_model.set_state_snapshot(snapshot)
+        assert warm_model.current_t_idx == warmup_steps
+        run_steps(warm_model, warmup_steps, n_steps)
+
+        for k, v in cold_model.output.items():
+            np.testing.assert_array_equal(warm_model.output[k], v)
+
+    def test_categorical_output_codes(self):
+        state_estimator_model = LowPassFilter(
+            output_states=[
+                STATES.THERMOSTAT_TEMPERATURE_ESTIMATE,
+                STATES.THERMOSTAT_HUMIDITY_ESTIMATE,
+                STATES.THERMOSTAT_MOTION_ESTIMATE,
+                STATES.HVAC_MODE,
+            ]
+        )
+        state_estimator_model.initialize(
+            start_utc=pd.Timestamp("now"),
+            t_start=0,
+            t_end=2 * self.step_size_seconds,
+            t_step=self.step_size_seconds,
+            data_spec=Internal(),
+            categories_dict={STATES.HVAC_MODE: ["heat", "cool", "off"]},
+        )
+        _hvac_mode_output = state_estimator_model.output[STATES.HVAC_MODE]
+        assert _hvac_mode_output.dtype == np.int8
+
+        for hvac_mode in ["cool", None]:
+            state_estimator_model.step_output[STATES.HVAC_MODE] = hvac_mode
+            state_estimator_model.do_step(
+                t_start=0,
+                t_step=self.step_size_seconds,
+                step_sensor_input={
+                    STATES.THERMOSTAT_TEMPERATURE: 20.0,
+                    STATES.THERMOSTAT_HUMIDITY: 50.0,
+                    STATES.THERMOSTAT_MOTION: False,
+                },
+            )
+
+        np.testing.assert_array_equal(_hvac_mode_output, [1, -1, -1])
+        _categorical = Conversions.codes_to_categorical(
+            _hvac_mode_output,
+            state_estimator_model.output_categories[STATES.HVAC_MODE],
+        )
+        assert _categorical[0] == "cool"
+        assert pd.isnull(_categorical[1:]).all()